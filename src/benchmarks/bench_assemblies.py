@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+bench_assemblies.py
+
+Time the main WISDEM assemblies in three phases: configure (build the assembly or
+problem and set the example inputs), first run, and warm rerun (run again on the
+same object with the inputs unchanged).  Results are written as JSON and can be
+compared against a saved baseline.
+
+    python bench_assemblies.py [-n REPEAT] [-o results.json] [case ...]
+    python bench_assemblies.py --baseline baseline.json [--tolerance 1.2] [case ...]
+
+The lcoe_se_ecn_opex case needs the ECN O&M spreadsheet, which is not shipped with
+WISDEM; give it with --ecn-file or the WISDEM_ECN_FILE environment variable, or the
+case is skipped.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import traceback
+from collections import OrderedDict
+
+
+PHASES = ('configure', 'first_run', 'warm_run')
+
+
+class SkipCase(Exception):
+    """raised by a case that cannot run on this machine"""
+
+
+# --- cases: each imports what it needs and returns (configure, run) ---
+
+def _run_assembly(assembly):
+    assembly.run()
+
+
+def _run_problem(prob):
+    prob.run()
+
+
+def _turbinese():
+    from wisdem.turbinese.turbine import TurbineSE
+    from wisdem.reference_turbines.nrel5mw.nrel5mw import configure_nrel5mw_turbine
+
+    def configure():
+        turbine = TurbineSE()
+        turbine.sea_depth = 0.0
+        configure_nrel5mw_turbine(turbine, 'I', turbine.sea_depth)
+        return turbine
+
+    return configure, _run_assembly
+
+
+def _turbinese_jacket():
+    from wisdem.turbinese.turbine_jacket import TurbineSE_jacket
+    from wisdem.reference_turbines.nrel5mw.nrel5mw_jacket import configure_nrel5mw_turbine_with_jacket
+
+    def configure():
+        turbine = TurbineSE_jacket()
+        configure_nrel5mw_turbine_with_jacket(turbine, 'Offshore', 20.0)
+        return turbine
+
+    return configure, _run_assembly
+
+
+def _lcoe_se(**options):
+
+    def case():
+        from wisdem.lcoe.lcoe_se_assembly import example_se_assembly
+
+        def configure():
+            return example_se_assembly(**options)
+
+        return configure, _run_assembly
+
+    return case
+
+
+def _lcoe_se_ecn_opex():
+
+    ecn_file = os.environ.get('WISDEM_ECN_FILE')
+    if not ecn_file:
+        raise SkipCase('needs the ECN O&M spreadsheet: pass --ecn-file or set WISDEM_ECN_FILE')
+    if not os.path.isfile(ecn_file):
+        raise SkipCase('ECN O&M spreadsheet %s not found' % ecn_file)
+
+    return _lcoe_se(wind_class='Offshore', sea_depth=20.0, with_ecn_opex=True, ecn_file=ecn_file)()
+
+
+def _lcoe_csm_2015():
+    from wisdem.lcoe.lcoe_csm_2015_assembly import example_se_assembly
+
+    return example_se_assembly, _run_assembly
+
+
+def _monopile():
+    from wisdem.fixed_bottom.monopile_assembly_turbine import create_monopile_problem
+
+    return create_monopile_problem, _run_problem
+
+
+def _floating(kind):
+
+    def case():
+        from openmdao.api import Problem
+        if kind == 'spar':
+            from wisdem.floating.turbine_spar_instance import TurbineSparInstance as Instance
+        else:
+            from wisdem.floating.turbine_semi_instance import TurbineSemiInstance as Instance
+
+        def configure():
+            instance = Instance('NREL5MW')
+            prob = Problem(root=instance.get_assembly())
+            prob.setup()
+            for name, value in instance.params.items():
+                try:
+                    prob[name] = value
+                except KeyError:
+                    pass  # instance parameters that this assembly does not use
+            return prob
+
+        return configure, _run_problem
+
+    return case
+
+
+def _lcoe_analysis():
+    from fusedwind.fused_openmdao import FUSED_run
+    from wisdem.lcoe.lcoe_analysis import create_lcoe_problem
+
+    return create_lcoe_problem, FUSED_run
+
+
+CASES = OrderedDict([
+    ('turbinese', _turbinese),
+    ('turbinese_jacket', _turbinese_jacket),
+    ('lcoe_se', _lcoe_se()),
+    ('lcoe_se_new_nacelle', _lcoe_se(with_new_nacelle=True)),
+    ('lcoe_se_landbos', _lcoe_se(with_landbos=True)),
+    ('lcoe_se_offshore', _lcoe_se(wind_class='Offshore', sea_depth=20.0)),
+    ('lcoe_se_ecn_opex', _lcoe_se_ecn_opex),
+    ('lcoe_csm_2015', _lcoe_csm_2015),
+    ('monopile_turbine', _monopile),
+    ('floating_spar', _floating('spar')),
+    ('floating_semi', _floating('semi')),
+    ('lcoe_analysis', _lcoe_analysis),
+])
+
+
+# --- timing ---
+
+def _timed(function, *args):
+
+    t0 = time.time()
+    result = function(*args)
+
+    return time.time() - t0, result
+
+
+def _stats(times):
+
+    times = sorted(times)
+
+    return OrderedDict([('best', times[0]), ('median', times[len(times)//2]), ('runs', len(times))])
+
+
+def time_case(name, repeat=3):
+    """configure, first run and warm rerun times (s) of one case, each phase repeated
+
+    Every repetition configures a new object, so configure and first run are
+    measured `repeat` times as well.  A case that cannot be imported (missing
+    optional package) or raises SkipCase (missing input file) is returned as
+    skipped, one that raises otherwise as failed.
+    """
+
+    result = OrderedDict([('status', 'ok')])
+
+    try:
+        configure, run = CASES[name]()
+    except (ImportError, SkipCase) as e:
+        result['status'] = 'skipped'
+        result['error'] = str(e)
+        return result
+
+    times = dict((phase, []) for phase in PHASES)
+    try:
+        for i in range(repeat):
+            t, obj = _timed(configure)
+            times['configure'].append(t)
+            times['first_run'].append(_timed(run, obj)[0])
+            times['warm_run'].append(_timed(run, obj)[0])
+    except Exception:
+        result['status'] = 'failed'
+        result['error'] = traceback.format_exc()
+        return result
+
+    for phase in PHASES:
+        result[phase] = _stats(times[phase])
+
+    return result
+
+
+def run_benchmarks(names=None, repeat=3, stream=None):
+    """OrderedDict of the machine description and the result of each case"""
+
+    results = OrderedDict([('python', sys.version.split()[0]),
+                           ('platform', platform.platform()),
+                           ('repeat', repeat),
+                           ('cases', OrderedDict())])
+
+    for name in names or CASES.keys():
+        results['cases'][name] = result = time_case(name, repeat)
+        if stream is not None:
+            stream.write(_format_case(name, result) + '\n')
+            stream.flush()
+
+    return results
+
+
+# --- reporting ---
+
+def _format_case(name, result):
+
+    if result['status'] != 'ok':
+        return '%-22s %s: %s' % (name, result['status'], result['error'].strip().splitlines()[-1])
+
+    return '%-22s ' % name + ' '.join('%10.3f' % result[phase]['best'] for phase in PHASES)
+
+
+def compare(results, baseline, tolerance=1.2, min_time=0.01):
+    """lines comparing the best times with a baseline, and the regressions
+
+    A phase regresses when its best time exceeds tolerance times the baseline best
+    and is more than min_time (s) slower, so that timer noise on very short phases
+    is not reported.  Cases missing from the baseline or not ok on either side are
+    listed but not compared.
+    """
+
+    lines = ['%-22s %-10s %10s %10s %8s' % ('case', 'phase', 'baseline', 'current', 'ratio')]
+    regressions = []
+
+    for name, result in results['cases'].items():
+        base = baseline['cases'].get(name)
+        if base is None or base['status'] != 'ok' or result['status'] != 'ok':
+            lines.append('%-22s %-10s %10s %10s' % (name, '-', base['status'] if base else 'missing',
+                                                   result['status']))
+            continue
+        for phase in PHASES:
+            old, new = base[phase]['best'], result[phase]['best']
+            ratio = new/old if old > 0 else float('inf')
+            flag = ''
+            if ratio > tolerance and new - old > min_time:
+                regressions.append((name, phase, ratio))
+                flag = '  <-- slower'
+            lines.append('%-22s %-10s %10.3f %10.3f %8.2f%s' % (name, phase, old, new, ratio, flag))
+
+    return lines, regressions
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[2])
+    parser.add_argument('cases', nargs='*', help='cases to run (default all): ' + ', '.join(CASES))
+    parser.add_argument('-n', '--repeat', type=int, default=3, help='repetitions of every phase')
+    parser.add_argument('-o', '--output', help='write the results as JSON')
+    parser.add_argument('-b', '--baseline', help='JSON results to compare against')
+    parser.add_argument('-t', '--tolerance', type=float, default=1.2,
+                        help='slow-down ratio of the best time reported as a regression')
+    parser.add_argument('--min-time', type=float, default=0.01,
+                        help='smallest slow-down (s) reported as a regression')
+    parser.add_argument('--ecn-file', help='ECN O&M spreadsheet for the lcoe_se_ecn_opex case '
+                        '(default $WISDEM_ECN_FILE)')
+    args = parser.parse_args(argv)
+
+    if args.ecn_file:
+        if not os.path.isfile(args.ecn_file):
+            parser.error('ECN O&M spreadsheet %s not found' % args.ecn_file)
+        os.environ['WISDEM_ECN_FILE'] = args.ecn_file
+
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error('unknown case(s): ' + ', '.join(unknown))
+
+    print('%-22s ' % 'case' + ' '.join('%10s' % phase for phase in PHASES))
+    results = run_benchmarks(args.cases, args.repeat, sys.stdout)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        lines, regressions = compare(results, baseline, args.tolerance, args.min_time)
+        print('')
+        print('\n'.join(lines))
+        if regressions:
+            print('%d phase(s) slower than %.2fx the baseline' % (len(regressions), args.tolerance))
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
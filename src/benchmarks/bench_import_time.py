@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+bench_import_time.py
+
+Time the import of the WISDEM assembly modules, each in a fresh interpreter, and list
+which optional subsystems the import pulled in (they should only load once a
+configuration selects them).
+
+    python bench_import_time.py [-n REPEAT] [module ...]
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+
+
+MODULES = ['wisdem.turbinese.turbine',
+           'wisdem.turbinese.turbine_se_seam',
+           'wisdem.lcoe.lcoe_se_assembly',
+           'wisdem.lcoe.lcoe_se_seam_assembly',
+           'wisdem.lcoe.lcoe_csm_2015_assembly',
+           'wisdem.lcoe.lcoeassembly']
+
+# packages that are only needed by some configurations
+OPTIONAL = ['drivewpact', 'drivese', 'SEAMLoads', 'SEAMTower', 'SEAMAero', 'SEAMRotor',
+            'plant_costsse.nrel_land_bosse', 'plant_costsse.ecn_offshore_opex']
+
+_SCRIPT = """
+import sys, time, json
+t0 = time.time()
+import %s
+t1 = time.time()
+optional = [name for name in %r if name in sys.modules]
+print(json.dumps({'time': t1 - t0, 'modules': len(sys.modules), 'optional': optional}))
+"""
+
+
+def time_import(module):
+    """import time (s), number of loaded modules and optional packages loaded, in a fresh interpreter"""
+
+    output = subprocess.check_output([sys.executable, '-c', _SCRIPT % (module, OPTIONAL)])
+
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='fresh interpreters per module')
+    args = parser.parse_args(argv)
+
+    print('%-40s %10s %10s %8s  %s' % ('module', 'best (s)', 'median (s)', 'modules', 'optional loaded'))
+
+    for module in args.modules:
+        try:
+            runs = [time_import(module) for i in range(args.repeat)]
+        except subprocess.CalledProcessError:
+            print('%-40s %10s' % (module, 'failed'))
+            continue
+
+        times = sorted(run['time'] for run in runs)
+        print('%-40s %10.3f %10.3f %8d  %s' % (module, times[0], times[len(times)//2], runs[0]['modules'],
+                                              ', '.join(runs[0]['optional']) or '-'))
+
+
+if __name__ == '__main__':
+    main()
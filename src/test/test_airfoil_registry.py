@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_airfoil_registry.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import wisdem
+from ccblade import CCAirfoil
+from wisdem.reference_turbines import airfoil_registry
+from wisdem.reference_turbines.airfoil_registry import AirfoilRegistry
+from wisdem.reference_turbines.nrel5mw.nrel5mw import configure_nrel5mw_turbine
+from wisdem.turbinese.turbine import TurbineSE
+
+
+AIRFOIL = os.path.join(wisdem.__path__[0], 'reference_turbines', 'nrel5mw', 'airfoils', 'DU25_A17.dat')
+
+
+class TestAirfoilRegistry(unittest.TestCase):
+
+    def test_sharing(self):
+
+        shared = AirfoilRegistry()
+        with airfoil_registry.sharing(shared):
+            af1 = CCAirfoil.initFromAerodynFile(AIRFOIL)
+            af2 = CCAirfoil.initFromAerodynFile(AIRFOIL)
+
+        self.assertTrue(af1 is af2)
+        self.assertEqual(shared.parsed, 1)
+
+
+    def test_nested(self):
+
+        outer = AirfoilRegistry()
+        inner = AirfoilRegistry()
+        with airfoil_registry.sharing(outer):
+            with airfoil_registry.sharing(inner):
+                CCAirfoil.initFromAerodynFile(AIRFOIL)
+            CCAirfoil.initFromAerodynFile(AIRFOIL)
+
+        self.assertEqual((outer.parsed, inner.parsed), (1, 1))
+        self.assertTrue(CCAirfoil.__dict__['initFromAerodynFile'] is airfoil_registry._original_init)
+
+
+    def test_threads(self):
+
+        first = AirfoilRegistry()
+        second = AirfoilRegistry()
+        opened = threading.Event()
+        closed = threading.Event()
+
+        def hold():
+            with airfoil_registry.sharing(second):
+                opened.set()
+                closed.wait(10.0)
+
+        thread = threading.Thread(target=hold)
+        with airfoil_registry.sharing(first):
+            thread.start()
+            opened.wait(10.0)
+
+        # the first block closed while the other thread's block is open, which keeps the patch
+        af = CCAirfoil.initFromAerodynFile(AIRFOIL)
+        closed.set()
+        thread.join()
+
+        self.assertTrue(af is second.get(AIRFOIL))
+        self.assertEqual((first.parsed, second.parsed), (0, 1))
+        self.assertTrue(CCAirfoil.__dict__['initFromAerodynFile'] is airfoil_registry._original_init)
+
+
+    def test_grid_dir(self):
+
+        grid_dir = tempfile.mkdtemp()
+        try:
+            writer = AirfoilRegistry(grid_dir)
+            writer.get(AIRFOIL)
+            reader = AirfoilRegistry(grid_dir)  # e.g. in another process
+            reader.get(AIRFOIL)
+        finally:
+            shutil.rmtree(grid_dir)
+
+        self.assertEqual((writer.parsed, reader.parsed), (1, 0))
+
+
+    def test_turbine_without_sharing(self):
+
+        shared_turbine = TurbineSE()
+        configure_nrel5mw_turbine(shared_turbine, 'I', 0.0, share_airfoils=True)
+        turbine = TurbineSE()
+        configure_nrel5mw_turbine(turbine, 'I', 0.0)
+
+        # configuring never patches CCAirfoil, so every other turbine loads its own polars
+        self.assertTrue(CCAirfoil.__dict__['initFromAerodynFile'] is airfoil_registry._original_init)
+        af_file = turbine.rotor.airfoil_files[-1]
+        self.assertFalse(CCAirfoil.initFromAerodynFile(af_file) is CCAirfoil.initFromAerodynFile(af_file))
+        self.assertFalse(CCAirfoil.initFromAerodynFile(af_file) is airfoil_registry.registry.get(af_file))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_assembly_state.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import unittest
+import numpy as np
+from openmdao.main.api import Assembly, Component
+from openmdao.main.datatypes.api import Float, Array
+from wisdem.utilities.assembly_state import input_paths, snapshot_inputs, restore_inputs, \
+    clone_assembly, AssemblyCache
+
+
+class Cost(Component):
+
+    turbine_number = Float(100.0, iotype='in')
+    A = Float(8.0, iotype='in')
+    weights = Array(np.ones(2), iotype='in')
+    coe = Float(iotype='out')
+
+    def execute(self):
+        self.coe = np.sum(self.weights)/(self.turbine_number*self.A)
+
+
+class Plant(Assembly):
+
+    def configure(self):
+
+        self.add('turbine_number', Float(100.0, iotype='in'))
+        self.add('coe', Float(iotype='out'))
+
+        self.add('cost', Cost())
+        self.driver.workflow.add(['cost'])
+
+        self.connect('turbine_number', 'cost.turbine_number')
+        self.connect('cost.coe', 'coe')
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_input_paths(self):
+
+        paths = input_paths(Plant())
+
+        self.assertTrue('turbine_number' in paths)
+        self.assertTrue('cost.A' in paths)
+        self.assertTrue('cost.weights' in paths)
+        self.assertFalse('cost.turbine_number' in paths)  # connected
+        self.assertFalse('cost.coe' in paths)
+
+
+    def test_restore(self):
+
+        plant = Plant()
+        snapshot = snapshot_inputs(plant)
+
+        plant.turbine_number = 50.0
+        plant.cost.weights[0] = 3.0  # in place, the snapshot holds a copy
+        plant.run()
+
+        self.assertEqual(sorted(restore_inputs(plant, snapshot)), ['cost.weights', 'turbine_number'])
+        self.assertEqual(plant.turbine_number, 100.0)
+        np.testing.assert_equal(plant.cost.weights, [1.0, 1.0])
+        self.assertEqual(restore_inputs(plant, snapshot), [])
+
+        plant.run()
+        self.assertEqual(plant.coe, 2.0/800.0)
+
+
+    def test_clone(self):
+
+        plant = Plant()
+        plant.cost.A = 4.0
+        clone = clone_assembly(plant)
+
+        clone.cost.weights[1] = 3.0
+        clone.run()
+        plant.run()
+
+        self.assertEqual(clone.cost.A, 4.0)
+        self.assertEqual(clone.coe, 4.0/400.0)
+        self.assertEqual(plant.coe, 2.0/400.0)
+
+
+
+class TestAssemblyCache(unittest.TestCase):
+
+    def setUp(self):
+
+        def factory(A):
+            plant = Plant()
+            plant.cost.A = A
+            return plant
+
+        self.cache = AssemblyCache(factory, maxsize=2)
+
+    def test_reuse(self):
+
+        plant = self.cache.get(4.0)
+        plant.cost.A = 1.0
+
+        self.assertTrue(self.cache.get(4.0) is plant)
+        self.assertEqual(plant.cost.A, 4.0)
+        self.assertEqual(self.cache.builds, 1)
+
+
+    def test_lru(self):
+
+        first = self.cache.get(4.0)
+        self.cache.get(8.0)
+        self.cache.get(4.0)  # 8.0 is now the least recently used
+        self.cache.get(2.0)
+
+        self.assertTrue(self.cache.get(4.0) is first)
+        self.assertEqual(self.cache.builds, 3)
+        self.cache.get(8.0)
+        self.assertEqual(self.cache.builds, 4)
+
+        self.cache.clear()
+        self.assertFalse(self.cache.get(4.0) is first)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
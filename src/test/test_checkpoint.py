@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_checkpoint.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from openmdao.api import Problem, Group, Component, IndepVarComp
+from wisdem.utilities.checkpoint import CheckpointScipyOptimizer
+
+
+class Paraboloid(Component):
+
+    def __init__(self, fail_at=None):
+        super(Paraboloid, self).__init__()
+        self.add_param('x', val=3.0)
+        self.add_param('y', val=-4.0)
+        self.add_param('a', val=3.0)
+        self.add_output('f', val=0.0)
+        self.add_output('c', val=0.0)
+        self.runs = 0
+        self.fail_at = fail_at
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        if self.runs == self.fail_at:
+            raise RuntimeError('interrupted')
+        x, y, a = params['x'], params['y'], params['a']
+        unknowns['f'] = (x - a)**2 + x*y + (y + 4.0)**2 - 3.0
+        unknowns['c'] = x + y
+        self.runs += 1
+
+    def linearize(self, params, unknowns, resids):
+        x, y, a = params['x'], params['y'], params['a']
+        return {('f', 'x'): 2.0*(x - a) + y, ('f', 'y'): x + 2.0*(y + 4.0), ('f', 'a'): -2.0*(x - a),
+                ('c', 'x'): 1.0, ('c', 'y'): 1.0, ('c', 'a'): 0.0}
+
+
+def optimize(checkpoint_file, optimizer='SLSQP', keep_checkpoint=False, fail_at=None, a=3.0):
+
+    prob = Problem(Group())
+    prob.root.add('px', IndepVarComp('x', 3.0), promotes=['*'])
+    prob.root.add('py', IndepVarComp('y', -4.0), promotes=['*'])
+    prob.root.add('pa', IndepVarComp('a', a), promotes=['*'])
+    prob.root.add('parab', Paraboloid(fail_at), promotes=['*'])
+
+    prob.driver = CheckpointScipyOptimizer(checkpoint_file, keep_checkpoint)
+    prob.driver.options['optimizer'] = optimizer
+    prob.driver.options['disp'] = False
+    prob.driver.add_desvar('x', lower=-50.0, upper=50.0)
+    prob.driver.add_desvar('y', lower=-50.0, upper=50.0)
+    prob.driver.add_objective('f')
+    prob.driver.add_constraint('c', upper=-1.0)
+
+    prob.setup(check=False)
+    prob.run()
+
+    return prob
+
+
+class TestCheckpointScipyOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.checkpoint_file = os.path.join(self.directory, 'opt.ckpt')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_resume(self):
+
+        first = optimize(self.checkpoint_file, keep_checkpoint=True)
+        self.assertTrue(os.path.exists(self.checkpoint_file))
+        second = optimize(self.checkpoint_file)
+
+        # every evaluation of the second run comes from the checkpoint
+        self.assertEqual(second.driver.replayed, len(first.driver.evaluations))
+        self.assertTrue(second.root.parab.runs <= 2)
+        self.assertEqual(second['x'], first['x'])
+        self.assertEqual(second['y'], first['y'])
+        self.assertEqual(second['f'], first['f'])
+
+        # a finished run removes its checkpoint
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+
+    def test_interrupted(self):
+
+        reference = optimize(None)
+
+        self.assertRaises(RuntimeError, optimize, self.checkpoint_file, fail_at=2)
+        self.assertTrue(os.path.exists(self.checkpoint_file))
+        resumed = optimize(self.checkpoint_file)
+
+        self.assertTrue(resumed.driver.replayed > 0)
+        self.assertEqual(resumed['x'], reference['x'])
+        self.assertEqual(resumed['y'], reference['y'])
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+
+    def test_other_problem(self):
+
+        optimize(self.checkpoint_file, keep_checkpoint=True)
+
+        self.assertRaises(ValueError, optimize, self.checkpoint_file, 'COBYLA')
+        self.assertRaises(ValueError, optimize, self.checkpoint_file, a=2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_complex_step.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import unittest
+import numpy as np
+from openmdao.api import Problem, Group, Component, IndepVarComp
+from wisdem.utilities.complex_step import supports_complex_step, use_complex_step
+
+
+class Smooth(Component):
+
+    def __init__(self):
+        super(Smooth, self).__init__()
+        self.add_param('x', val=np.ones(3))
+        self.add_output('y', val=np.zeros(3))
+        self.add_output('z', val=0.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = params['x']**2
+        unknowns['z'] = np.sum(np.sin(params['x']))
+
+
+class DropsImaginary(Smooth):
+    # z goes through abs, which drops the imaginary part, while y stays complex
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = params['x']**2
+        unknowns['z'] = np.abs(np.sum(params['x']))
+
+
+class TestComplexStep(unittest.TestCase):
+
+    def test_selection(self):
+
+        prob = Problem(Group())
+        prob.root.add('px', IndepVarComp('x', np.array([1.0, -2.0, 3.0])), promotes=['*'])
+        prob.root.add('smooth', Smooth(), promotes=['x'])
+        prob.root.add('drops', DropsImaginary(), promotes=['x'])
+        prob.setup(check=False)
+        prob.run()
+
+        self.assertTrue(supports_complex_step(prob.root.smooth))
+        self.assertFalse(supports_complex_step(prob.root.drops))
+
+        # the trial runs leave the real values in place
+        np.testing.assert_equal(prob['smooth.y'], [1.0, 4.0, 9.0])
+        self.assertFalse(np.iscomplexobj(prob['drops.y']))
+
+        types = use_complex_step(prob.root)
+        self.assertEqual(types, {'smooth': 'cs', 'drops': 'fd'})
+
+        x = np.array([1.0, -2.0, 3.0])
+        J = prob.calc_gradient(['x'], ['smooth.y', 'smooth.z', 'drops.z'], return_format='array')
+        np.testing.assert_allclose(J, np.vstack([np.diag(2.0*x), np.cos(x), np.sign(np.sum(x))*np.ones(3)]),
+                                   rtol=1e-6, atol=1e-8)
+
+
+    def test_fd_root(self):
+
+        prob = Problem(Group())
+        prob.root.add('px', IndepVarComp('x', np.ones(3)), promotes=['*'])
+        prob.root.add('smooth', Smooth(), promotes=['x'])
+        prob.root.deriv_options['type'] = 'fd'
+        prob.setup(check=False)
+        prob.run()
+
+        self.assertRaises(RuntimeError, use_complex_step, prob.root)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_fixed_point.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from openmdao.main.api import Assembly, Component
+from openmdao.main.datatypes.api import Float, Array
+from wisdem.turbinese.fixed_point import PicardUpdate, AitkenUpdate, AndersonUpdate, WarmStartStore, \
+    AcceleratedFixedPointIterator, add_flexible_blade_loop
+
+
+def linear_map():
+    # g(x) = A x + b, a contraction with spectral radius 0.9
+
+    rng = np.random.RandomState(0)
+    Q = np.linalg.qr(rng.randn(4, 4))[0]
+    A = np.dot(Q*np.array([0.9, 0.5, -0.3, 0.1]), Q.T)
+    b = rng.randn(4)
+    x_star = np.linalg.solve(np.eye(4) - A, b)
+
+    return (lambda x: np.dot(A, x) + b), x_star
+
+
+def iterate(accelerator, g, x, tol=1e-10, max_iteration=500):
+
+    accelerator.reset()
+    for iteration in range(1, max_iteration + 1):
+        gx = g(x)
+        if np.max(np.abs(gx - x)) <= tol:
+            break
+        x = accelerator.update(x, gx)
+
+    return x, iteration
+
+
+class FlexibleRotor(Component):
+    """stands in for RotorSE: the deflections out are a contraction of the deflections in"""
+
+    load = Float(1.0, iotype='in')
+    delta_precurve_sub = Array(np.zeros(3), iotype='in')
+    delta_bladeLength = Float(0.0, iotype='in')
+
+    delta_precurve_sub_out = Array(np.zeros(3), iotype='out')
+    delta_bladeLength_out = Float(0.0, iotype='out')
+
+    # spectral radius 0.3, so the plain iteration also converges within 20 evaluations
+    Q = np.linalg.qr(np.random.RandomState(1).randn(4, 4))[0]
+    A = np.dot(Q*np.array([0.3, -0.2, 0.1, 0.05]), Q.T)
+    b = np.array([0.5, -1.0, 2.0, 0.1])
+
+    def execute(self):
+        x = np.append(self.delta_precurve_sub, self.delta_bladeLength)
+        g = np.dot(self.A, x) + self.load*self.b
+        self.delta_precurve_sub_out = g[:3]
+        self.delta_bladeLength_out = g[3]
+
+    @classmethod
+    def solution(cls, load):
+        return np.linalg.solve(np.eye(4) - cls.A, load*cls.b)
+
+
+class FlexibleBlade(Assembly):
+
+    def __init__(self, fpi_acceleration=None, fpi_warm_start=None):
+        self.fpi_acceleration = fpi_acceleration
+        self.fpi_warm_start = fpi_warm_start
+        super(FlexibleBlade, self).__init__()
+
+    def configure(self):
+
+        self.add('rotor', FlexibleRotor())
+        add_flexible_blade_loop(self, self.fpi_acceleration, self.fpi_warm_start)
+        self.driver.workflow.add(['fpi'])
+
+
+def deflections(assembly):
+
+    return np.append(assembly.rotor.delta_precurve_sub, assembly.rotor.delta_bladeLength)
+
+
+class TestAcceleration(unittest.TestCase):
+
+    def setUp(self):
+        self.g, self.x_star = linear_map()
+        self.x0 = np.zeros(4)
+        self.picard_x, self.picard_iterations = iterate(PicardUpdate(), self.g, self.x0)
+
+    def test_picard(self):
+
+        np.testing.assert_allclose(self.picard_x, self.x_star, atol=1e-8)
+
+
+    def test_aitken(self):
+
+        x, iterations = iterate(AitkenUpdate(), self.g, self.x0)
+
+        np.testing.assert_allclose(x, self.x_star, atol=1e-8)
+        self.assertTrue(iterations < self.picard_iterations)
+
+
+    def test_anderson(self):
+
+        x, iterations = iterate(AndersonUpdate(depth=5), self.g, self.x0)
+
+        # exact for a linear map once the history spans the space
+        np.testing.assert_allclose(x, self.x_star, atol=1e-8)
+        self.assertTrue(iterations <= 7)
+
+
+    def test_anderson_depth(self):
+
+        anderson = AndersonUpdate(depth=2)
+        x = self.x0
+        for i in range(6):
+            x = anderson.update(x, self.g(x))
+
+        self.assertEqual(len(anderson.x_hist), 3)
+
+
+    def test_reset(self):
+
+        aitken = AitkenUpdate(omega0=0.5)
+        aitken.update(self.x0, self.g(self.x0))
+        aitken.update(self.x0 + 1.0, self.g(self.x0 + 1.0))
+        aitken.reset()
+
+        self.assertEqual(aitken.omega, 0.5)
+        self.assertTrue(aitken.r_prev is None)
+
+
+class TestAcceleratedFixedPointIterator(unittest.TestCase):
+
+    def test_standard(self):
+
+        self.assertFalse(isinstance(FlexibleBlade().fpi, AcceleratedFixedPointIterator))
+
+
+    def test_converges(self):
+
+        iterations = {}
+        for acceleration in ['none', 'aitken', 'anderson']:
+            assembly = FlexibleBlade(fpi_acceleration=acceleration)
+            self.assertTrue(isinstance(assembly.fpi, AcceleratedFixedPointIterator))
+            assembly.run()
+
+            np.testing.assert_allclose(deflections(assembly), FlexibleRotor.solution(1.0), atol=1e-7)
+            self.assertTrue(assembly.fpi.residual_norm <= assembly.fpi.tolerance)
+            iterations[acceleration] = assembly.fpi.iteration_count
+
+        self.assertTrue(iterations['none'] <= assembly.fpi.max_iteration)
+        self.assertTrue(iterations['aitken'] < iterations['none'])
+        self.assertTrue(iterations['anderson'] < iterations['none'])
+
+
+    def test_warm_start(self):
+
+        # plain iteration, whose number of evaluations falls with the starting error
+        store = WarmStartStore(['rotor.load'])
+        assembly = FlexibleBlade(fpi_acceleration='none', fpi_warm_start=store)
+        assembly.run()
+        cold = assembly.fpi.iteration_count
+        self.assertEqual((store.hits, store.misses, len(store.entries)), (0, 1, 1))
+
+        # a new assembly at the same design starts from the converged deflections
+        assembly = FlexibleBlade(fpi_acceleration='none', fpi_warm_start=store)
+        assembly.run()
+        self.assertEqual(assembly.fpi.iteration_count, 1)
+        self.assertEqual(store.hits, 1)
+
+        # a nearby design starts from them too and converges to its own solution
+        assembly.rotor.load = 1.1
+        assembly.run()
+        np.testing.assert_allclose(deflections(assembly), FlexibleRotor.solution(1.1), atol=1e-7)
+        self.assertTrue(assembly.fpi.iteration_count < cold)
+        self.assertEqual(len(store.entries), 2)
+
+
+class TestWarmStartStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_nearest(self):
+
+        store = WarmStartStore(['chord', 'precone'])
+        self.assertTrue(store.nearest([1.0, 2.0]) is None)
+
+        store.add([1.0, 2.0], [10.0])
+        store.add([3.0, 2.0], [30.0])
+        store.add([1.0, 2.0, 3.0], [40.0])  # other size, never returned for two variables
+
+        np.testing.assert_equal(store.nearest([2.5, 2.0]), [30.0])
+        np.testing.assert_equal(store.nearest([0.0, 2.0]), [10.0])
+        self.assertEqual((store.hits, store.misses), (2, 1))
+
+
+    def test_lru_eviction(self):
+
+        store = WarmStartStore(['x'], maxsize=2)
+        store.add([1.0], [1.0])
+        store.add([2.0], [2.0])
+        store.nearest([1.0])  # 1.0 is now the most recently used
+        store.add([3.0], [3.0])
+
+        designs = sorted(d[0] for d, x in store.entries.values())
+        self.assertEqual(designs, [1.0, 3.0])
+
+
+    def test_pickle_round_trip(self):
+
+        filename = os.path.join(self.directory, 'warm_start.pkl')
+        store = WarmStartStore(['x'], maxsize=3, filename=filename)
+        for i in range(5):
+            store.add([float(i)], [10.0*i, 1.0])
+
+        loaded = WarmStartStore(['x'], maxsize=3, filename=filename)
+        self.assertEqual(list(loaded.entries.keys()), list(store.entries.keys()))
+        np.testing.assert_equal(loaded.nearest([3.9]), [40.0, 1.0])
+
+        # a store for other design variables ignores the file
+        other = WarmStartStore(['y'], filename=filename)
+        self.assertEqual(len(other.entries), 0)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_lcoe_gradients.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import unittest
+import numpy as np
+from openmdao.api import Problem, Group
+from wisdem.lcoe.lcoeassembly import RNAMass, LCOEcalc, calc_coe, batch_coe
+
+
+def check_partials(comp, inputs):
+
+    prob = Problem(Group())
+    prob.root.add('comp', comp)
+    prob.setup(check=False)
+    for name, value in inputs.items():
+        prob['comp.' + name] = value
+    prob.run()
+
+    data = prob.check_partial_derivatives(out_stream=None)
+    for key, d in data['comp'].items():
+        np.testing.assert_allclose(d['J_fwd'], d['J_fd'], rtol=1e-4, atol=1e-6, err_msg=str(key))
+
+
+class TestRNAMass(unittest.TestCase):
+
+    def test1(self):
+
+        check_partials(RNAMass(), {
+            'blade_mass': 17740.0,
+            'hub_system_mass': 40000.0,
+            'nacelle_mass': 240000.0,
+            'hub_system_cm': np.array([-6.3, 0.0, 3.15]),
+            'nacelle_cm': np.array([-0.3, 0.0, 2.4]),
+            'blades_I': np.array([1.1e7, 5.4e6, 5.4e6]),
+            'hub_system_I': np.array([1.1e5, 1.0e5, 1.0e5]),
+            'nacelle_I': np.array([7.7e5, 3.0e6, 2.6e6])})
+
+
+class TestLCOEcalc(unittest.TestCase):
+
+    def test1(self):
+
+        check_partials(LCOEcalc(), {
+            'turbine_cost': 4.0e6,
+            'turbine_number': 100,
+            'bos_cost': 1.7e8,
+            'opex': 1.4e7,
+            'fcr': 0.079,
+            'aep': 1.2e9})
+
+
+class TestBatchCOE(unittest.TestCase):
+
+    def test1(self):
+
+        n = 25
+        scenarios = np.zeros(n, dtype=[('opex', float), ('fcr', float), ('aep', float)])
+        scenarios['opex'] = np.linspace(1.0e7, 2.0e7, n)
+        scenarios['fcr'] = np.linspace(0.06, 0.1, n)
+        scenarios['aep'] = np.linspace(1.0e9, 1.5e9, n)
+
+        coe = batch_coe(scenarios, chunk_size=7, turbine_cost=4.0e6, turbine_number=100, bos_cost=1.7e8)
+        expected = calc_coe(4.0e6, 100, 1.7e8, scenarios['opex'], scenarios['fcr'], scenarios['aep'])
+
+        np.testing.assert_allclose(coe, expected, rtol=1e-15)
+
+    def test_missing(self):
+
+        self.assertRaises(ValueError, batch_coe, {'aep': np.ones(3)}, fcr=0.079)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
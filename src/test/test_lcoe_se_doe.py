@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_lcoe_se_doe.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import unittest
+from openmdao.main.api import Assembly, Component
+from openmdao.main.datatypes.api import Float
+from wisdem.lcoe import lcoe_se_doe
+from wisdem.lcoe.lcoe_se_doe import evaluate_case
+from wisdem.utilities.assembly_state import AssemblyCache
+
+
+class Cost(Component):
+
+    turbine_number = Float(100.0, iotype='in')
+    A = Float(8.0, iotype='in')
+    coe = Float(iotype='out')
+
+    def execute(self):
+        self.coe = 1.0/(self.turbine_number*self.A)
+
+
+class Plant(Assembly):
+
+    def configure(self):
+
+        self.add('turbine_number', Float(100.0, iotype='in'))
+        self.add('coe', Float(iotype='out'))
+
+        self.add('cost', Cost())
+        self.driver.workflow.add(['cost'])
+
+        self.connect('turbine_number', 'cost.turbine_number')
+        self.connect('cost.coe', 'coe')
+
+
+class TestEvaluateCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.assemblies, self.outputs = lcoe_se_doe._assemblies, lcoe_se_doe._outputs
+        lcoe_se_doe._assemblies = AssemblyCache(lambda wind_class, sea_depth: Plant())
+        lcoe_se_doe._outputs = ('coe',)
+
+    def tearDown(self):
+        lcoe_se_doe._assemblies, lcoe_se_doe._outputs = self.assemblies, self.outputs
+
+    def test_cases_independent(self):
+
+        first, error = evaluate_case({'turbine_number': 50.0, 'cost.A': 4.0})
+        self.assertEqual(error, None)
+        self.assertEqual(first['coe'], 1.0/200.0)
+
+        # inputs set by the previous case are back at their configured values
+        second, error = evaluate_case({'cost.A': 2.0})
+        self.assertEqual(second['coe'], 1.0/200.0)
+        third, error = evaluate_case({})
+        self.assertEqual(third['coe'], 1.0/800.0)
+
+        self.assertEqual(lcoe_se_doe._assemblies.builds, 1)
+
+
+    def test_failed_case(self):
+
+        # turbine_number is set before the unknown input raises
+        values, error = evaluate_case({'turbine_number': 10.0, 'nope': 1.0})
+        self.assertEqual(values, {})
+        self.assertTrue(error is not None)
+
+        values, error = evaluate_case({'sea_depth': 0.0})
+        self.assertEqual(values['coe'], 1.0/800.0)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
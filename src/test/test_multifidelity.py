@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_multifidelity.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import unittest
+import numpy as np
+from wisdem.lcoe.multifidelity import pareto_ranks, select_candidates, Fidelity, SE_INPUTS
+
+
+class Inputs(object):
+    # records what Fidelity.apply sets
+
+    def __init__(self):
+        self.values = {}
+
+    def set(self, path, value):
+        self.values[path] = value
+
+
+RESULTS = [({'coe': 0.05, 'turbine_cost': 3.0}, None),
+           ({}, 'Traceback (most recent call last): ...'),  # failed
+           ({'coe': np.nan, 'turbine_cost': 1.0}, None),
+           ({'coe': 0.04, 'turbine_cost': 5.0}, None),
+           ({'coe': 0.05, 'turbine_cost': 2.0}, None),  # ties with 0 in coe
+           ({'coe': np.inf, 'turbine_cost': 1.0}, None),
+           ({'coe': 0.06, 'turbine_cost': 1.0}, None),
+           ({'coe': 0.01, 'turbine_cost': np.nan}, None)]
+
+
+class TestSelection(unittest.TestCase):
+
+    def test_pareto_ranks(self):
+
+        values = [[1.0, 4.0], [2.0, 2.0], [4.0, 1.0], [3.0, 3.0], [2.0, 2.0], [5.0, 5.0]]
+
+        # identical points do not dominate each other
+        np.testing.assert_equal(pareto_ranks(values), [0, 0, 0, 1, 0, 2])
+        np.testing.assert_equal(pareto_ranks([[1.0], [1.0], [0.5]]), [1, 1, 0])
+        self.assertEqual(len(pareto_ranks(np.zeros((0, 2)))), 0)
+
+
+    def test_first_objective(self):
+
+        # failed and non-finite designs are skipped, ties keep the design order
+        self.assertEqual(select_candidates(RESULTS, ['coe'], 10), [7, 3, 0, 4, 6])
+        self.assertEqual(select_candidates(RESULTS, ['coe', 'turbine_cost'], 10), [3, 0, 4, 6])
+        self.assertEqual(select_candidates(RESULTS, ['coe'], 2), [7, 3])
+        self.assertEqual(select_candidates(RESULTS, ['coe'], 0), [])
+        self.assertEqual(select_candidates(RESULTS[1:3], ['coe'], 5), [])
+
+
+    def test_pareto(self):
+
+        # front {3, 4, 6} by coe, then 0 (dominated by 4)
+        self.assertEqual(select_candidates(RESULTS, ['coe', 'turbine_cost'], 10, pareto=True), [3, 4, 6, 0])
+        self.assertEqual(select_candidates(RESULTS, ['coe', 'turbine_cost'], 3, pareto=True), [3, 4, 6])
+
+
+
+class TestFidelity(unittest.TestCase):
+
+    def test_apply(self):
+
+        assembly = Inputs()
+        Fidelity(None, SE_INPUTS).apply(assembly, {'rotor_diameter': 126.0, 'tsr': 7.55, 'turbine_number': 50})
+
+        # the reference 126 m rotor has 61.5 m blades
+        self.assertEqual(assembly.values, {'rotor.bladeLength': 61.5, 'rotor.control.tsr': 7.55,
+                                           'turbine_number': 50})
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_optional_imports.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import sys
+import json
+import unittest
+import subprocess
+
+
+# packages that are only needed by some configurations
+OPTIONAL = ['drivewpact', 'drivese', 'SEAMLoads', 'SEAMTower', 'SEAMAero', 'SEAMRotor',
+            'plant_costsse.nrel_land_bosse', 'plant_costsse.ecn_offshore_opex']
+
+_SCRIPT = """
+import sys, json
+import %s
+print(json.dumps([name for name in %r if name in sys.modules]))
+"""
+
+
+def optional_loaded(module):
+    # optional packages in sys.modules after importing module in a fresh interpreter
+
+    output = subprocess.check_output([sys.executable, '-c', _SCRIPT % (module, OPTIONAL)])
+
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+class TestOptionalImports(unittest.TestCase):
+
+    def test_turbine(self):
+
+        self.assertEqual(optional_loaded('wisdem.turbinese.turbine'), [])
+
+
+    def test_lcoe_se_assembly(self):
+
+        self.assertEqual(optional_loaded('wisdem.lcoe.lcoe_se_assembly'), [])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
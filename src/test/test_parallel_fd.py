@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_parallel_fd.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import unittest
+from collections import OrderedDict
+import numpy as np
+from openmdao.api import Problem, Group, Component, IndepVarComp
+from wisdem.utilities.parallel_fd import fd_step, _evaluate, color_columns, FiniteDifferenceJacobian, \
+    FDScipyOptimizer
+
+
+class Banded(Component):
+    """y[i] = x[i]**2 + x[i+1]*z, f = sum(x)*z"""
+
+    def __init__(self, n=6):
+        super(Banded, self).__init__()
+        self.add_param('x', val=np.zeros(n))
+        self.add_param('z', val=0.0)
+        self.add_output('y', val=np.zeros(n-1))
+        self.add_output('f', val=0.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        x, z = params['x'], params['z']
+        unknowns['y'] = x[:-1]**2 + x[1:]*z
+        unknowns['f'] = np.sum(x)*z
+
+
+class Cubic(Component):
+    """y = x**3, so finite differences with a large step depend on its form and size"""
+
+    def __init__(self, n=4):
+        super(Cubic, self).__init__()
+        self.add_param('x', val=np.zeros(n))
+        self.add_output('y', val=np.zeros(n))
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        unknowns['y'] = params['x']**3
+
+
+def create_problem():
+
+    prob = Problem(Group())
+    prob.root.add('px', IndepVarComp('x', np.zeros(6)), promotes=['*'])
+    prob.root.add('pz', IndepVarComp('z', 0.0), promotes=['*'])
+    prob.root.add('banded', Banded(), promotes=['*'])
+    prob.setup(check=False)
+
+    return prob
+
+
+def create_cubic(form='central', step_calc='relative'):
+
+    prob = Problem(Group())
+    prob.root.add('px', IndepVarComp('x', np.array([-2.0, 0.5, 10.0, 12.0])), promotes=['*'])
+    prob.root.add('cubic', Cubic(), promotes=['*'])
+    prob.root.deriv_options['type'] = 'fd'
+    prob.root.deriv_options['form'] = form
+    prob.root.deriv_options['step_size'] = 1e-3
+    prob.root.deriv_options['step_calc'] = step_calc
+    prob.setup(check=False)
+    prob.run()
+
+    return prob
+
+
+def exact_jacobian(x, z):
+
+    n = x.size
+    dy_dx = np.zeros((n-1, n))
+    dy_dx[range(n-1), range(n-1)] = 2.0*x[:-1]
+    dy_dx[range(n-1), range(1, n)] = z
+    dy_dz = x[1:, np.newaxis]
+    df_dx = z*np.ones((1, n))
+    df_dz = np.array([[np.sum(x)]])
+
+    return np.vstack([np.hstack([dy_dx, dy_dz]), np.hstack([df_dx, df_dz])])
+
+
+class TestFDStep(unittest.TestCase):
+
+    def test_step(self):
+
+        self.assertEqual(fd_step(2.0, 1e-6, 'relative'), 2e-6)
+        self.assertEqual(fd_step(0.5, 1e-6, 'relative'), 1e-6)
+        self.assertEqual(fd_step(-2.0, 1e-6, 'relative'), 1e-6)
+        self.assertEqual(fd_step(0.0, 1e-6, 'relative'), 1e-6)
+        self.assertEqual(fd_step(2.0, 1e-6, 'absolute'), 1e-6)
+
+
+
+class TestColorColumns(unittest.TestCase):
+
+    def setUp(self):
+
+        rng = np.random.RandomState(0)
+        self.J = np.zeros((12, 10))
+        for i in range(10):
+            self.J[i:i+2, i] = rng.uniform(1.0, 2.0, 2)  # banded
+        self.J[rng.randint(0, 12, 6), rng.randint(0, 10, 6)] = 3.0  # and scattered entries
+        self.pattern = self.J != 0.0
+
+    def test_orthogonal(self):
+
+        colors = color_columns(self.pattern)
+
+        self.assertEqual(sorted(np.concatenate(colors)), list(range(10)))
+        self.assertTrue(len(colors) < 10)
+        for color in colors:
+            self.assertTrue(np.all(self.pattern[:, color].sum(axis=1) <= 1))
+
+
+    def test_round_trip(self):
+
+        # one compressed column per color, the sum of its columns
+        J = np.zeros_like(self.J)
+        for color in color_columns(self.pattern):
+            compressed = self.J[:, color].sum(axis=1)
+            for col in color:
+                rows = self.pattern[:, col]
+                J[rows, col] = compressed[rows]
+
+        np.testing.assert_equal(J, self.J)
+
+
+    def test_dense_row(self):
+
+        pattern = np.eye(4, dtype=bool)
+        self.assertEqual(len(color_columns(pattern)), 1)
+
+        pattern[0] = True
+        self.assertEqual(len(color_columns(pattern)), 4)
+        self.assertEqual(color_columns(np.zeros((3, 0), dtype=bool)), [])
+
+
+
+class TestEvaluate(unittest.TestCase):
+
+    def test_perturbations(self):
+
+        prob = create_problem()
+        x = OrderedDict([('x', np.arange(1.0, 7.0)), ('z', 2.0)])
+
+        base = _evaluate(prob, x, [], ['y', 'f'])
+        shifted = _evaluate(prob, x, [('x', 3, 0.5), ('z', 0, 1.0)], ['y', 'f'])
+
+        np.testing.assert_allclose(base[-1], 42.0)
+        np.testing.assert_allclose(shifted[-1], 21.5*3.0)
+        np.testing.assert_allclose(shifted[2], 3.0**2 + 4.5*3.0)
+        np.testing.assert_equal(x['x'], np.arange(1.0, 7.0))  # x itself is not modified
+
+
+
+class TestFiniteDifferenceJacobian(unittest.TestCase):
+
+    def setUp(self):
+        self.x = OrderedDict([('x', np.linspace(0.5, 2.0, 6)), ('z', 1.5)])
+        self.J = exact_jacobian(self.x['x'], self.x['z'])
+
+    def test_forms(self):
+
+        for form in ['central', 'forward']:
+            fd = FiniteDifferenceJacobian(create_problem, form=form, step_size=1e-7, processes=0)
+            J = fd.jacobian(self.x, ['x', 'z'], ['y', 'f'])
+
+            np.testing.assert_allclose(J, self.J, rtol=1e-5, atol=1e-6)
+            self.assertEqual(fd.evaluations, 14 if form == 'central' else 8)
+
+
+    def test_openmdao(self):
+
+        # same steps and formulas as OpenMDAO's own finite differences
+        for form in ['central', 'forward']:
+            J = {}
+            for step_calc in ['relative', 'absolute']:
+                prob = create_cubic(form, step_calc)
+                expected = prob.calc_gradient(['x'], ['y'], return_format='array')
+
+                fd = FiniteDifferenceJacobian(create_cubic, step_size=1e-3, form=form, step_calc=step_calc,
+                                              processes=0)
+                J[step_calc] = fd.jacobian(OrderedDict([('x', prob['x'])]), ['x'], ['y'])
+
+                np.testing.assert_allclose(J[step_calc], expected, rtol=1e-9, atol=1e-12)
+
+            # the step sizes differ where x > 1, enough to tell the options apart
+            self.assertTrue(np.all(np.abs(J['relative'] - J['absolute'])[2:, 2:].diagonal() > 1e-5))
+
+
+    def test_coloring(self):
+
+        fd = FiniteDifferenceJacobian(create_problem, processes=0, coloring=True)
+        J = fd.jacobian(self.x, ['x', 'z'], ['y'])
+        evaluations = fd.evaluations
+        J = fd.jacobian(self.x, ['x', 'z'], ['y'])
+
+        np.testing.assert_allclose(J, self.J[:-1], rtol=1e-5, atol=1e-6)
+        self.assertEqual(len(fd.colors[(('x', 'z'), ('y',))]), 3)
+        self.assertEqual(fd.evaluations - evaluations, 6)
+
+
+    def test_redetect(self):
+
+        # at z = 0 every dy[i]/dx[i+1] vanishes
+        x0 = OrderedDict([('x', self.x['x']), ('z', 0.0)])
+
+        fd = FiniteDifferenceJacobian(create_problem, processes=0, coloring=True, sparsity_samples=0,
+                                      redetect_interval=2)
+        fd.jacobian(x0, ['x', 'z'], ['y'])
+        stale = fd.jacobian(self.x, ['x', 'z'], ['y'])
+        J = fd.jacobian(self.x, ['x', 'z'], ['y'])
+
+        self.assertFalse(np.allclose(stale, self.J[:-1], rtol=1e-5, atol=1e-6))
+        np.testing.assert_allclose(J, self.J[:-1], rtol=1e-5, atol=1e-6)
+
+        # scattered points catch it at once
+        fd = FiniteDifferenceJacobian(create_problem, processes=0, coloring=True)
+        fd.jacobian(x0, ['x', 'z'], ['y'])
+        np.testing.assert_allclose(fd.jacobian(self.x, ['x', 'z'], ['y']), self.J[:-1], rtol=1e-5, atol=1e-6)
+
+
+    def test_pool(self):
+
+        serial = FiniteDifferenceJacobian(create_problem, processes=0)
+        pool = FiniteDifferenceJacobian(create_problem, processes=2)
+        try:
+            np.testing.assert_equal(pool.jacobian(self.x, ['x', 'z'], ['y', 'f']),
+                                    serial.jacobian(self.x, ['x', 'z'], ['y', 'f']))
+        finally:
+            pool.close()
+
+
+
+class TestFDScipyOptimizer(unittest.TestCase):
+
+    def test_dense_rows(self):
+
+        x = OrderedDict([('x', np.linspace(0.5, 2.0, 6)), ('z', 1.5)])
+        prob = create_problem()
+        prob['x'] = x['x']
+        prob['z'] = x['z']
+        prob.run()
+
+        driver = FDScipyOptimizer()
+        driver.root = prob.root
+        driver._desvars = OrderedDict([('x', {}), ('z', {})])
+        driver.fd_engine = FiniteDifferenceJacobian(create_problem, processes=0, coloring=True)
+
+        J = driver.calc_gradient(['x', 'z'], ['y', 'f'])
+        evaluations = driver.fd_engine.evaluations
+        J = driver.calc_gradient(['x', 'z'], ['y', 'f'])
+
+        # f depends on every column and is differenced on its own, y is colored
+        np.testing.assert_allclose(J, exact_jacobian(x['x'], x['z']), rtol=1e-5, atol=1e-6)
+        self.assertEqual(len(driver.fd_engine.colors[(('x', 'z'), ('y',))]), 3)
+        self.assertEqual(driver.fd_engine.evaluations - evaluations, 2*3 + 2*7)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_precomp_cache.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+import wisdem
+from rotorse.precomp import Orthotropic2DMaterial
+from wisdem.reference_turbines import precomp_cache
+from wisdem.reference_turbines.precomp_cache import load_precomp_blade, default_cache_file, CACHE_VERSION
+
+
+BLADE = os.path.join(wisdem.__path__[0], 'reference_turbines', 'nrel5mw', 'blade')
+
+# the two root stations of the NREL 5 MW blade, without shear webs
+WEBS = ([-1.0, -1.0], [-1.0, -1.0], [-1.0, -1.0])
+
+
+class CountingMaterial(Orthotropic2DMaterial):
+    parses = 0
+
+    @classmethod
+    def listFromPreCompFile(cls, fname):
+        CountingMaterial.parses += 1
+        return Orthotropic2DMaterial.listFromPreCompFile(fname)
+
+
+class TestPreCompCache(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.mkdtemp()
+        self.basepath = os.path.join(self.directory, 'blade')
+        os.mkdir(self.basepath)
+        for name in ['materials.inp', 'layup_1.inp', 'layup_2.inp', 'shape_1.inp', 'shape_2.inp']:
+            shutil.copy(os.path.join(BLADE, name), self.basepath)
+        self.cache_file = os.path.join(self.directory, 'cache', 'precomp_cache.pkl')
+
+        self.addCleanup(setattr, precomp_cache, 'Orthotropic2DMaterial', Orthotropic2DMaterial)
+        precomp_cache.Orthotropic2DMaterial = CountingMaterial
+        CountingMaterial.parses = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def load(self):
+        return load_precomp_blade(self.basepath, *WEBS, cache_file=self.cache_file)
+
+
+    def test_hit(self):
+
+        materials, upper, lower, webs, profile = self.load()
+        self.assertTrue(os.path.exists(self.cache_file))
+
+        cached = self.load()
+        self.assertEqual(CountingMaterial.parses, 1)
+        self.assertEqual([len(data) for data in cached], [len(materials), 2, 2, 2, 2])
+
+
+    def test_edit(self):
+
+        self.load()
+        with open(os.path.join(self.basepath, 'layup_2.inp'), 'a') as f:
+            f.write('\n')
+
+        self.load()
+        self.assertEqual(CountingMaterial.parses, 2)
+
+        self.load()
+        self.assertEqual(CountingMaterial.parses, 2)
+
+
+    def test_corrupt(self):
+
+        self.load()
+        with open(self.cache_file, 'wb') as f:
+            f.write(b'not a pickle')
+
+        self.load()
+        self.assertEqual(CountingMaterial.parses, 2)
+
+        self.load()  # rewritten
+        self.assertEqual(CountingMaterial.parses, 2)
+
+
+    def test_old_version(self):
+
+        for name, value in [('version', CACHE_VERSION - 1), ('rotorse', 'another rotorse')]:
+            self.load()
+            with open(self.cache_file, 'rb') as f:
+                record = pickle.load(f)
+            record[name] = value
+            with open(self.cache_file, 'wb') as f:
+                pickle.dump(record, f)
+
+            parses = CountingMaterial.parses
+            self.load()
+            self.assertEqual(CountingMaterial.parses, parses + 1)
+
+
+    def test_default_location(self):
+
+        cache_dir = os.environ.get('WISDEM_CACHE_DIR')
+        os.environ['WISDEM_CACHE_DIR'] = os.path.join(self.directory, 'user_cache')
+        try:
+            cache_file = default_cache_file(self.basepath)
+        finally:
+            if cache_dir is None:
+                del os.environ['WISDEM_CACHE_DIR']
+            else:
+                os.environ['WISDEM_CACHE_DIR'] = cache_dir
+
+        self.assertEqual(os.path.dirname(cache_file), os.path.join(self.directory, 'user_cache'))
+        self.assertNotEqual(default_cache_file(self.basepath), default_cache_file(BLADE))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_profiling.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import unittest
+from openmdao.api import Problem, Group, Component, IndepVarComp
+from wisdem.utilities.profiling import ComponentProfiler
+
+
+class Square(Component):
+
+    def __init__(self):
+        super(Square, self).__init__()
+        self.add_param('x', val=0.0)
+        self.add_output('y', val=0.0)
+        self.runs = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.runs += 1
+        unknowns['y'] = params['x']**2
+
+
+class Double(Component):
+
+    def __init__(self):
+        super(Double, self).__init__()
+        self.add_param('y', val=0.0)
+        self.add_output('z', val=0.0)
+        self.runs = 0
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        self.runs += 1
+        unknowns['z'] = 2.0*params['y']
+
+
+def create_problem():
+
+    prob = Problem(Group())
+    prob.root.add('px', IndepVarComp('x', 3.0), promotes=['*'])
+    prob.root.add('square', Square(), promotes=['*'])
+    prob.root.add('double', Double(), promotes=['*'])
+    prob.root.deriv_options['type'] = 'fd'
+    prob.setup(check=False)
+
+    return prob
+
+
+class TestComponentProfiler(unittest.TestCase):
+
+    def test_counts(self):
+
+        prob = create_problem()
+        square, double = prob.root.square, prob.root.double
+
+        with ComponentProfiler(prob.root) as profiler:
+            prob.run()
+            prob.run()
+            prob.calc_gradient(['x'], ['z'], mode='fwd')
+
+        stats = profiler.stats
+        self.assertEqual(stats['square']['calls'], 2)
+        self.assertEqual(stats['double']['calls'], 2)
+
+        # every run made by fd_jacobian is counted as an fd call
+        self.assertTrue(stats['square']['fd_calls'] > 0)
+        self.assertEqual(stats['square']['fd_calls'], square.runs - 2)
+        self.assertEqual(stats['double']['fd_calls'], double.runs - 2)
+
+        summary = profiler.summary()
+        self.assertEqual(set(summary['components'].keys()), set(['px', 'square', 'double']))
+        self.assertTrue(summary['wall_time'] > 0.0)
+
+        # not counted once stopped
+        prob.run()
+        self.assertEqual(stats['square']['calls'], 2)
+
+
+    def test_stop_restores(self):
+
+        prob = create_problem()
+        root, square = prob.root, prob.root.square
+        before = (square.solve_nonlinear, square.linearize, root.fd_jacobian)
+
+        profiler = ComponentProfiler(root).start()
+        self.assertTrue('solve_nonlinear' in square.__dict__)
+        profiler.stop()
+
+        for obj in [square, root]:
+            for name in ['solve_nonlinear', 'linearize', 'fd_jacobian']:
+                self.assertFalse(name in obj.__dict__)
+        self.assertEqual((square.solve_nonlinear, square.linearize, root.fd_jacobian), before)
+
+        # an instance attribute set before profiling is put back as it was
+        def solve_nonlinear(params, unknowns, resids):
+            unknowns['y'] = -1.0
+        square.solve_nonlinear = solve_nonlinear
+        ComponentProfiler(root).start().stop()
+        self.assertTrue(square.solve_nonlinear is solve_nonlinear)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_recorders.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from wisdem.utilities.recorders import ColumnarWriter, ColumnarReader
+
+
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, n):
+
+        writer = ColumnarWriter(self.directory)
+        for i in range(n):
+            writer.append({'unknowns:mass': 100.0 + i,
+                           'params:z': np.arange(3.0) + i,
+                           'params:n': np.array([[i, 2*i], [3*i, 4*i]]),
+                           'unknowns:name': 'tower'},  # not numeric, skipped
+                          coord='rank0:SLSQP|%d' % i, timestamp=10.0 + i)
+        writer.close()
+
+    def test_round_trip(self):
+
+        self.write(4)
+        reader = ColumnarReader(self.directory)
+
+        self.assertEqual(len(reader), 4)
+        self.assertEqual(reader.variables, ['params:n', 'params:z', 'unknowns:mass'])
+        self.assertEqual(reader.coords, ['rank0:SLSQP|%d' % i for i in range(4)])
+        np.testing.assert_equal(reader.timestamps, [10.0, 11.0, 12.0, 13.0])
+
+        np.testing.assert_equal(reader.history('unknowns:mass'), [100.0, 101.0, 102.0, 103.0])
+        np.testing.assert_equal(reader.history('params:z')[2], [2.0, 3.0, 4.0])
+        self.assertEqual(reader.history('params:n').shape, (4, 2, 2))
+        self.assertEqual(reader.history('params:n').dtype.kind, 'i')
+
+        record = reader.record(3)
+        np.testing.assert_equal(record['params:n'], [[3, 6], [9, 12]])
+
+
+    def test_overwrite(self):
+
+        self.write(2)
+        writer = ColumnarWriter(self.directory)
+        writer.append({'x': 1.0})
+        writer.close()
+
+        # a new writer replaces the old record
+        reader = ColumnarReader(self.directory)
+        self.assertEqual(reader.variables, ['x'])
+        self.assertEqual(len(reader), 1)
+
+
+    def test_schema(self):
+
+        writer = ColumnarWriter(self.directory)
+        writer.append({'x': np.zeros(3), 'y': 1.0})
+        self.assertRaises(ValueError, writer.append, {'x': np.zeros(4), 'y': 1.0})
+        self.assertRaises(ValueError, writer.append, {'x': np.zeros(3)})
+        writer.close()
+
+        # only complete records count
+        self.assertEqual(len(ColumnarReader(self.directory)), 1)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_result_cache.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import warnings
+import subprocess
+from collections import OrderedDict
+import numpy as np
+from openmdao.main.api import Assembly, Component
+from openmdao.main.datatypes.api import Float
+from wisdem.utilities.result_cache import hash_inputs, ResultCache, CachedExecuteMixin
+
+
+class Airfoil(object):
+
+    def __init__(self, cl):
+        self.cl = cl
+
+
+# evaluated in this process and in fresh interpreters with other string hash seeds
+VALUES = "[{'b': 2.0, 'a': [1, 'x']}, set(['tip', 'root', 'mid']), frozenset([('r', 1.5), ('c', 2)])]"
+
+_SCRIPT = """
+from wisdem.utilities.result_cache import hash_inputs
+print(hash_inputs(%s))
+"""
+
+
+class Slotted(object):
+    __slots__ = ('cl',)
+
+
+class Square(Component):
+
+    x = Float(iotype='in')
+    y = Float(iotype='out')
+
+    def __init__(self):
+        super(Square, self).__init__()
+        self.runs = 0
+
+    def execute(self):
+        self.y = self.x**2
+        self.runs += 1
+
+
+class CachedSquare(CachedExecuteMixin, Square):
+    pass
+
+
+class UnhashableSquare(CachedSquare):
+
+    def _input_values(self):
+        return [('x', self.x), ('f', lambda x: x)]
+
+
+class Chain(Assembly):
+    """x -> first -> second -> y"""
+
+    def configure(self):
+
+        self.add('x', Float(iotype='in'))
+        self.add('y', Float(iotype='out'))
+        self.add('first', Square())
+        self.add('second', Square())
+        self.driver.workflow.add(['first', 'second'])
+
+        self.connect('x', 'first.x')
+        self.connect('first.y', 'second.x')
+        self.connect('second.y', 'y')
+
+
+class CachedChain(CachedExecuteMixin, Chain):
+    pass
+
+
+class TestHashInputs(unittest.TestCase):
+
+    def test_scalars(self):
+
+        self.assertEqual(hash_inputs(5.0), hash_inputs(np.float64(5.0)))
+        self.assertEqual(hash_inputs(5.0), hash_inputs(5))
+        self.assertEqual(hash_inputs([1.0, 'a']), hash_inputs((np.float32(1.0), 'a')))
+        self.assertNotEqual(hash_inputs(5.0), hash_inputs(5.0 + 1e-12))
+        self.assertNotEqual(hash_inputs(True), hash_inputs(1.0))
+
+
+    def test_containers(self):
+
+        self.assertEqual(hash_inputs({'a': 1.0, 'b': np.arange(3.0)}),
+                         hash_inputs(OrderedDict([('b', np.arange(3.0)), ('a', 1.0)])))
+        self.assertNotEqual(hash_inputs(np.arange(3.0)), hash_inputs(np.arange(3)))
+        self.assertNotEqual(hash_inputs(np.zeros(4)), hash_inputs(np.zeros((2, 2))))
+        self.assertNotEqual(hash_inputs([1.0, 2.0]), hash_inputs([2.0, 1.0]))
+
+
+    def test_objects(self):
+
+        self.assertEqual(hash_inputs([Airfoil(np.ones(3))]), hash_inputs([Airfoil(np.ones(3))]))
+        self.assertNotEqual(hash_inputs([Airfoil(np.ones(3))]), hash_inputs([Airfoil(np.zeros(3))]))
+
+        # shared and self-referencing objects
+        af = Airfoil(1.0)
+        af.parent = af
+        self.assertEqual(hash_inputs([af, af]), hash_inputs([af, af]))
+
+
+    def test_sets(self):
+
+        self.assertEqual(hash_inputs(set(['a', 'b', 'c'])), hash_inputs(set(['c', 'b', 'a'])))
+        self.assertEqual(hash_inputs(frozenset([1.0, 2.0])), hash_inputs(set([2, 1])))
+        self.assertNotEqual(hash_inputs(set(['a', 'b'])), hash_inputs(['a', 'b']))
+        self.assertNotEqual(hash_inputs(set(['a', 'b'])), hash_inputs(set(['a', 'c'])))
+
+
+    def test_unstable(self):
+
+        self.assertRaises(TypeError, hash_inputs, [lambda x: x])
+        self.assertRaises(TypeError, hash_inputs, {'f': len})
+        self.assertRaises(TypeError, hash_inputs, Slotted())
+
+
+    def test_processes(self):
+
+        expected = hash_inputs(eval(VALUES))
+
+        for seed in ['1', '2']:
+            env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=os.pathsep.join(sys.path))
+            output = subprocess.check_output([sys.executable, '-c', _SCRIPT % VALUES], env=env)
+            self.assertEqual(output.decode('utf-8').strip().splitlines()[-1], expected)
+
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_hit_miss(self):
+
+        cache = ResultCache()
+        self.assertTrue(cache.get('k') is None)
+        cache.put('k', [('y', 1.0)])
+
+        self.assertEqual(cache.get('k'), [('y', 1.0)])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+    def test_eviction(self):
+
+        cache = ResultCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')  # a is now the most recently used
+        cache.put('c', 3)
+
+        self.assertEqual(list(cache.memory.keys()), ['a', 'c'])
+        self.assertTrue(cache.get('b') is None)
+
+
+    def test_directory(self):
+
+        ResultCache(directory=self.directory).put('0123abcd', {'y': np.arange(3.0)})
+
+        cache = ResultCache(directory=self.directory)
+        np.testing.assert_equal(cache.get('0123abcd')['y'], np.arange(3.0))
+        self.assertEqual(cache.hits, 1)
+        self.assertTrue(cache.get('4567abcd') is None)
+
+
+
+class TestCachedExecute(unittest.TestCase):
+
+    def test_component(self):
+
+        comp = CachedSquare()
+        comp.result_cache = ResultCache()
+
+        for x in [3.0, 4.0, 3.0]:
+            comp.x = x
+            comp.run()
+            self.assertEqual(comp.y, x**2)
+
+        self.assertEqual(comp.runs, 2)
+        self.assertEqual((comp.result_cache.hits, comp.result_cache.misses), (1, 2))
+
+
+    def test_assembly(self):
+
+        chain = CachedChain()
+        chain.result_cache = ResultCache()
+
+        for x in [2.0, 3.0, 2.0]:
+            chain.x = x
+            chain.run()
+
+            # the inner components hold the values of the cached run
+            self.assertEqual(chain.y, x**4)
+            self.assertEqual(chain.first.x, x)
+            self.assertEqual(chain.second.x, x**2)
+
+        self.assertEqual(chain.first.runs, 2)
+
+
+    def test_unhashable(self):
+
+        comp = UnhashableSquare()
+        comp.result_cache = ResultCache()
+        comp.x = 3.0
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            comp.run()
+            comp.run()
+
+        self.assertEqual(comp.y, 9.0)
+        self.assertEqual(comp.runs, 2)
+        self.assertEqual(len(comp.result_cache.memory), 0)
+        self.assertTrue('runs uncached' in str(caught[0].message))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_scheduler.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import threading
+import unittest
+from openmdao.main.api import Assembly, Component
+from openmdao.main.datatypes.api import Float
+from wisdem.utilities.scheduler import ConcurrentScheduler, ConcurrentDriver
+
+
+class Scale(Component):
+
+    x = Float(iotype='in')
+    factor = Float(1.0, iotype='in')
+    y = Float(iotype='out')
+
+    def execute(self):
+        self.y = self.factor*self.x
+
+
+class Rendezvous(Scale):
+    """a Scale that waits for its partner to start before finishing"""
+
+    def __init__(self, started, partner_started):
+        super(Rendezvous, self).__init__()
+        self.started = started
+        self.partner_started = partner_started
+        self.met = False
+        self.x_seen = None
+
+    def execute(self):
+        self.x_seen = self.x
+        self.started.set()
+        self.met = self.partner_started.wait(10.0)
+        super(Rendezvous, self).execute()
+
+
+class Sum(Component):
+
+    x1 = Float(iotype='in')
+    x2 = Float(iotype='in')
+    y = Float(iotype='out')
+
+    def execute(self):
+        self.y = self.x1 + self.x2
+
+
+class Diamond(Assembly):
+    """a -> (b, c) -> d"""
+
+    def __init__(self, concurrent_workers=None, rendezvous=False):
+        self.concurrent_workers = concurrent_workers
+        self.rendezvous = rendezvous
+        super(Diamond, self).__init__()
+
+    def configure(self):
+
+        if self.concurrent_workers is not None:
+            self.add('driver', ConcurrentDriver())
+            self.driver.max_workers = self.concurrent_workers
+
+        self.add('x', Float(2.0, iotype='in'))
+        self.add('y', Float(iotype='out'))
+
+        self.add('a', Scale())
+        if self.rendezvous:
+            b_started, c_started = threading.Event(), threading.Event()
+            self.add('b', Rendezvous(b_started, c_started))
+            self.add('c', Rendezvous(c_started, b_started))
+        else:
+            self.add('b', Scale())
+            self.add('c', Scale())
+        self.add('d', Sum())
+        self.driver.workflow.add(['a', 'b', 'c', 'd'])
+
+        self.a.factor = 3.0
+        self.b.factor = 5.0
+        self.c.factor = 7.0
+
+        self.connect('x', 'a.x')
+        self.connect('a.y', 'b.x')
+        self.connect('a.y - x', 'c.x')
+        self.connect('b.y', 'd.x1')
+        self.connect('c.y', 'd.x2')
+        self.connect('d.y', 'y')
+
+
+def serial_outputs(x):
+
+    diamond = Diamond()
+    diamond.x = x
+    diamond.run()
+
+    return [diamond.a.y, diamond.b.y, diamond.c.y, diamond.y]
+
+
+class TestConcurrentScheduler(unittest.TestCase):
+
+    def test_levels(self):
+
+        scheduler = ConcurrentScheduler(Diamond())
+
+        self.assertEqual(scheduler.levels, [['a'], ['b', 'c'], ['d']])
+        self.assertEqual(scheduler.deps['c'], set(['a']))
+        self.assertEqual(scheduler.deps['d'], set(['b', 'c']))
+
+
+    def test_matches_serial(self):
+
+        for max_workers in [1, 2]:
+            diamond = Diamond()
+            diamond.x = 4.0
+            scheduler = ConcurrentScheduler(diamond, max_workers)
+            scheduler.run()
+
+            self.assertEqual([diamond.a.y, diamond.b.y, diamond.c.y, diamond.y], serial_outputs(4.0))
+            self.assertEqual(list(scheduler.timings.keys()), ['a', 'b', 'c', 'd'])
+
+            # inputs that are already connected are overwritten on the next run
+            diamond.x = 1.0
+            scheduler.run()
+            self.assertEqual(diamond.y, serial_outputs(1.0)[-1])
+
+
+    def test_driver(self):
+
+        diamond = Diamond(concurrent_workers=2)
+        diamond.x = 4.0
+        diamond.run()
+
+        self.assertEqual(diamond.y, serial_outputs(4.0)[-1])
+        self.assertEqual(diamond.driver.scheduler.levels, [['a'], ['b', 'c'], ['d']])
+
+
+    def test_concurrent(self):
+
+        # b and c each wait for the other to start, which only returns in time
+        # if they run on separate threads at once
+        diamond = Diamond(concurrent_workers=2, rendezvous=True)
+        diamond.x = 4.0
+        diamond.run()
+
+        self.assertTrue(diamond.b.met)
+        self.assertTrue(diamond.c.met)
+        self.assertEqual(diamond.b.x_seen, 12.0)
+        self.assertEqual(diamond.c.x_seen, 8.0)
+        self.assertEqual(diamond.y, serial_outputs(4.0)[-1])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
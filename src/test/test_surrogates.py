@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_surrogates.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import unittest
+import numpy as np
+from wisdem.utilities.surrogates import latin_hypercube, PolynomialSurface, RBFSurface, KrigingSurface
+
+
+def function(X):
+    x, y = X[:, 0], X[:, 1]
+    return np.column_stack([np.sin(3.0*x) + y**2, x*y])
+
+
+def samples():
+    # the corners fix the scaling, so leaving out any other sample keeps it unchanged
+    corners = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    X = np.vstack([corners, latin_hypercube(16, [0.05, 0.05], [0.95, 0.95], seed=1)])
+    return X, function(X)
+
+
+# interpolants that are refit with the same kernel
+INTERPOLANTS = [lambda: RBFSurface('cubic'), lambda: RBFSurface('thin_plate'), lambda: RBFSurface('multiquadric'),
+                lambda: RBFSurface('gaussian', epsilon=2.0), lambda: KrigingSurface(thetas=[2.0])]
+
+
+class TestSurrogates(unittest.TestCase):
+
+    def test_latin_hypercube(self):
+
+        X = latin_hypercube(10, [0.0, 5.0], [1.0, 6.0], seed=0)
+
+        for j, lower in enumerate([0.0, 5.0]):
+            strata = np.floor((X[:, j] - lower)*10).astype(int)
+            self.assertEqual(sorted(strata), list(range(10)))
+
+
+    def test_interpolation(self):
+
+        X, Y = samples()
+        for surface in [create() for create in INTERPOLANTS] + [KrigingSurface()]:
+            surface.train(X, Y)
+            np.testing.assert_allclose(surface.predict(X), Y, rtol=1e-6, atol=1e-6)
+            np.testing.assert_allclose(surface.predict(X[3]), Y[3], rtol=1e-6, atol=1e-6)
+
+
+    def test_loo_kernel(self):
+
+        X, Y = samples()
+        for create in INTERPOLANTS:
+            surface = create().train(X, Y)
+            for i in range(4, X.shape[0]):
+                keep = np.arange(X.shape[0]) != i
+                refit = create().train(X[keep], Y[keep])
+                np.testing.assert_allclose(surface.loo_residuals[i], Y[i] - refit.predict(X[i]),
+                                           rtol=1e-5, atol=1e-8)
+
+
+    def test_loo_polynomial(self):
+
+        X, Y = samples()
+        Y = Y + 0.01*np.random.RandomState(2).normal(size=Y.shape)
+        surface = PolynomialSurface(order=2).train(X, Y)
+
+        for i in range(X.shape[0]):
+            keep = np.arange(X.shape[0]) != i
+            refit = PolynomialSurface(order=2).train(X[keep], Y[keep])
+            np.testing.assert_allclose(surface.loo_residuals[i], Y[i] - refit.predict(X[i]), rtol=1e-8, atol=1e-10)
+
+        np.testing.assert_allclose(surface.rmse, np.sqrt(np.mean(surface.loo_residuals**2, axis=0)))
+
+
+    def test_duplicates(self):
+
+        X, Y = samples()
+        X = np.vstack([X, X[5]])
+        Y = np.vstack([Y, Y[5] + 1.0])
+
+        for surface in [RBFSurface(), KrigingSurface()]:
+            surface.train(X, Y)
+            np.testing.assert_allclose(surface.predict(X[5]), Y[5] + 0.5, rtol=1e-6, atol=1e-6)
+            np.testing.assert_allclose(surface.predict(X[6]), Y[6], rtol=1e-6, atol=1e-6)
+            self.assertEqual(surface.loo_residuals.shape, (X.shape[0] - 1, 2))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,7 +10,37 @@ Copyright (c) NREL. All rights reserved.
 import unittest
 import numpy as np
 from commonse.utilities import check_gradient_unit_test, check_for_missing_unit_tests
-from wisdem.turbinese.turbine import MaxTipDeflection
+from wisdem.turbinese.turbine import MaxTipDeflection, max_tip_deflection_batch
+
+
+def batch(x, m):
+    # max_tip_deflection_batch of one design given as a vector in provideJ column order
+
+    return max_tip_deflection_batch(x[0], x[1], x[2], x[3], x[4], x[5:8], x[8:8+m], x[8+m:8+2*m], x[-1])
+
+
+def fd_jacobian(x0, m):
+    # central finite differences of (max_tip_deflection, ground_clearance)
+
+    def f(x):
+        mtd, gc, _ = batch(x, m)
+        return np.array([mtd[0], gc[0]])
+
+    J_fd = np.zeros((2, len(x0)))
+    for k in range(len(x0)):
+        h = 1e-6*max(abs(x0[k]), 1.0)
+        xp = x0.copy()
+        xm = x0.copy()
+        if k == 3:  # one-sided in precone, so the upwind/downwind branch does not switch at 0
+            step = h if x0[k] >= 0 else -h
+            xp[k] += step
+            J_fd[:, k] = (f(xp) - f(x0))/step
+        else:
+            xp[k] += h
+            xm[k] -= h
+            J_fd[:, k] = (f(xp) - f(xm))/(2*h)
+
+    return J_fd
 
 
 class TestMaxTipDeflection(unittest.TestCase):
@@ -47,6 +77,48 @@ class TestMaxTipDeflection(unittest.TestCase):
         check_gradient_unit_test(self, dfl)
 
 
+    def test3(self):
+
+        # downwind, with the blade tip (at about 0.25 of the tower height) above the last tower station
+        dfl = MaxTipDeflection()
+        dfl.Rtip = 63.0
+        dfl.precurveTip = -4.0
+        dfl.presweepTip = 1.0
+        dfl.precone = -4.0
+        dfl.tilt = 6.0
+        dfl.hub_tt = np.array([6.29400379597, 0.0, 3.14700189798])
+        dfl.tower_z = np.array([0.0, 0.1, 0.2])
+        dfl.tower_d = np.array([6.0, 5.5, 5.0])
+        dfl.towerHt = 77.5632866084
+
+        x0 = np.concatenate([[dfl.Rtip, dfl.precurveTip, dfl.presweepTip, dfl.precone, dfl.tilt], dfl.hub_tt,
+                             dfl.tower_z, dfl.tower_d, [dfl.towerHt]])
+        mtd, gc, J = batch(x0, len(dfl.tower_z))
+        self.assertTrue(gc[0]/dfl.towerHt > dfl.tower_z[-1])
+        np.testing.assert_allclose(J[0], fd_jacobian(x0, len(dfl.tower_z)), rtol=1e-5, atol=1e-6)
+
+        check_gradient_unit_test(self, dfl)
+
+
+    def test_batch(self):
+
+        hub_tt = np.array([-6.29400379597, 0.0, 3.14700189798])
+        tower_z = np.array([0.0, 0.5, 1.0])
+        tower_d = np.array([6.0, 4.935, 3.87])
+        precone = np.array([2.5, -2.5, 0.0])
+        towerHt = 77.5632866084
+
+        mtd, gc, J = max_tip_deflection_batch(63.0, 5.0, 2.0, precone, 5.0, hub_tt, tower_z, tower_d, towerHt)
+
+        np.testing.assert_allclose(mtd, [1.287787850581, 0.269692462028, 4.044325328197], rtol=1e-10)
+        np.testing.assert_allclose(gc, [17.552153609896, 17.59663127873, 17.514243812862], rtol=1e-10)
+
+        # central finite differences of each design, in provideJ column order
+        m = len(tower_z)
+        for i in range(len(precone)):
+            x0 = np.concatenate([[63.0, 5.0, 2.0, precone[i], 5.0], hub_tt, tower_z, tower_d, [towerHt]])
+            np.testing.assert_allclose(J[i], fd_jacobian(x0, m), rtol=1e-5, atol=1e-6)
+
 
 
 if __name__ == '__main__':
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_turbine_se_seam.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import unittest
+from wisdem.turbinese import turbine_se_seam
+
+
+class TestConnectIO(unittest.TestCase):
+
+    def setUp(self):
+
+        self.calls = []
+        connect_io = turbine_se_seam.connect_io
+
+        def recording_connect_io(top, components):
+            result = connect_io(top, components)
+            self.calls.append((top, components, result))
+            return result
+
+        turbine_se_seam.connect_io = recording_connect_io
+        self.addCleanup(setattr, turbine_se_seam, 'connect_io', connect_io)
+
+
+    def test_seam_connections(self):
+
+        turbine = turbine_se_seam.Turbine_SE_SEAM()
+
+        self.assertEqual(len(self.calls), 1)
+        top, components, (unmatched, failed) = self.calls[0]
+        self.assertTrue(top is turbine)
+        self.assertEqual(dict(failed), {})
+
+        # every SEAM input with a top-level input of the same name is fed from it
+        top_inputs = set(turbine.list_inputs())
+        connected = set(dst.split('[')[0] for src, dst in turbine.list_connections())
+        for comp in components:
+            for name in unmatched[comp.name]:
+                self.assertFalse(name in top_inputs, comp.name + '.' + name)
+            for name in set(comp.list_inputs()) & top_inputs - set(turbine_se_seam.IGNORED_VARS):
+                self.assertTrue(comp.name + '.' + name in connected, comp.name + '.' + name)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
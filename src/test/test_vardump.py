@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+test_vardump.py
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+import numpy as np
+from wisdem.utilities.vardump import dump_variables, load_dump, diff_dumps
+
+
+class TestVarDump(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.mkdtemp()
+        self.params = OrderedDict([('tower.z', np.linspace(0.0, 87.6, 4)), ('nBlades', 3),
+                                   ('material', 'steel')])
+        self.unknowns = OrderedDict([('mass', 3.5e5), ('f1', np.array([0.3, 0.35]))])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def dump(self, name, params, unknowns, **kwargs):
+
+        filename = os.path.join(self.directory, name)
+        dump_variables(filename, [('params', params), ('unknowns', unknowns)], **kwargs)
+
+        return filename
+
+    def test_round_trip(self):
+
+        filename = self.dump('a.jsonl', self.params, self.unknowns)
+        values = load_dump(filename)
+
+        self.assertEqual(list(values.keys()), [('params', 'tower.z'), ('params', 'nBlades'),
+                                               ('params', 'material'), ('unknowns', 'mass'),
+                                               ('unknowns', 'f1')])
+        np.testing.assert_equal(values[('params', 'tower.z')], self.params['tower.z'])
+        self.assertEqual(values[('params', 'nBlades')].dtype.kind, 'i')
+        self.assertEqual(values[('params', 'material')], 'steel')
+        self.assertEqual(values[('unknowns', 'mass')].shape, ())
+
+        values = load_dump(filename, includes=['tower.*', 'mass'])
+        self.assertEqual(list(values.keys()), [('params', 'tower.z'), ('unknowns', 'mass')])
+
+
+    def test_precision(self):
+
+        filename = self.dump('a.jsonl', {}, {'x': np.array([1.23456789])}, precision=3)
+
+        np.testing.assert_equal(load_dump(filename)[('unknowns', 'x')], [1.23])
+
+
+    def test_diff(self):
+
+        params = OrderedDict(self.params)
+        params['material'] = 'aluminium'
+        params['tower.z'] = np.linspace(0.0, 90.0, 4)
+        unknowns = OrderedDict([('mass', 3.5e5*(1.0 + 1e-12)), ('f1', np.zeros(3)), ('f2', 0.4)])
+
+        first = self.dump('a.jsonl', self.params, self.unknowns)
+        second = self.dump('b.jsonl', params, unknowns)
+
+        self.assertEqual(diff_dumps(first, first), [])
+
+        differences = dict(diff_dumps(first, second))
+        self.assertEqual(sorted(differences.keys()), [('params', 'material'), ('params', 'tower.z'),
+                                                      ('unknowns', 'f1'), ('unknowns', 'f2')])
+        self.assertEqual(differences[('params', 'tower.z')], 'max abs difference 2.4')
+        self.assertEqual(differences[('unknowns', 'f1')], 'shape (2,) != (3,)')
+        self.assertEqual(differences[('unknowns', 'f2')], 'only in %s' % second)
+
+        # mass is within rtol
+        self.assertTrue(('unknowns', 'mass') in dict(diff_dumps(first, second, rtol=0.0)))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -123,7 +123,6 @@ class MonopileTower(Group):
         self.connect('max_taper_ratio', 'max_taper')
         self.connect('min_diameter_thickness_ratio', 'min_d_to_t')
         
-         # Use complex number finite differences
         self.deriv_options['type'] = 'fd'
         self.deriv_options['form'] = 'central'
         self.deriv_options['step_size'] = 1e-5
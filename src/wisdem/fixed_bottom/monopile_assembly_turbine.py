@@ -15,6 +15,10 @@ from drivese.drivese_omdao import Drive3pt, Drive4pt
 
 import numpy as np
 from wisdem.fixed_bottom.monopile_assembly import wind, nLC, nDEL, NSECTION
+from wisdem.utilities.complex_step import use_complex_step
+from wisdem.utilities.parallel_fd import FiniteDifferenceJacobian
+from wisdem.utilities.checkpoint import CheckpointScipyOptimizer
+from wisdem.utilities.recorders import ColumnarRecorder
 # Helpful for finding warnings in numpy or scipy functions
 #np.seterr(all='raise')
     
@@ -255,67 +259,13 @@ class MonopileTurbine(Group):
         # TODO: Match Rotor Drivetrain Type to DriveSE Drivetrain options
         # TODO: Match Rotor CSMDrivetrain and efficiency to DriveSE
         
-         # Use complex number finite differences
         self.deriv_options['type'] = 'fd'
         self.deriv_options['form'] = 'central'
         self.deriv_options['step_size'] = 1e-5
         self.deriv_options['step_calc'] = 'relative'
 
 
-if __name__ == '__main__':
-    optFlag = False #True
-    
-    # Number of sections to be used in the design
-    nsection = NSECTION
-
-    # Reference rotor design
-    RefBlade = NREL5MW() #DTU10MW()
-    
-    # Initialize OpenMDAO problem and FloatingSE Group
-    prob = Problem(root=MonopileTurbine(RefBlade))
-    
-    if optFlag:
-        prob.driver  = ScipyOptimizer()
-        prob.driver.options['optimizer'] = 'SLSQP'
-        prob.driver.options['tol'] = 1e-6
-        prob.driver.options['maxiter'] = 100
-        # ----------------------
-
-        # --- Objective ---
-        prob.driver.add_objective('tow.tower.mass', scaler=1e-6)
-        # ----------------------
-
-        # --- Design Variables ---
-        prob.driver.add_desvar('tower_section_height', lower=5.0, upper=80.0)
-        prob.driver.add_desvar('tower_outer_diameter', lower=3.87, upper=30.0)
-        prob.driver.add_desvar('tower_wall_thickness', lower=4e-3, upper=2e-1)
-        # ----------------------
-
-        # Recorder
-        recorder = DumpRecorder('optimization.dat')
-        recorder.options['record_params'] = True
-        recorder.options['record_metadata'] = False
-        recorder.options['record_derivs'] = False
-        prob.driver.add_recorder(recorder)
-        # ----------------------
-
-        # --- Constraints ---
-        prob.driver.add_constraint('tow.height_constraint', lower=-1e-2, upper=1.e-2)
-        prob.driver.add_constraint('tow.post.stress', upper=1.0)
-        prob.driver.add_constraint('tow.post.global_buckling', upper=1.0)
-        prob.driver.add_constraint('tow.post.shell_buckling', upper=1.0)
-        prob.driver.add_constraint('tow.weldability', upper=0.0)
-        prob.driver.add_constraint('tow.manufacturability', lower=0.0)
-        prob.driver.add_constraint('tcons.frequency1P_margin_low', upper=1.0)
-        prob.driver.add_constraint('tcons.frequency1P_margin_high', lower=1.0)
-        prob.driver.add_constraint('tcons.frequency3P_margin_low', upper=1.0)
-        prob.driver.add_constraint('tcons.frequency3P_margin_high', lower=1.0)
-        prob.driver.add_constraint('tcons.tip_deflection_ratio', upper=1.0)
-        prob.driver.add_constraint('tcons.ground_clearance', lower=20.0)
-        
-    prob.setup()
-
-
+def init_variables(prob, RefBlade, nsection=NSECTION):
 
     # Environmental parameters
     prob['water_depth']                    = 20.0
@@ -670,7 +620,7 @@ if __name__ == '__main__':
     prob['drive.shaft_angle']=5.0*np.pi / 180.0  # rad
     prob['drive.shaft_ratio']=0.10
     prob['drive.planet_numbers']=[3, 3, 1]
-    prob['drive.shrink_disc_mass']=333.3 * prob['machine_rating'] / 1e+6.0  # estimated
+    prob['drive.shrink_disc_mass']=333.3 * prob['machine_rating'] / 1e+6  # estimated
     prob['drive.carrier_mass']=8000.0  # estimated
     prob['drive.flange_length']=0.5
     prob['drive.overhang']=5.0
@@ -680,5 +630,89 @@ if __name__ == '__main__':
 
     # Tower inputs
     #prob['tower_top_diameter']=3.78  # m
+
+    return prob
+
+
+def create_monopile_problem():
+    """set-up and initialized NREL 5MW problem (also used to build the parallel FD workers)"""
+
+    RefBlade = NREL5MW()
+    prob = Problem(root=MonopileTurbine(RefBlade))
+    prob.setup()
+
+    return init_variables(prob, RefBlade)
+
+
+if __name__ == '__main__':
+    optFlag = False #True
+    
+    # Number of sections to be used in the design
+    nsection = NSECTION
+
+    # Reference rotor design
+    RefBlade = NREL5MW() #DTU10MW()
+    
+    # Initialize OpenMDAO problem and FloatingSE Group
+    prob = Problem(root=MonopileTurbine(RefBlade))
+    
+    if optFlag:
+        # evaluations are checkpointed; after a crash, rerunning resumes from the checkpoint
+        # (delete the file to start the optimization over)
+        prob.driver  = CheckpointScipyOptimizer('monopile_optimization.ckpt')
+        prob.driver.options['optimizer'] = 'SLSQP'
+        prob.driver.options['tol'] = 1e-6
+        prob.driver.options['maxiter'] = 100
+        # ----------------------
+
+        # --- Objective ---
+        prob.driver.add_objective('tow.tower.mass', scaler=1e-6)
+        # ----------------------
+
+        # --- Design Variables ---
+        prob.driver.add_desvar('tower_section_height', lower=5.0, upper=80.0)
+        prob.driver.add_desvar('tower_outer_diameter', lower=3.87, upper=30.0)
+        prob.driver.add_desvar('tower_wall_thickness', lower=4e-3, upper=2e-1)
+        # ----------------------
+
+        # Recorder
+        recorder = ColumnarRecorder('optimization_record')
+        recorder.options['record_params'] = True
+        recorder.options['record_metadata'] = False
+        recorder.options['record_derivs'] = False
+        prob.driver.add_recorder(recorder)
+        # ----------------------
+
+        # --- Constraints ---
+        prob.driver.add_constraint('tow.height_constraint', lower=-1e-2, upper=1.e-2)
+        prob.driver.add_constraint('tow.post.stress', upper=1.0)
+        prob.driver.add_constraint('tow.post.global_buckling', upper=1.0)
+        prob.driver.add_constraint('tow.post.shell_buckling', upper=1.0)
+        prob.driver.add_constraint('tow.weldability', upper=0.0)
+        prob.driver.add_constraint('tow.manufacturability', lower=0.0)
+        prob.driver.add_constraint('tcons.frequency1P_margin_low', upper=1.0)
+        prob.driver.add_constraint('tcons.frequency1P_margin_high', lower=1.0)
+        prob.driver.add_constraint('tcons.frequency3P_margin_low', upper=1.0)
+        prob.driver.add_constraint('tcons.frequency3P_margin_high', lower=1.0)
+        prob.driver.add_constraint('tcons.tip_deflection_ratio', upper=1.0)
+        prob.driver.add_constraint('tcons.ground_clearance', lower=20.0)
+        # ----------------------
+
+        # the components choose their own derivatives (use_complex_step below)
+        prob.root.deriv_options['type'] = 'user'
+        
+    prob.setup()
+    prob = init_variables(prob, RefBlade, nsection)
+
     #print(prob.root.unknowns.dump())
+    if optFlag:
+        # Colored finite differences of the whole turbine for the constraints, with the
+        # tower design variables that touch disjoint outputs perturbed together; the
+        # objective and the other outputs depending on every design variable use the
+        # component derivatives (complex step where the components support it)
+        prob.driver.fd_engine = FiniteDifferenceJacobian(create_monopile_problem, coloring=True)
+        prob.driver.dense_from_model = True
+        use_complex_step(prob.root)
     prob.run()
+    if optFlag:
+        prob.driver.fd_engine.close()
@@ -219,7 +219,6 @@ class FloatingTurbine(Group):
         self.connect('AEP', 'net_aep')
         self.connect('totInstTime', 'construction_time')
         
-         # Use complex number finite differences
         typeStr = 'fd'
         formStr = 'central'
         stepVal = 1e-5
@@ -7,6 +7,11 @@ from openmdao.api import IndepVarComp, ScipyOptimizer, DumpRecorder
 from fusedwind.fused_openmdao import FUSED_Group, FUSED_print,  FUSED_Problem, FUSED_setup, FUSED_run
 
 from lcoeassembly import example_task37_lcoe
+from wisdem.utilities.parallel_fd import FiniteDifferenceJacobian
+from wisdem.utilities.checkpoint import CheckpointScipyOptimizer
+from wisdem.utilities.complex_step import use_complex_step
+from wisdem.utilities.recorders import ColumnarRecorder
+from wisdem.utilities.vardump import dump_variables
 
 # global tower variables
 nPoints = 3
@@ -204,7 +209,7 @@ def init_variables(prob):
     # # --- input initialization complete ---
     return prob
 
-if __name__ == "__main__":
+def create_lcoe_group():
 
     # Task 37 Drivetrain variables
     # geared 3-stage Gearbox with induction generator machine
@@ -223,6 +228,21 @@ if __name__ == "__main__":
 
     example_task37_lcoe(lcoegroup, mb1Type, mb2Type, IEC_Class, gear_configuration, shaft_factor, drivetrain_design, uptower_transformer, yaw_motors_number, crane, blade_number)
 
+    return lcoegroup
+
+def create_lcoe_problem():
+    """set-up and initialized analysis problem (also used to build the parallel FD workers)"""
+
+    prob=FUSED_Problem(create_lcoe_group())
+    FUSED_setup(prob)
+    prob = init_variables(prob)
+
+    return prob
+
+if __name__ == "__main__":
+
+    lcoegroup = create_lcoe_group()
+
     prob=FUSED_Problem(lcoegroup)
     FUSED_setup(prob)
     prob = init_variables(prob)
@@ -232,22 +252,21 @@ if __name__ == "__main__":
     #print('----- NREL 5 MW Turbine - 4 Point Suspension -----')
     #FUSED_print(lcoegroup)
 
-    f = open('output.txt','w')
-    f.write('Inputs\n')
-    for io in lcoegroup.params:
-        f.write(io + ' ' + str(lcoegroup.params[io])+'\n') 
-    f.write('\n')
-    f.write('Outputs\n')
-    for io in lcoegroup.unknowns:
-        f.write(io + ' ' + str(lcoegroup.unknowns[io])+'\n')        
-    
-    f.close()
+    # one JSON line per input and output, compare runs with wisdem.utilities.vardump.diff_dumps
+    dump_variables('output.jsonl', [('params', lcoegroup.params), ('unknowns', lcoegroup.unknowns)])
 
 
     optimize = True
+    # 'fd': central FD of the whole group
+    # 'parallel_fd': the same FD with the evaluations on a process pool
+    # 'cs': complex step where the components support it, central FD elsewhere (opt-in)
+    gradients = 'fd'
+    parallel_fd = gradients == 'parallel_fd'
     if optimize:
         # --- Setup Optimizer ---
-        prob.driver  = ScipyOptimizer()
+        # evaluations are checkpointed; after a crash, rerunning resumes from the checkpoint
+        # (delete the file to start the optimization over)
+        prob.driver  = CheckpointScipyOptimizer('tower_optimization.ckpt')
         prob.driver.options['optimizer'] = 'SLSQP' #'COBYLA'
         prob.driver.options['tol'] = 1e-6
         prob.driver.options['maxiter'] = 100
@@ -264,7 +283,7 @@ if __name__ == "__main__":
         # ----------------------
         
         # Recorder
-        #recorder = DumpRecorder('optimization.dat')
+        #recorder = ColumnarRecorder('optimization_record')
         #recorder.options['record_params'] = True
         #recorder.options['record_metadata'] = False
         #recorder.options['record_derivs'] = False
@@ -284,15 +303,22 @@ if __name__ == "__main__":
         # ----------------------
 
         # Derivatives
-        prob.root.deriv_options['type'] = 'fd'
+        if gradients != 'cs':  # with complex step the components choose, see use_complex_step
+            prob.root.deriv_options['type'] = 'fd'
         prob.root.deriv_options['form'] = 'central'
         prob.root.deriv_options['step_calc'] = 'relative'
         prob.root.deriv_options['step_size'] = 1e-5
+        if parallel_fd:
+            prob.driver.fd_engine = FiniteDifferenceJacobian(create_lcoe_problem, step_size=1e-5, form='central', step_calc='relative')
         
         # --- run opt ---
         FUSED_setup(prob)
         prob = init_variables(prob)
+        if gradients == 'cs':
+            use_complex_step(prob.root)
         FUSED_run(prob)
+        if parallel_fd:
+            prob.driver.fd_engine.close()
         # ---------------
         print("Optimization results")
         print(prob.driver.get_constraints())
@@ -325,13 +351,4 @@ if __name__ == "__main__":
         print('----- NREL 5 MW Turbine - 4 Point Suspension -----')
         FUSED_print(lcoegroup)
     
-        f = open('output.txt','w')
-        f.write('Inputs\n')
-        for io in lcoegroup.params:
-            f.write(io + ' ' + str(lcoegroup.params[io])+'\n') 
-        f.write('\n')
-        f.write('Outputs\n')
-        for io in lcoegroup.unknowns:
-            f.write(io + ' ' + str(lcoegroup.unknowns[io])+'\n')        
-        
-        f.close()
+        dump_variables('output_optimized.jsonl', [('params', lcoegroup.params), ('unknowns', lcoegroup.unknowns)])
@@ -21,8 +21,6 @@ from turbine_costsse.turbine_costsse_2015 import Turbine_CostsSE_2015
 from turbine_costsse.nrel_csm_tcc_2015 import nrel_csm_tcc_2015
 from plant_costsse.nrel_csm_bos.nrel_csm_bos import bos_csm_assembly
 from plant_costsse.nrel_csm_opex.nrel_csm_opex import opex_csm_assembly
-from plant_costsse.nrel_land_bosse.nrel_land_bosse import NREL_Land_BOSSE
-from plant_costsse.ecn_offshore_opex.ecn_offshore_opex  import opex_ecn_assembly
 from plant_financese.nrel_csm_fin.nrel_csm_fin import fin_csm_assembly
 from plant_energyse.nrel_csm_aep.nrel_csm_aep import aep_csm_assembly
 
@@ -327,12 +325,14 @@ class lcoe_se_assembly(Assembly):
         # putting replace statements here for now; TODO - openmdao bug
         # replace BOS with either CSM or landbos
         if self.with_landbos:
+            from plant_costsse.nrel_land_bosse.nrel_land_bosse import NREL_Land_BOSSE
             self.replace('bos_a', NREL_Land_BOSSE())
         else:
             self.replace('bos_a', bos_csm_assembly())
         #self.replace('tcc_a', Turbine_CostsSE_2015())
         if self.with_ecn_opex:  
-            self.replace('opex_a', opex_ecn_assembly(ecn_file))
+            from plant_costsse.ecn_offshore_opex.ecn_offshore_opex import opex_ecn_assembly
+            self.replace('opex_a', opex_ecn_assembly(self.ecn_file))
         else:
             self.replace('opex_a', opex_csm_assembly())
         self.replace('aep_a', aep_csm_assembly()) # TODO include AEP assembly from CSM and use to bridge rotor torque
@@ -353,7 +353,7 @@ class lcoe_se_assembly(Assembly):
         
         # replace OPEX with CSM or ECN opex and add AEP
         if self.with_ecn_opex:  
-            configure_lcoe_with_ecn_opex(self,ecn_file)     
+            configure_lcoe_with_ecn_opex(self,self.ecn_file)     
             self.connect('opex_a.availability','aep_a.availability') # connecting here due to aep / opex reversal depending on model 
         else:
             configure_lcoe_with_csm_opex(self)
@@ -364,11 +364,9 @@ class lcoe_se_assembly(Assembly):
         configure_lcoe_with_csm_fin(self)
 
 
-def create_example_se_assembly(with_landbos=False,with_ecn_opex=False, ecn_file=None,with_openwind=False,ow_file=None,ow_wkbook=None):
+def example_se_assembly(with_landbos=False,with_ecn_opex=False, ecn_file=None,with_openwind=False,ow_file=None,ow_wkbook=None):
     """
-    Inputs:
-        wind_class : str ('I', 'III', 'Offshore' - selected wind class for project)
-        sea_depth : float (sea depth if an offshore wind plant)
+    configured NREL 5 MW land-based plant with the example inputs set, ready to run
     """
 
     # === Create LCOE SE assembly ========
@@ -471,6 +469,18 @@ def create_example_se_assembly(with_landbos=False,with_ecn_opex=False, ecn_file=
         lcoe_se.fixed_charge_rate = 0.118
     # ===='''
 
+    return lcoe_se
+
+
+def create_example_se_assembly(with_landbos=False,with_ecn_opex=False, ecn_file=None,with_openwind=False,ow_file=None,ow_wkbook=None):
+    """
+    Inputs:
+        wind_class : str ('I', 'III', 'Offshore' - selected wind class for project)
+        sea_depth : float (sea depth if an offshore wind plant)
+    """
+
+    lcoe_se = example_se_assembly(with_landbos,with_ecn_opex,ecn_file,with_openwind,ow_file,ow_wkbook)
+
     # === Run default assembly and print results
     lcoe_se.run()
     # ====
@@ -20,8 +20,6 @@ from wisdem.turbinese.turbine import configure_turbine
 from turbine_costsse.turbine_costsse import Turbine_CostsSE
 from plant_costsse.nrel_csm_bos.nrel_csm_bos import bos_csm_assembly
 from plant_costsse.nrel_csm_opex.nrel_csm_opex import opex_csm_assembly
-from plant_costsse.nrel_land_bosse.nrel_land_bosse import NREL_Land_BOSSE
-from plant_costsse.ecn_offshore_opex.ecn_offshore_opex  import opex_ecn_assembly
 from plant_financese.nrel_csm_fin.nrel_csm_fin import fin_csm_assembly
 from fusedwind.plant_flow.basic_aep import aep_assembly, aep_weibull_assembly
 
@@ -270,8 +268,10 @@ class lcoe_se_assembly(Assembly):
     month = Int(12, iotype='in', desc='month of project start')
     project_lifetime = Float(20.0, iotype='in', desc = 'project lifetime for wind plant')
 
-    def __init__(self, with_new_nacelle=False, with_landbos=False, flexible_blade=False, with_3pt_drive=False, with_ecn_opex=False, ecn_file=None):
+    def __init__(self, with_new_nacelle=False, with_landbos=False, flexible_blade=False, with_3pt_drive=False, with_ecn_opex=False, ecn_file=None, rotor_cache=None, rotor_surrogate=None):
         
+        self.rotor_cache = rotor_cache  # optional ResultCache shared with other assemblies / processes
+        self.rotor_surrogate = rotor_surrogate  # optional trained RotorSurrogate used in place of RotorSE
         self.with_new_nacelle = with_new_nacelle
         self.with_landbos = with_landbos
         self.flexible_blade = flexible_blade
@@ -329,19 +329,21 @@ class lcoe_se_assembly(Assembly):
         # putting replace statements here for now; TODO - openmdao bug
         # replace BOS with either CSM or landbos
         if self.with_landbos:
+            from plant_costsse.nrel_land_bosse.nrel_land_bosse import NREL_Land_BOSSE
             self.replace('bos_a', NREL_Land_BOSSE())
         else:
             self.replace('bos_a', bos_csm_assembly())
         self.replace('tcc_a', Turbine_CostsSE())
         if self.with_ecn_opex:  
-            self.replace('opex_a', opex_ecn_assembly(ecn_file))
+            from plant_costsse.ecn_offshore_opex.ecn_offshore_opex import opex_ecn_assembly
+            self.replace('opex_a', opex_ecn_assembly(self.ecn_file))
         else:
             self.replace('opex_a', opex_csm_assembly())
         self.replace('aep_a', aep_weibull_assembly())
         self.replace('fin_a', fin_csm_assembly())
     
         # add TurbineSE assembly
-        configure_turbine(self, self.with_new_nacelle, self.flexible_blade, self.with_3pt_drive)
+        configure_turbine(self, self.with_new_nacelle, self.flexible_blade, self.with_3pt_drive, rotor_cache=self.rotor_cache, rotor_surrogate=self.rotor_surrogate)
     
         # replace TCC with turbine_costs
         configure_lcoe_with_turb_costs(self)
@@ -357,7 +359,7 @@ class lcoe_se_assembly(Assembly):
         
         # replace OPEX with CSM or ECN opex and add AEP
         if self.with_ecn_opex:  
-            configure_lcoe_with_ecn_opex(self,ecn_file)     
+            configure_lcoe_with_ecn_opex(self,self.ecn_file)     
             self.connect('opex_a.availability','aep_a.availability') # connecting here due to aep / opex reversal depending on model 
         else:
             configure_lcoe_with_csm_opex(self)
@@ -368,15 +370,31 @@ class lcoe_se_assembly(Assembly):
         configure_lcoe_with_csm_fin(self)
 
 
-def create_example_se_assembly(wind_class='I',sea_depth=0.0,with_new_nacelle=False,with_landbos=False,flexible_blade=False,with_3pt_drive=False, with_ecn_opex=False, ecn_file=None,with_openwind=False,ow_file=None,ow_wkbook=None):
+def example_se_assembly(wind_class='I',sea_depth=0.0,with_new_nacelle=False,with_landbos=False,flexible_blade=False,with_3pt_drive=False, with_ecn_opex=False, ecn_file=None,with_openwind=False,ow_file=None,ow_wkbook=None,rotor_cache=None,rotor_surrogate=None):
     """
+    configured NREL 5 MW plant with the example inputs set, ready to run
+
     Inputs:
         wind_class : str ('I', 'III', 'Offshore' - selected wind class for project)
         sea_depth : float (sea depth if an offshore wind plant)
     """
 
     # === Create LCOE SE assembly ========
-    lcoe_se = lcoe_se_assembly(with_new_nacelle,with_landbos,flexible_blade,with_3pt_drive,with_ecn_opex,ecn_file)
+    lcoe_se = lcoe_se_assembly(with_new_nacelle,with_landbos,flexible_blade,with_3pt_drive,with_ecn_opex,ecn_file,rotor_cache,rotor_surrogate)
+
+    set_example_inputs(lcoe_se,wind_class,sea_depth,with_landbos,with_ecn_opex,with_openwind)
+
+    return lcoe_se
+
+
+def set_example_inputs(lcoe_se,wind_class='I',sea_depth=0.0,with_landbos=False,with_ecn_opex=False,with_openwind=False):
+    """
+    set the NREL 5 MW turbine and example plant inputs on a configured lcoe_se_assembly
+
+    Inputs:
+        wind_class : str ('I', 'III', 'Offshore' - selected wind class for project)
+        sea_depth : float (sea depth if an offshore wind plant)
+    """
 
     # === Set assembly variables and objects ===
     lcoe_se.sea_depth = sea_depth # 0.0 for land-based turbine
@@ -460,8 +478,26 @@ def create_example_se_assembly(wind_class='I',sea_depth=0.0,with_new_nacelle=Fal
 
     # ====
 
+
+def create_example_se_assembly(wind_class='I',sea_depth=0.0,with_new_nacelle=False,with_landbos=False,flexible_blade=False,with_3pt_drive=False, with_ecn_opex=False, ecn_file=None,with_openwind=False,ow_file=None,ow_wkbook=None,profile_file=None):
+    """
+    Inputs:
+        wind_class : str ('I', 'III', 'Offshore' - selected wind class for project)
+        sea_depth : float (sea depth if an offshore wind plant)
+        profile_file : str (if given, time each component, print the report and write the JSON summary there)
+    """
+
+    lcoe_se = example_se_assembly(wind_class,sea_depth,with_new_nacelle,with_landbos,flexible_blade,with_3pt_drive,with_ecn_opex,ecn_file,with_openwind,ow_file,ow_wkbook)
+
     # === Run default assembly and print results
-    lcoe_se.run()
+    if profile_file is None:
+        lcoe_se.run()
+    else:
+        from wisdem.utilities.profiling import ComponentProfiler
+        with ComponentProfiler(lcoe_se) as profiler:
+            lcoe_se.run()
+        print profiler.report()
+        profiler.write_json(profile_file)
     # ====
 
     # === Print ===
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+lcoe_se_doe.py
+
+Design of experiments over the NREL 5 MW lcoe_se_assembly example, evaluated on a
+process pool.  Each worker configures an assembly once per distinct configuration
+(wind class and sea depth, which change the model structure) and reuses it for every
+case with that configuration, resetting the inputs to their configured values in
+between; results are streamed to a columnar record.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import itertools
+import functools
+import multiprocessing
+import traceback
+
+import numpy as np
+
+from wisdem.lcoe.lcoe_se_assembly import example_se_assembly
+from wisdem.utilities.recorders import ColumnarWriter
+from wisdem.utilities.assembly_state import AssemblyCache
+
+
+# case entries that select the configuration rather than set an input
+CONFIG_INPUTS = ('wind_class', 'sea_depth')
+
+DOE_OUTPUTS = ('coe', 'net_aep', 'turbine_cost', 'bos_costs', 'avg_annual_opex')
+
+# per-process state, set by _init_worker
+_outputs = DOE_OUTPUTS
+_assemblies = AssemblyCache(example_se_assembly)
+
+
+def _init_worker(options, outputs):
+
+    global _outputs, _assemblies
+    _outputs = outputs
+    _assemblies = AssemblyCache(functools.partial(example_se_assembly, **options))
+
+
+def evaluate_case(case):
+    """outputs of the example assembly for one case (a dict of input path -> value)
+
+    Every case starts from the configured inputs: the worker's AssemblyCache puts
+    back whatever the previous case (finished or failed) set before this one is applied.
+
+    Returns
+    -------
+    outputs : dict
+        output name -> value
+    error : str
+        traceback if the case failed, else None
+
+    """
+
+    try:
+        lcoe_se = _assemblies.get(case.get('wind_class', 'I'), case.get('sea_depth', 0.0))
+        for name, value in case.items():
+            if name not in CONFIG_INPUTS:
+                lcoe_se.set(name, value)
+        lcoe_se.run()
+        return dict((name, lcoe_se.get(name)) for name in _outputs), None
+    except Exception:
+        return {}, traceback.format_exc()
+
+
+def _evaluate_task(case):
+    return evaluate_case(case)
+
+
+def _column(value):
+    # case inputs are recorded as floats so that NaN can mark unset entries
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value  # non-numeric (e.g. wind_class), skipped by the writer
+
+
+def full_factorial(**levels):
+    """every combination of the given levels as a list of cases
+
+    e.g. full_factorial(wind_class=['I', 'III'], turbine_number=[50, 100, 150])
+    """
+
+    names = sorted(levels.keys())
+
+    return [dict(zip(names, values)) for values in itertools.product(*[levels[name] for name in names])]
+
+
+def _as_cases(table):
+    # list of dicts from a list of dicts, a dict of columns or a structured array
+
+    if hasattr(table, 'dtype') and table.dtype.names is not None:
+        return [dict((name, row[name].item()) for name in table.dtype.names) for row in table]
+
+    if isinstance(table, dict):
+        names = list(table.keys())
+        n = len(table[names[0]]) if names else 0
+        return [dict((name, table[name][i]) for name in names) for i in range(n)]
+
+    return [dict(case) for case in table]
+
+
+def run_doe(table, directory, processes=None, outputs=DOE_OUTPUTS, **options):
+    """evaluate a table of cases and stream the results to a columnar record
+
+    Parameters
+    ----------
+    table : list of dict, dict of columns or structured array
+        input path -> value for each case, e.g. turbine_number, A, k or
+        'rotor.shearExp'; wind_class and sea_depth select the configuration
+    directory : str
+        record directory, read it back with wisdem.utilities.recorders.ColumnarReader
+    processes : int
+        number of worker processes, None for one per cpu, 0 for serial
+    outputs : tuple of str
+        assembly outputs recorded for each case
+    options
+        passed on to example_se_assembly (with_new_nacelle, with_landbos, ...)
+
+    Returns
+    -------
+    failures : dict
+        case index -> traceback of the cases that raised
+
+    Notes
+    -----
+    Each record holds 'case' (index into the table), 'failed', the numeric case
+    inputs (NaN where a case leaves one unset) and the outputs (NaN for a failed case).
+    Non-numeric inputs such as wind_class are identified through 'case'.  Records are
+    written in table order as the results arrive.
+
+    """
+
+    cases = _as_cases(table)
+    names = sorted(set(itertools.chain(CONFIG_INPUTS, *cases)))
+    writer = ColumnarWriter(directory)
+    failures = {}
+
+    if processes == 0:
+        _init_worker(options, outputs)
+        results = (evaluate_case(case) for case in cases)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(processes, initializer=_init_worker, initargs=(options, outputs))
+        results = pool.imap(_evaluate_task, cases)
+
+    try:
+        for index, (case, (values, error)) in enumerate(zip(cases, results)):
+            record = dict((name, _column(case.get(name, np.nan))) for name in names)
+            record['sea_depth'] = _column(case.get('sea_depth', 0.0))
+            record['case'] = index
+            record['failed'] = error is not None
+            for name in outputs:
+                record[name] = values.get(name, np.nan)
+            if error is not None:
+                failures[index] = error
+            writer.append(record, str(index))
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return failures
+
+
+if __name__ == '__main__':
+
+    # class I and III land-based plants and a 20 m deep offshore plant, each with a
+    # range of plant sizes and Weibull parameters
+    table = full_factorial(wind_class=['I', 'III'], turbine_number=[50, 100, 150], A=[7.5, 8.9], k=[2.0])
+    table += full_factorial(wind_class=['Offshore'], sea_depth=[20.0], turbine_number=[50, 100, 150], A=[7.5, 8.9], k=[2.0])
+
+    failures = run_doe(table, 'lcoe_se_doe', with_new_nacelle=True)
+
+    for index in sorted(failures):
+        print('case %d failed:\n%s' % (index, failures[index]))
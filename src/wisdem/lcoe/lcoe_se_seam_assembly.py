@@ -20,8 +20,6 @@ from wisdem.turbinese.turbine_se_seam import configure_turbine
 from turbine_costsse.turbine_costsse import Turbine_CostsSE
 from plant_costsse.nrel_csm_bos.nrel_csm_bos import bos_csm_assembly
 from plant_costsse.nrel_csm_opex.nrel_csm_opex import opex_csm_assembly
-from plant_costsse.nrel_land_bosse.nrel_land_bosse import NREL_Land_BOSSE
-from plant_costsse.ecn_offshore_opex.ecn_offshore_opex  import opex_ecn_assembly
 from plant_financese.nrel_csm_fin.nrel_csm_fin import fin_csm_assembly
 from fusedwind.plant_flow.basic_aep import aep_assembly, aep_weibull_assembly
 
@@ -332,12 +330,14 @@ class lcoe_se_seam_assembly(Assembly):
         # putting replace statements here for now; TODO - openmdao bug
         # replace BOS with either CSM or landbos
         if self.with_landbos:
+            from plant_costsse.nrel_land_bosse.nrel_land_bosse import NREL_Land_BOSSE
             self.replace('bos_a', NREL_Land_BOSSE())
         else:
             self.replace('bos_a', bos_csm_assembly())
         self.replace('tcc_a', Turbine_CostsSE())
         if self.with_ecn_opex:
-            self.replace('opex_a', opex_ecn_assembly(ecn_file))
+            from plant_costsse.ecn_offshore_opex.ecn_offshore_opex import opex_ecn_assembly
+            self.replace('opex_a', opex_ecn_assembly(self.ecn_file))
         else:
             self.replace('opex_a', opex_csm_assembly())
         self.replace('aep_a', aep_weibull_assembly())
@@ -360,7 +360,7 @@ class lcoe_se_seam_assembly(Assembly):
 
         # replace OPEX with CSM or ECN opex and add AEP
         if self.with_ecn_opex:
-            configure_lcoe_with_ecn_opex(self,ecn_file)
+            configure_lcoe_with_ecn_opex(self,self.ecn_file)
             self.connect('opex_a.availability','aep_a.availability') # connecting here due to aep / opex reversal depending on model
         else:
             configure_lcoe_with_csm_opex(self)
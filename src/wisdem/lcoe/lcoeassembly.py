@@ -186,6 +186,125 @@ class RNAMass(Component):
 
         unknowns['rna_I_TT'] = self._unassembleI(rotor_I_TT + nac_I_TT)
 
+    def _parallel_axis(self, R):
+        # (xx, yy, zz, xy, xz, yz) entries of dot(R, R)*eye(3) - outer(R, R) and their gradient w.r.t. R
+        P = np.array([R[1]**2 + R[2]**2, R[0]**2 + R[2]**2, R[0]**2 + R[1]**2, -R[0]*R[1], -R[0]*R[2], -R[1]*R[2]])
+        dP_dR = np.array([[0.0, 2*R[1], 2*R[2]],
+                          [2*R[0], 0.0, 2*R[2]],
+                          [2*R[0], 2*R[1], 0.0],
+                          [-R[1], -R[0], 0.0],
+                          [-R[2], 0.0, -R[0]],
+                          [0.0, -R[2], -R[1]]])
+        return P, dP_dR
+
+    def linearize(self, params, unknowns, resids):
+
+        rotor_mass = params['blade_mass']*3 + params['hub_system_mass']
+        nac_mass = params['nacelle_mass']
+        rna_mass = unknowns['rna_mass']
+        hub_cm = params['hub_system_cm']
+        nac_cm = params['nacelle_cm']
+        rna_cm = unknowns['rna_cm']
+
+        J = {}
+
+        # rna mass
+        J['rna_mass', 'blade_mass'] = 3.0
+        J['rna_mass', 'hub_system_mass'] = 1.0
+        J['rna_mass', 'nacelle_mass'] = 1.0
+
+        # rna cm
+        J['rna_cm', 'blade_mass'] = np.reshape(3.0*(hub_cm - rna_cm)/rna_mass, (3, 1))
+        J['rna_cm', 'hub_system_mass'] = np.reshape((hub_cm - rna_cm)/rna_mass, (3, 1))
+        J['rna_cm', 'nacelle_mass'] = np.reshape((nac_cm - rna_cm)/rna_mass, (3, 1))
+        J['rna_cm', 'hub_system_cm'] = rotor_mass/rna_mass*np.eye(3)
+        J['rna_cm', 'nacelle_cm'] = nac_mass/rna_mass*np.eye(3)
+
+        # rna I: each diagonal inertia passes straight through, plus the transfer (parallel axis) terms
+        dI_ddiag = np.vstack([np.eye(3), np.zeros((3, 3))])
+        J['rna_I_TT', 'blades_I'] = dI_ddiag
+        J['rna_I_TT', 'hub_system_I'] = dI_ddiag
+        J['rna_I_TT', 'nacelle_I'] = dI_ddiag
+
+        P_hub, dP_hub = self._parallel_axis(hub_cm)
+        P_nac, dP_nac = self._parallel_axis(nac_cm)
+        J['rna_I_TT', 'blade_mass'] = np.reshape(3.0*P_hub, (6, 1))
+        J['rna_I_TT', 'hub_system_mass'] = np.reshape(P_hub, (6, 1))
+        J['rna_I_TT', 'nacelle_mass'] = np.reshape(P_nac, (6, 1))
+        J['rna_I_TT', 'hub_system_cm'] = rotor_mass*dP_hub
+        J['rna_I_TT', 'nacelle_cm'] = nac_mass*dP_nac
+
+        return J
+
+COE_INPUTS = ('turbine_cost', 'turbine_number', 'bos_cost', 'opex', 'fcr', 'aep')
+
+def calc_coe(turbine_cost, turbine_number, bos_cost, opex, fcr, aep):
+    """cost of energy, element-wise for numpy arrays"""
+
+    return ((turbine_cost*turbine_number + bos_cost)*fcr + opex) / aep
+
+def _scenario_fields(scenarios):
+    # varying inputs present in a structured array or dict, and the number of scenarios
+
+    if hasattr(scenarios, 'dtype') and scenarios.dtype.names is not None:
+        fields = [name for name in COE_INPUTS if name in scenarios.dtype.names]
+    else:
+        fields = [name for name in COE_INPUTS if name in scenarios]
+
+    n = len(scenarios[fields[0]]) if fields else 1
+
+    return fields, n
+
+def iter_coe(scenarios, chunk_size=1000000, **fixed):
+    """cost of energy over a large table of scenarios, one chunk at a time
+
+    Parameters
+    ----------
+    scenarios : structured array, np.memmap or dict of arrays
+        one field/key per varying LCOEcalc input (see COE_INPUTS), e.g. a table opened
+        with np.load(filename, mmap_mode='r')
+    chunk_size : int
+        number of scenarios evaluated at once (bounds the working memory)
+    fixed : float
+        values of the inputs that are the same for every scenario
+
+    Yields
+    ------
+    start : int
+        index of the first scenario in the chunk
+    coe : ndarray
+        cost of energy for scenarios[start:start+len(coe)]
+    """
+
+    fields, n = _scenario_fields(scenarios)
+
+    missing = [name for name in COE_INPUTS if name not in fields and name not in fixed]
+    if missing:
+        raise ValueError('no values given for %s' % ', '.join(missing))
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        args = dict((name, np.asarray(scenarios[name][start:stop], dtype=float)) for name in fields)
+        for name in COE_INPUTS:
+            if name not in args:
+                args[name] = fixed[name]
+        coe = np.broadcast_to(calc_coe(**args), (stop - start,))
+        yield start, coe
+
+def batch_coe(scenarios, chunk_size=1000000, out=None, **fixed):
+    """cost of energy for every scenario, written to `out` (e.g. np.lib.format.open_memmap) in chunks"""
+
+    if out is None:
+        out = np.empty(_scenario_fields(scenarios)[1])
+
+    for start, coe in iter_coe(scenarios, chunk_size, **fixed):
+        out[start:start + len(coe)] = coe
+
+    if hasattr(out, 'flush'):
+        out.flush()
+
+    return out
+
 # simple lcoe calculator
 class LCOEcalc(Component):
 
@@ -206,7 +325,22 @@ class LCOEcalc(Component):
 
     def solve_nonlinear(self, params, unknowns, resids):
 
-        unknowns['coe'] = ((params['turbine_cost']*params['turbine_number'] + params['bos_cost'])*params['fcr'] + params['opex']) / params['aep']
+        unknowns['coe'] = calc_coe(*[params[name] for name in COE_INPUTS])
+
+    def linearize(self, params, unknowns, resids):
+
+        # turbine_number is an integer and is not differentiated
+        aep = params['aep']
+        capex = params['turbine_cost']*params['turbine_number'] + params['bos_cost']
+
+        J = {}
+        J['coe', 'turbine_cost'] = params['turbine_number']*params['fcr']/aep
+        J['coe', 'bos_cost'] = params['fcr']/aep
+        J['coe', 'fcr'] = capex/aep
+        J['coe', 'opex'] = 1.0/aep
+        J['coe', 'aep'] = -unknowns['coe']/aep
+
+        return J
 
 if __name__ == "__main__":
 
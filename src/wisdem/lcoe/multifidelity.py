@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+multifidelity.py
+
+Two-stage screening of a turbine/plant design space: every design is evaluated with
+the cheap SEAM models (lcoe_se_seam_assembly), and only the best candidates (top-k, or
+the Pareto front over several objectives) are promoted to the full SE models
+(lcoe_se_assembly), within a budget of high-fidelity evaluations.  Both stages run on
+process pools.
+
+    designs = full_factorial(rotor_diameter=[110.0, 126.0, 140.0], hub_height=[80.0, 90.0, 100.0],
+                             tsr=[7.0, 7.55, 8.0])
+    result = run_multifidelity(designs, budget=5)
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import functools
+import multiprocessing
+import traceback
+from collections import OrderedDict
+
+import numpy as np
+
+from wisdem.lcoe.lcoe_se_doe import DOE_OUTPUTS, full_factorial
+from wisdem.utilities.assembly_state import AssemblyCache
+
+
+def seam_lcoe_assembly(**options):
+    """configured NREL 5 MW lcoe_se_seam_assembly example (low fidelity)"""
+
+    from wisdem.lcoe.lcoe_se_seam_assembly import create_example_se_assembly
+    return create_example_se_assembly(**options)
+
+
+def se_lcoe_assembly(**options):
+    """configured NREL 5 MW lcoe_se_assembly example (high fidelity)"""
+
+    from wisdem.lcoe.lcoe_se_assembly import example_se_assembly
+    return example_se_assembly(**options)
+
+
+class Fidelity(object):
+    """how to build, set and read one model of the design space
+
+    Parameters
+    ----------
+    factory : callable
+        returns a configured assembly with its reference inputs set; it must be
+        picklable (module-level function or functools.partial) to run on a pool
+    inputs : dict
+        design variable -> list of (input path, scale) or (input path, scale, offset);
+        the input is set to scale times the design value plus offset.  Design variables
+        not listed are set as input paths directly.
+    outputs : tuple of str
+        assembly outputs returned for each design
+
+    """
+
+    def __init__(self, factory, inputs=None, outputs=DOE_OUTPUTS):
+        self.factory = factory
+        self.inputs = inputs or {}
+        self.outputs = outputs
+
+    def apply(self, assembly, design):
+
+        for name, value in design.items():
+            for entry in self.inputs.get(name, [(name, None)]):
+                path, scale = entry[:2]
+                offset = entry[2] if len(entry) > 2 else 0.0
+                assembly.set(path, value if scale is None else scale*value + offset)
+
+    def evaluate(self, assembly, design):
+
+        self.apply(assembly, design)
+        assembly.run()
+
+        return dict((name, assembly.get(name)) for name in self.outputs)
+
+
+# hub radius of the NREL 5 MW rotor (126 m diameter, 61.5 m blades)
+NREL5MW_HUB_RADIUS = 0.5*126.0 - 61.5
+
+# NREL 5 MW design variables in terms of each model's inputs; the SE rotor is sized
+# through its blade length, D/2 less the reference hub radius
+SEAM_INPUTS = {'rotor_diameter': [('rotor_diameter', 1.0)],
+               'hub_height': [('hub_height', 1.0)],
+               'tsr': [('tsr', 1.0)],
+               'machine_rating': [('rated_power', 1.0)]}
+
+SE_INPUTS = {'rotor_diameter': [('rotor.bladeLength', 0.5, -NREL5MW_HUB_RADIUS)],
+             'hub_height': [('hub_height', 1.0)],
+             'tsr': [('rotor.control.tsr', 1.0)],
+             'machine_rating': [('machine_rating', 1.0)]}
+
+SEAM_FIDELITY = Fidelity(functools.partial(seam_lcoe_assembly, with_new_nacelle=True), SEAM_INPUTS)
+SE_FIDELITY = Fidelity(functools.partial(se_lcoe_assembly, with_new_nacelle=True), SE_INPUTS)
+
+
+# per-process state, set by _init_worker
+_fidelity = None
+_assemblies = None
+
+
+def _init_worker(fidelity):
+
+    global _fidelity, _assemblies
+    _fidelity = fidelity
+    _assemblies = AssemblyCache(fidelity.factory, maxsize=1)
+
+
+def _evaluate_task(design):
+    # outputs and traceback (None if the design ran) of one design
+
+    try:
+        return _fidelity.evaluate(_assemblies.get(), design), None
+    except Exception:
+        return {}, traceback.format_exc()
+
+
+def evaluate_designs(fidelity, designs, processes=None):
+    """evaluate a list of designs (dicts of design variable -> value)
+
+    Each process configures the assembly once and resets its inputs between designs.
+
+    Parameters
+    ----------
+    processes : int
+        number of worker processes, None for one per cpu, 0 for serial
+
+    Returns
+    -------
+    results : list of (outputs, error)
+        outputs dict ({} if the design failed) and traceback (None if it ran), in order
+    """
+
+    if processes == 0:
+        _init_worker(fidelity)
+        return [_evaluate_task(design) for design in designs]
+
+    pool = multiprocessing.Pool(processes, initializer=_init_worker, initargs=(fidelity,))
+    try:
+        return pool.map(_evaluate_task, designs)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def pareto_ranks(values):
+    """non-domination rank of each row of values (minimized), 0 for the Pareto front"""
+
+    values = np.asarray(values, dtype=float)
+    ranks = np.full(len(values), -1, dtype=int)
+    remaining = np.arange(len(values))
+
+    rank = 0
+    while remaining.size:
+        F = values[remaining]
+        # dominated[i] if some j is no worse in every objective and better in one
+        dominated = np.any(np.all(F[:, np.newaxis, :] >= F[np.newaxis, :, :], axis=2) &
+                           np.any(F[:, np.newaxis, :] > F[np.newaxis, :, :], axis=2), axis=1)
+        ranks[remaining[~dominated]] = rank
+        remaining = remaining[dominated]
+        rank += 1
+
+    return ranks
+
+
+def select_candidates(results, objectives, budget, pareto=False):
+    """indices of the designs to promote, best first
+
+    Failed designs and designs with a non-finite objective are never promoted.
+
+    Parameters
+    ----------
+    results : list of (outputs, error)
+        as returned by evaluate_designs
+    objectives : list of str
+        outputs to minimize; the designs are ordered by the first one
+    budget : int
+        number of designs promoted
+    pareto : bool
+        order by Pareto rank over all objectives first (the front, then the next front, ...)
+        instead of by the first objective alone
+    """
+
+    ok = [i for i, (outputs, error) in enumerate(results)
+          if error is None and np.all(np.isfinite([outputs[name] for name in objectives]))]
+    if not ok:
+        return []
+
+    F = np.array([[results[i][0][name] for name in objectives] for i in ok], dtype=float)
+    if pareto:
+        order = np.lexsort((F[:, 0], pareto_ranks(F)))
+    else:
+        order = np.argsort(F[:, 0], kind='mergesort')
+
+    return [ok[j] for j in order[:budget]]
+
+
+def run_multifidelity(designs, budget=10, objectives=('coe',), pareto=False, low=SEAM_FIDELITY,
+                      high=SE_FIDELITY, processes=None, high_processes=None):
+    """screen designs with the low-fidelity model and re-evaluate the best ones with the high-fidelity model
+
+    Parameters
+    ----------
+    designs : list of dict
+        design variable -> value, e.g. rotor_diameter, hub_height, tsr, machine_rating
+        (see SEAM_INPUTS / SE_INPUTS) or any input path of both assemblies
+    budget : int
+        number of high-fidelity evaluations
+    objectives : tuple of str
+        outputs minimized when selecting the candidates (in both output sets)
+    pareto : bool
+        promote by Pareto rank over all objectives instead of the first objective
+    low, high : Fidelity
+        the screening and the detailed model (default lcoe_se_seam_assembly and lcoe_se_assembly;
+        wrap Turbine_SE_SEAM / TurbineSE factories to screen turbines alone)
+    processes, high_processes : int
+        worker processes of each stage (None for one per cpu, 0 for serial); the high
+        fidelity stage uses `processes` unless given
+
+    Returns
+    -------
+    result : OrderedDict
+        'low': (outputs, error) of every design, 'selected': indices of the promoted
+        designs, best first, 'high': OrderedDict index -> (outputs, error) of the promoted
+        designs, and 'best': index of the best successful high-fidelity design by the
+        first objective (None if none ran)
+
+    """
+
+    if high_processes is None:
+        high_processes = processes
+
+    low_results = evaluate_designs(low, designs, processes)
+    selected = select_candidates(low_results, objectives, budget, pareto)
+
+    high_results = OrderedDict()
+    if selected:
+        if high_processes:
+            high_processes = min(high_processes, len(selected))
+        results = evaluate_designs(high, [designs[i] for i in selected], high_processes)
+        high_results.update(zip(selected, results))
+
+    ran = [(outputs[objectives[0]], index) for index, (outputs, error) in high_results.items() if error is None]
+
+    return OrderedDict([('low', low_results),
+                        ('selected', selected),
+                        ('high', high_results),
+                        ('best', min(ran)[1] if ran else None)])
+
+
+if __name__ == '__main__':
+
+    # NREL 5 MW variants: 27 designs screened with SEAM, the best 5 re-evaluated with SE
+    designs = full_factorial(rotor_diameter=[110.0, 126.0, 140.0], hub_height=[80.0, 90.0, 100.0],
+                             tsr=[7.0, 7.55, 8.0])
+    result = run_multifidelity(designs, budget=5, objectives=('coe', 'turbine_cost'), pareto=True)
+
+    print('%5s %-60s %10s %10s' % ('case', 'design', 'SEAM coe', 'SE coe'))
+    for index in result['selected']:
+        low_outputs, high = result['low'][index][0], result['high'][index]
+        print('%5d %-60s %10.4f %10s' % (index, designs[index], low_outputs['coe'],
+                                         '%.4f' % high[0]['coe'] if high[1] is None else 'failed'))
+    print('best design: %s' % (designs[result['best']] if result['best'] is not None else None))
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+airfoil_registry.py
+
+Loads each airfoil polar once per process and shares the resulting CCAirfoil
+between radial stations and turbine instances.  The preprocessed (alpha, Re, cl, cd)
+grids can also be kept as .npy files, so other processes skip parsing the AeroDyn
+files (each process still builds its own CCAirfoil splines from them).
+
+Sharing is scoped to the runs inside a sharing() block; CCAirfoil loads its files
+as usual everywhere else.
+
+    with airfoil_registry.sharing():
+        turbine.run()
+
+The block patches the CCAirfoil class, so it is process-global: while any block is
+open, CCAirfoil loads in every thread go through the most recently opened registry.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+from airfoilprep import Airfoil
+from ccblade import CCAirfoil
+
+
+GRID_NAMES = ('alpha', 'Re', 'cl', 'cd')
+
+
+class AirfoilRegistry(object):
+    """CCAirfoil objects keyed on the resolved path (and size/mtime) of their AeroDyn file
+
+    Parameters
+    ----------
+    grid_dir : str
+        optional directory for .npy copies of the data grids, shared between processes
+
+    """
+
+    def __init__(self, grid_dir=None):
+        self.grid_dir = grid_dir
+        self.airfoils = {}
+        self.parsed = 0  # number of AeroDyn files actually read
+        self._lock = threading.Lock()
+
+    def _key(self, path):
+
+        real = os.path.realpath(path)
+        st = os.stat(real)
+
+        return (real, st.st_size, st.st_mtime)
+
+    def _parse(self, path):
+
+        self.parsed += 1
+        grids = Airfoil.initFromAerodynFile(path).createDataGrid()
+
+        return [np.asarray(g, dtype=float) for g in grids[:len(GRID_NAMES)]]
+
+    def grids(self, path):
+        """read-only (alpha, Re, cl, cd) arrays, read from grid_dir if it is set"""
+
+        if self.grid_dir is None:
+            grids = self._parse(path)
+        else:
+            grids = self._stored_grids(path)
+
+        for g in grids:
+            g.setflags(write=False)
+
+        return grids
+
+    def _stored_grids(self, path):
+
+        key = self._key(path)
+        name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+        directory = os.path.join(self.grid_dir, name)
+
+        if not os.path.isdir(directory):
+            if not os.path.isdir(self.grid_dir):
+                try:
+                    os.makedirs(self.grid_dir)
+                except OSError:
+                    if not os.path.isdir(self.grid_dir):
+                        raise
+            tmp = tempfile.mkdtemp(dir=self.grid_dir)
+            for gname, g in zip(GRID_NAMES, self._parse(path)):
+                np.save(os.path.join(tmp, gname + '.npy'), g)
+            try:
+                os.rename(tmp, directory)
+            except OSError:  # written concurrently by another process
+                shutil.rmtree(tmp, ignore_errors=True)
+
+        return [np.load(os.path.join(directory, gname + '.npy')) for gname in GRID_NAMES]
+
+    def get(self, path):
+        """shared CCAirfoil for an AeroDyn file"""
+
+        key = self._key(path)
+
+        with self._lock:  # threads asking for the same file get one object
+            af = self.airfoils.get(key)
+            if af is None:
+                af = CCAirfoil(*self.grids(path))
+                self.airfoils[key] = af
+
+        return af
+
+    def load(self, paths):
+        """CCAirfoil for each station; repeated files map to the same object"""
+
+        return [self.get(path) for path in paths]
+
+
+# default registry of sharing()
+registry = AirfoilRegistry()
+
+# (token, registry) of the open sharing() blocks, most recent last
+_active = []
+_active_lock = threading.Lock()
+
+_original_init = CCAirfoil.__dict__['initFromAerodynFile']
+
+
+def _init_from_registry(cls, aerodynFile):
+
+    with _active_lock:
+        shared = _active[-1][1]
+
+    return shared.get(aerodynFile)
+
+
+@contextmanager
+def sharing(shared=None, grid_dir=None):
+    """route CCAirfoil.initFromAerodynFile (used by RotorSE) through a registry inside the block
+
+    The original loader is restored when the last open block exits.  Blocks may be
+    nested and may be opened from several threads, which then share the patch (see
+    the module notes).
+
+    Parameters
+    ----------
+    shared : AirfoilRegistry
+        registry to load from, defaults to the module registry
+    grid_dir : str
+        optional directory for memory-mapped grids of the registry
+
+    """
+
+    shared = registry if shared is None else shared
+    if grid_dir is not None:
+        shared.grid_dir = grid_dir
+
+    token = object()
+    with _active_lock:
+        _active.append((token, shared))
+        if len(_active) == 1:
+            CCAirfoil.initFromAerodynFile = classmethod(_init_from_registry)
+
+    try:
+        yield shared
+    finally:
+        with _active_lock:  # blocks of other threads may close in any order
+            _active[:] = [entry for entry in _active if entry[0] is not token]
+            if not _active:
+                CCAirfoil.initFromAerodynFile = _original_init
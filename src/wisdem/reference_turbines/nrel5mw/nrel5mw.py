@@ -2,12 +2,13 @@
 import numpy as np
 import os
 import wisdem
-from rotorse.precomp import Profile, Orthotropic2DMaterial, CompositeSection  # TODO: can just pass file names and do this initialization inside of rotor
+from wisdem.reference_turbines.precomp_cache import load_precomp_blade
+from wisdem.reference_turbines import airfoil_registry
 from commonse.environment import PowerWind, TowerSoil, LinearWaves
 from commonse.utilities import cosd, sind
 #from rotorse.rotoraero import RS2RPM
 
-def configure_nrel5mw_turbine(turbine,wind_class='I',sea_depth = 0.0):
+def configure_nrel5mw_turbine(turbine,wind_class='I',sea_depth = 0.0, share_airfoils=False):
     """
     Inputs:
         rotor = RotorSE()
@@ -15,6 +16,7 @@ def configure_nrel5mw_turbine(turbine,wind_class='I',sea_depth = 0.0):
         tower = TowerSE()
         wind_class : str ('I', 'III', 'Offshore' - selected wind class for project)
         sea_depth : float (sea depth if an offshore wind plant)
+        share_airfoils : bool (preload the unique airfoil polars into airfoil_registry.registry, used by runs inside airfoil_registry.sharing())
     """
     
     # === Turbine ===
@@ -79,6 +81,10 @@ def configure_nrel5mw_turbine(turbine,wind_class='I',sea_depth = 0.0):
     airfoil_types[6] = os.path.join(basepath, 'DU21_A17.dat')
     airfoil_types[7] = os.path.join(basepath, 'NACA64_A17.dat')
 
+    # parse the 8 unique polars once; stations run inside airfoil_registry.sharing() then reuse them
+    if share_airfoils:
+        airfoil_registry.registry.load(airfoil_types)
+
     # place at appropriate radial stations
     af_idx = [0, 0, 1, 2, 3, 3, 4, 5, 5, 6, 6, 7, 7, 7, 7, 7, 7]
 
@@ -117,13 +123,7 @@ def configure_nrel5mw_turbine(turbine,wind_class='I',sea_depth = 0.0):
     #basepath = os.path.join('5MW_files', '5MW_PrecompFiles')
     basepath = os.path.join(wisdem.__path__[0], 'reference_turbines','nrel5mw','blade')
 
-    materials = Orthotropic2DMaterial.listFromPreCompFile(os.path.join(basepath, 'materials.inp'))
-
     ncomp = len(turbine.rotor.initial_str_grid)
-    upper = [0]*ncomp
-    lower = [0]*ncomp
-    webs = [0]*ncomp
-    profile = [0]*ncomp
 
     turbine.rotor.leLoc = np.array([0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.498, 0.497, 0.465, 0.447, 0.43, 0.411,
         0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4,
@@ -140,18 +140,8 @@ def configure_nrel5mw_turbine(turbine,wind_class='I',sea_depth = 0.0):
          3.24931446473, 3.23421422609, 3.22701537997, 3.21972125648, 3.08979310611, 2.95152261813, 2.330753331,
          2.05553464181, 1.82577817774, 1.5860853279, 1.4621])  # (Array, m): chord distribution for reference section, thickness of structural layup scaled with reference thickness (fixed t/c for this case)
 
-    for i in range(ncomp):
-
-        webLoc = []
-        if web1[i] != -1:
-            webLoc.append(web1[i])
-        if web2[i] != -1:
-            webLoc.append(web2[i])
-        if web3[i] != -1:
-            webLoc.append(web3[i])
-
-        upper[i], lower[i], webs[i] = CompositeSection.initFromPreCompLayupFile(os.path.join(basepath, 'layup_' + str(i+1) + '.inp'), webLoc, materials)
-        profile[i] = Profile.initFromPreCompFile(os.path.join(basepath, 'shape_' + str(i+1) + '.inp'))
+    # parsed once and then read back from a binary cache (see precomp_cache.py)
+    materials, upper, lower, webs, profile = load_precomp_blade(basepath, web1, web2, web3)
 
     turbine.rotor.materials = materials  # (List): list of all Orthotropic2DMaterial objects used in defining the geometry
     turbine.rotor.upperCS = upper  # (List): list of CompositeSection objections defining the properties for upper surface
@@ -2,7 +2,7 @@
 import numpy as np
 import os
 
-from rotorse.precomp import Profile, Orthotropic2DMaterial, CompositeSection  # TODO: can just pass file names and do this initialization inside of rotor
+from wisdem.reference_turbines.precomp_cache import load_precomp_blade
 #from towerse.tower import TowerWithpBEAM
 from commonse.environment import PowerWind, TowerSoil, LinearWaves
 from jacketse.jacket import JcktGeoInputs,SoilGeoInputs,WaterInputs,WindInputs,RNAprops,TPlumpMass,Frame3DDaux,\
@@ -125,13 +125,7 @@ def configure_nrel5mw_turbine_with_jacket(turbine,wind_class='I',sea_depth = 0.0
     #basepath = os.path.join('5MW_files', '5MW_PrecompFiles')
     basepath = os.path.join('..', 'reference_turbines','nrel5mw','blade')
 
-    materials = Orthotropic2DMaterial.listFromPreCompFile(os.path.join(basepath, 'materials.inp'))
-
     ncomp = len(turbine.rotor.initial_str_grid)
-    upper = [0]*ncomp
-    lower = [0]*ncomp
-    webs = [0]*ncomp
-    profile = [0]*ncomp
 
     turbine.rotor.leLoc = np.array([0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.498, 0.497, 0.465, 0.447, 0.43, 0.411,
         0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4,
@@ -148,18 +142,8 @@ def configure_nrel5mw_turbine_with_jacket(turbine,wind_class='I',sea_depth = 0.0
          3.24931446473, 3.23421422609, 3.22701537997, 3.21972125648, 3.08979310611, 2.95152261813, 2.330753331,
          2.05553464181, 1.82577817774, 1.5860853279, 1.4621])  # (Array, m): chord distribution for reference section, thickness of structural layup scaled with reference thickness (fixed t/c for this case)
 
-    for i in range(ncomp):
-
-        webLoc = []
-        if web1[i] != -1:
-            webLoc.append(web1[i])
-        if web2[i] != -1:
-            webLoc.append(web2[i])
-        if web3[i] != -1:
-            webLoc.append(web3[i])
-
-        upper[i], lower[i], webs[i] = CompositeSection.initFromPreCompLayupFile(os.path.join(basepath, 'layup_' + str(i+1) + '.inp'), webLoc, materials)
-        profile[i] = Profile.initFromPreCompFile(os.path.join(basepath, 'shape_' + str(i+1) + '.inp'))
+    # parsed once and then read back from a binary cache (see precomp_cache.py)
+    materials, upper, lower, webs, profile = load_precomp_blade(basepath, web1, web2, web3)
 
     turbine.rotor.materials = materials  # (List): list of all Orthotropic2DMaterial objects used in defining the geometry
     turbine.rotor.upperCS = upper  # (List): list of CompositeSection objections defining the properties for upper surface
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+precomp_cache.py
+
+Loads the PreComp materials, layup and shape files of a reference blade through a
+binary cache in the user's cache directory, so repeated configurations skip parsing
+the text files.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import hashlib
+import tempfile
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import rotorse
+from rotorse.precomp import Profile, Orthotropic2DMaterial, CompositeSection
+
+
+CACHE_VERSION = 2
+CACHE_NAME = 'precomp_cache.pkl'
+
+_versions = {}
+
+
+def _source_files(basepath, ncomp):
+
+    files = [os.path.join(basepath, 'materials.inp')]
+    files += [os.path.join(basepath, 'layup_' + str(i+1) + '.inp') for i in range(ncomp)]
+    files += [os.path.join(basepath, 'shape_' + str(i+1) + '.inp') for i in range(ncomp)]
+
+    return files
+
+
+def _stamps(files):
+    return [(os.path.basename(f), os.path.getsize(f), os.path.getmtime(f)) for f in files]
+
+
+def _hashes(files):
+
+    hashes = []
+    for f in files:
+        with open(f, 'rb') as fid:
+            hashes.append(hashlib.sha1(fid.read()).hexdigest())
+
+    return hashes
+
+
+def _web_locations(web1, web2, web3):
+
+    webLoc = []
+    for i in range(len(web1)):
+        loc = []
+        if web1[i] != -1:
+            loc.append(float(web1[i]))
+        if web2[i] != -1:
+            loc.append(float(web2[i]))
+        if web3[i] != -1:
+            loc.append(float(web3[i]))
+        webLoc.append(loc)
+
+    return webLoc
+
+
+def _distribution_version(name):
+
+    try:
+        from importlib.metadata import version
+    except ImportError:  # python < 3.8
+        from pkg_resources import get_distribution
+        return get_distribution(name).version
+
+    return version(name)
+
+
+def _rotorse_version():
+    # the cached sections are rotorse objects, only valid for the rotorse that wrote them
+
+    if 'rotorse' not in _versions:
+        try:
+            version = _distribution_version('rotorse')
+        except Exception:
+            version = getattr(rotorse, '__version__', None)
+        if version is None:  # e.g. a source tree on the path, fall back to the precomp source
+            source = os.path.splitext(rotorse.precomp.__file__)[0] + '.py'
+            version = _hashes([source])[0] if os.path.exists(source) else None
+        _versions['rotorse'] = version
+
+    return _versions['rotorse']
+
+
+def cache_directory():
+    """per-user cache directory: $WISDEM_CACHE_DIR if set, else wisdem under
+    %LOCALAPPDATA% (Windows), $XDG_CACHE_HOME or ~/.cache"""
+
+    if os.environ.get('WISDEM_CACHE_DIR'):
+        return os.environ['WISDEM_CACHE_DIR']
+
+    if os.name == 'nt' and os.environ.get('LOCALAPPDATA'):
+        return os.path.join(os.environ['LOCALAPPDATA'], 'wisdem')
+
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'wisdem')
+
+
+def default_cache_file(basepath):
+    """cache file for the blade files in basepath, in cache_directory()"""
+
+    key = hashlib.sha1(os.path.abspath(basepath).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(cache_directory(), key + '_' + CACHE_NAME)
+
+
+def _write_cache(cache_file, record):
+
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(record, f, pickle.HIGHEST_PROTOCOL)
+        if os.name == 'nt' and os.path.exists(cache_file):
+            os.remove(cache_file)
+        os.rename(tmp, cache_file)
+    except (IOError, OSError):
+        pass  # the cache is only an optimization
+
+
+def _read_cache(cache_file):
+
+    try:
+        with open(cache_file, 'rb') as f:
+            record = pickle.load(f)
+    except Exception:
+        return None
+
+    if not isinstance(record, dict) or record.get('version') != CACHE_VERSION:
+        return None
+
+    if record.get('rotorse') != _rotorse_version():
+        return None
+
+    return record
+
+
+def load_precomp_blade(basepath, web1, web2, web3, cache_file=None):
+    """materials, composite sections and profiles for every structural station
+
+    Parameters
+    ----------
+    basepath : str
+        directory containing materials.inp, layup_N.inp and shape_N.inp
+    web1, web2, web3 : array_like
+        chordwise shear web locations at each station (-1 if the web is absent)
+    cache_file : str
+        location of the binary cache, see default_cache_file
+
+    Returns
+    -------
+    materials, upper, lower, webs, profile : list
+        as used for rotor.materials, upperCS, lowerCS, websCS and profile
+
+    Notes
+    -----
+    The cache is valid while the size and modification time of every source file
+    are unchanged.  If only the modification times differ (e.g. after a fresh
+    checkout) the file contents are hashed and the cache is kept when they match.
+    A cache written by another version of this module or of rotorse, or one that
+    cannot be read, is rebuilt.
+
+    """
+
+    ncomp = len(web1)
+    webLoc = _web_locations(web1, web2, web3)
+    files = _source_files(basepath, ncomp)
+    stamps = _stamps(files)
+
+    if cache_file is None:
+        cache_file = default_cache_file(basepath)
+
+    record = _read_cache(cache_file)
+
+    if record is not None and record['webLoc'] == webLoc:
+        if record['stamps'] == stamps:
+            return record['data']
+
+        if [s[:2] for s in record['stamps']] == [s[:2] for s in stamps]:
+            if record['hashes'] == _hashes(files):
+                record['stamps'] = stamps
+                _write_cache(cache_file, record)
+                return record['data']
+
+    materials = Orthotropic2DMaterial.listFromPreCompFile(files[0])
+
+    upper = [0]*ncomp
+    lower = [0]*ncomp
+    webs = [0]*ncomp
+    profile = [0]*ncomp
+
+    for i in range(ncomp):
+        upper[i], lower[i], webs[i] = CompositeSection.initFromPreCompLayupFile(files[1+i], webLoc[i], materials)
+        profile[i] = Profile.initFromPreCompFile(files[1+ncomp+i])
+
+    data = (materials, upper, lower, webs, profile)
+
+    _write_cache(cache_file, {'version': CACHE_VERSION, 'rotorse': _rotorse_version(), 'stamps': stamps,
+                              'hashes': _hashes(files), 'webLoc': webLoc, 'data': data})
+
+    return data
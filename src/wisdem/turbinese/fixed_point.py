@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+fixed_point.py
+
+Accelerated fixed-point iteration for the flexible-blade loop in configure_turbine.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+from collections import OrderedDict
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import numpy as np
+
+from openmdao.main.api import Driver
+from openmdao.main.datatypes.api import Int, Float, Enum
+from openmdao.main.hasparameters import HasParameters
+from openmdao.main.hasconstraints import HasEqConstraints
+from openmdao.main.interfaces import IHasParameters, IHasEqConstraints, ISolver, implements
+from openmdao.util.decorators import add_delegate
+from openmdao.lib.drivers.api import FixedPointIterator
+
+
+class PicardUpdate(object):
+    """plain fixed-point update x_{k+1} = g(x_k)"""
+
+    def reset(self):
+        pass
+
+    def update(self, x, g):
+        return g
+
+
+class AitkenUpdate(object):
+    """Aitken dynamic relaxation (Irons-Tuck form) of the fixed-point update
+
+    x_{k+1} = x_k + omega_k (g(x_k) - x_k)
+    """
+
+    def __init__(self, omega0=1.0, omega_max=10.0):
+        self.omega0 = omega0
+        self.omega_max = omega_max
+        self.reset()
+
+    def reset(self):
+        self.omega = self.omega0
+        self.r_prev = None
+
+    def update(self, x, g):
+
+        r = g - x
+
+        if self.r_prev is not None:
+            dr = r - self.r_prev
+            drdr = np.dot(dr, dr)
+            if drdr > 0.0:
+                self.omega = -self.omega*np.dot(self.r_prev, dr)/drdr
+                self.omega = np.clip(self.omega, -self.omega_max, self.omega_max)
+
+        self.r_prev = r
+
+        return x + self.omega*r
+
+
+class AndersonUpdate(object):
+    """Anderson mixing of the last `depth` iterates (type II, unit mixing parameter)"""
+
+    def __init__(self, depth=5):
+        self.depth = depth
+        self.reset()
+
+    def reset(self):
+        self.x_hist = []
+        self.g_hist = []
+
+    def update(self, x, g):
+
+        self.x_hist.append(x)
+        self.g_hist.append(g)
+        if len(self.x_hist) > self.depth + 1:
+            self.x_hist.pop(0)
+            self.g_hist.pop(0)
+
+        if len(self.x_hist) == 1:
+            return g
+
+        R = np.array([gi - xi for xi, gi in zip(self.x_hist, self.g_hist)])
+        G = np.array(self.g_hist)
+        dR = np.diff(R, axis=0).T
+        dG = np.diff(G, axis=0).T
+
+        # numpy's current default cutoff, given explicitly for numpy < 1.14
+        rcond = np.finfo(float).eps*max(dR.shape)
+        gamma = np.linalg.lstsq(dR, R[-1], rcond=rcond)[0]
+
+        return g - np.dot(dG, gamma)
+
+
+class WarmStartStore(object):
+    """converged fixed-point solutions keyed on the design point
+
+    The iteration is seeded from the stored design nearest to the current one
+    (euclidean distance after scaling each design variable by its largest
+    magnitude).  At most `maxsize` entries are kept, least recently used first out.
+
+    Parameters
+    ----------
+    keys : list of str
+        assembly variables that define the design point, e.g. ['rotor.chord_sub', 'rotor.precone']
+    maxsize : int
+        maximum number of stored designs
+    filename : str
+        optional pickle file; loaded if it exists and rewritten after every new entry
+
+    """
+
+    def __init__(self, keys, maxsize=100, filename=None):
+        self.keys = list(keys)
+        self.maxsize = maxsize
+        self.filename = filename
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if filename is not None and os.path.exists(filename):
+            self.load(filename)
+
+    def design_point(self, assembly):
+        """current values of the key variables as one flat array"""
+
+        return np.concatenate([np.asarray(assembly.get(key), dtype=float).ravel() for key in self.keys])
+
+    def nearest(self, design):
+        """stored solution of the closest design of the same size, or None"""
+
+        design = np.asarray(design, dtype=float).ravel()
+        candidates = [(d, x) for d, x in self.entries.values() if d.size == design.size]
+
+        if len(candidates) == 0:
+            self.misses += 1
+            return None
+
+        designs = np.array([d for d, x in candidates])
+        scale = np.maximum(np.max(np.abs(np.vstack([designs, design])), axis=0), 1e-12)
+        dist = np.sum(((designs - design)/scale)**2, axis=1)
+        i = np.argmin(dist)
+
+        self.hits += 1
+        key = self._key(candidates[i][0])
+        self.entries[key] = self.entries.pop(key)  # mark as recently used
+
+        return candidates[i][1].copy()
+
+    def add(self, design, solution):
+
+        design = np.asarray(design, dtype=float).ravel()
+        key = self._key(design)
+
+        self.entries.pop(key, None)
+        self.entries[key] = (design.copy(), np.asarray(solution, dtype=float).ravel().copy())
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+        if self.filename is not None:
+            self.save(self.filename)
+
+    def save(self, filename):
+
+        tmp = filename + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump({'keys': self.keys, 'entries': list(self.entries.values())}, f, pickle.HIGHEST_PROTOCOL)
+        if os.name == 'nt' and os.path.exists(filename):
+            os.remove(filename)
+        os.rename(tmp, filename)
+
+    def load(self, filename):
+
+        with open(filename, 'rb') as f:
+            data = pickle.load(f)
+
+        if data['keys'] != self.keys:
+            return
+
+        for design, solution in data['entries'][-self.maxsize:]:
+            self.entries[self._key(design)] = (design, solution)
+
+    def _key(self, design):
+        return design.tobytes()
+
+
+@add_delegate(HasParameters, HasEqConstraints)
+class AcceleratedFixedPointIterator(Driver):
+    """fixed-point iteration with optional Aitken or Anderson acceleration
+
+    Set up like FixedPointIterator: each equality constraint is written as
+    'parameter = target' in the same order as the parameters, e.g.
+    add_parameter('rotor.delta_bladeLength') and
+    add_constraint('rotor.delta_bladeLength = rotor.delta_bladeLength_out').
+    """
+
+    implements(IHasParameters, IHasEqConstraints, ISolver)
+
+    max_iteration = Int(25, iotype='in', desc='maximum number of workflow evaluations')
+    tolerance = Float(1.0e-3, iotype='in', desc='absolute convergence tolerance on the fixed-point residual')
+    norm_order = Enum('Infinity', ['Infinity', 'Euclidean'], iotype='in', desc='norm used to test convergence')
+    acceleration = Enum('aitken', ['none', 'aitken', 'anderson'], iotype='in', desc='fixed-point acceleration method')
+    anderson_depth = Int(5, iotype='in', desc='number of previous iterates used in Anderson mixing')
+
+    iteration_count = Int(0, iotype='out', desc='number of workflow evaluations in the last solve')
+    total_iterations = Int(0, iotype='out', desc='number of workflow evaluations over all solves')
+    residual_norm = Float(0.0, iotype='out', desc='fixed-point residual norm at the last iterate')
+
+    def __init__(self):
+        super(AcceleratedFixedPointIterator, self).__init__()
+        self.warm_start = None
+
+    def set_warm_start(self, store):
+        """seed each solve from a WarmStartStore and record converged solutions in it"""
+
+        self.warm_start = store
+
+    def _accelerator(self):
+
+        if self.acceleration == 'aitken':
+            return AitkenUpdate()
+        elif self.acceleration == 'anderson':
+            return AndersonUpdate(self.anderson_depth)
+        else:
+            return PicardUpdate()
+
+    def _norm(self, r):
+
+        if self.norm_order == 'Infinity':
+            return np.max(np.abs(r))
+        else:
+            return np.linalg.norm(r)
+
+    def _eval_targets(self):
+        """values the parameters should take, i.e. the right-hand sides of the constraints"""
+
+        targets = [np.asarray(con.rhs.evaluate(self.parent), dtype=float).ravel()
+                   for con in self.get_eq_constraints().values()]
+
+        return np.concatenate(targets)
+
+    def execute(self):
+
+        accelerator = self._accelerator()
+        accelerator.reset()
+
+        x = np.asarray(self.eval_parameters(self.parent), dtype=float).ravel()
+
+        if self.warm_start is not None:
+            design = self.warm_start.design_point(self.parent)
+            seed = self.warm_start.nearest(design)
+            if seed is not None and seed.size == x.size:
+                x = seed
+                self.set_parameters(x)
+
+        self.run_iteration()
+        self.iteration_count = 1
+
+        while True:
+            g = self._eval_targets()
+            self.residual_norm = self._norm(g - x)
+
+            if self.residual_norm <= self.tolerance or self.iteration_count >= self.max_iteration:
+                break
+
+            x = accelerator.update(x, g)
+            self.set_parameters(x)
+            self.run_iteration()
+            self.iteration_count += 1
+
+        self.total_iterations += self.iteration_count
+
+        if self.warm_start is not None and self.residual_norm <= self.tolerance:
+            self.warm_start.add(design, x)
+
+        if self.residual_norm > self.tolerance:
+            self._logger.warning('fixed-point iteration did not converge in %d iterations (residual %g)'
+                                 % (self.iteration_count, self.residual_norm))
+
+
+def add_flexible_blade_loop(assembly, fpi_acceleration=None, fpi_warm_start=None):
+    """add the 'fpi' driver that converges the blade deflections of assembly.rotor
+
+    The standard FixedPointIterator is used unless fpi_acceleration ('none',
+    'aitken' or 'anderson') or a WarmStartStore is given (see configure_turbine).
+    The caller adds 'fpi' to its own workflow.
+    """
+
+    if fpi_acceleration is None and fpi_warm_start is None:
+        assembly.add('fpi', FixedPointIterator())
+    else:
+        assembly.add('fpi', AcceleratedFixedPointIterator())
+        assembly.fpi.acceleration = fpi_acceleration or 'none'
+        if fpi_warm_start is not None:
+            assembly.fpi.set_warm_start(fpi_warm_start)
+
+    assembly.fpi.workflow.add(['rotor'])
+    assembly.fpi.add_parameter('rotor.delta_precurve_sub', low=-1.e99, high=1.e99)
+    assembly.fpi.add_parameter('rotor.delta_bladeLength', low=-1.e99, high=1.e99)
+    assembly.fpi.add_constraint('rotor.delta_precurve_sub = rotor.delta_precurve_sub_out')
+    assembly.fpi.add_constraint('rotor.delta_bladeLength = rotor.delta_bladeLength_out')
+    assembly.fpi.max_iteration = 20
+    assembly.fpi.tolerance = 1e-8
@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+rotor_surrogate.py
+
+Surrogate of RotorSE for plant-level screening: a response surface of the rotor
+outputs used by the turbine and LCOE assemblies, trained on sampled RotorSE runs over
+chord, twist, blade length and tip-speed ratio, and saved to disk.  SurrogateRotorSE
+takes the place of RotorSE in configure_turbine (rotor_surrogate option).  The other
+rotor inputs are recorded at training time and flagged if they differ when predicting.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import warnings
+from collections import OrderedDict
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import numpy as np
+
+from rotorse.rotor import RotorSE
+from wisdem.utilities.surrogates import create_surface, latin_hypercube
+from wisdem.utilities.result_cache import hash_inputs
+from wisdem.utilities.variables import IGNORED_VARS
+
+
+ROTOR_FEATURES = ('chord_sub', 'theta_sub', 'bladeLength', 'control.tsr')
+
+# rotor outputs connected in configure_turbine and the lcoe assemblies
+ROTOR_OUTPUTS = ('mass_one_blade', 'mass_all_blades', 'I_all_blades', 'root_bending_moment', 'diameter',
+                 'hub_diameter', 'Rtip', 'precurveTip', 'presweepTip', 'ratedConditions.V',
+                 'ratedConditions.Omega', 'ratedConditions.Q', 'ratedConditions.T', 'T_extreme', 'Q_extreme',
+                 'V_extreme', 'Mxyz_0', 'Mxyz_120', 'Mxyz_240', 'Fxyz_0', 'Fxyz_120', 'Fxyz_240', 'Pitch',
+                 'TotalCone', 'AEP', 'V', 'P')
+
+
+def _set_path(obj, path, value):
+
+    names = path.split('.')
+    for name in names[:-1]:
+        obj = getattr(obj, name)
+    setattr(obj, names[-1], value)
+
+
+class RotorSurrogate(object):
+    """response surface from rotor inputs (features) to rotor outputs
+
+    Parameters
+    ----------
+    features : list of str
+        rotor inputs the surrogate depends on; the other inputs are assumed to keep the
+        values they had during training (see changed_inputs)
+    outputs : list of str
+        rotor outputs predicted (array outputs are predicted entry by entry)
+    method : str
+        'kriging', 'rbf' or 'polynomial' (see wisdem.utilities.surrogates)
+    options
+        passed on to the response surface, e.g. order=2 or kernel='cubic'
+
+    """
+
+    def __init__(self, features=ROTOR_FEATURES, outputs=ROTOR_OUTPUTS, method='kriging', **options):
+        self.features = list(features)
+        self.outputs = list(outputs)
+        self.method = method
+        self.options = options
+        self.surface = None
+        self.fixed_inputs = None  # input path -> hash of its training value
+
+    # --- training ---
+
+    def _flat_features(self, values):
+        return np.concatenate([np.ravel(np.asarray(value, dtype=float)) for value in values])
+
+    def _split_features(self, x):
+
+        values = []
+        i = 0
+        for size, shape in zip(self.feature_sizes, self.feature_shapes):
+            values.append(x[i:i+size].reshape(shape) if shape else x[i])
+            i += size
+
+        return values
+
+    def _fixed_paths(self, rotor):
+        # every input but the features; variable trees holding a feature (control) are split into members
+
+        paths = []
+        for path in sorted(rotor.list_inputs()):
+            if path in self.features or path in IGNORED_VARS:
+                continue
+            prefix = path + '.'
+            if any(feature.startswith(prefix) for feature in self.features):
+                paths.extend(prefix + name for name in sorted(rotor.get(path).list_vars())
+                             if prefix + name not in self.features)
+            else:
+                paths.append(path)
+
+        return paths
+
+    def default_bounds(self, reference, spread=0.1):
+        """bounds of +-spread around reference feature values, scaled by the largest
+        magnitude of each feature (so twist near zero still varies)"""
+
+        lower, upper = [], []
+        for value in reference:
+            value = np.ravel(np.asarray(value, dtype=float))
+            delta = spread*max(np.max(np.abs(value)), 1e-6)
+            lower.append(value - delta)
+            upper.append(value + delta)
+
+        return np.concatenate(lower), np.concatenate(upper)
+
+    def sample(self, rotor, n_samples=200, lower=None, upper=None, spread=0.1, seed=None):
+        """run RotorSE on a Latin hypercube over the features
+
+        The rotor must have its reference inputs set (e.g. with configure_nrel5mw_turbine,
+        and run once inside its assembly so the connected inputs hold their values).  Its
+        features are put back to the reference values afterwards, and the values of
+        its other inputs are recorded in fixed_inputs.
+
+        Returns
+        -------
+        X, Y : ndarray
+            features and outputs of the runs that succeeded, one row per run
+        failures : int
+            number of runs that raised
+        """
+
+        outputs = set(rotor.list_outputs())
+        self.outputs = [name for name in self.outputs if name.split('.')[0] in outputs]
+
+        reference = [rotor.get(path) for path in self.features]
+        self.fixed_inputs = OrderedDict((path, hash_inputs(rotor.get(path))) for path in self._fixed_paths(rotor))
+        self.feature_shapes = [np.shape(value) for value in reference]
+        self.feature_sizes = [int(np.size(value)) for value in reference]
+        if lower is None or upper is None:
+            lower, upper = self.default_bounds(reference, spread)
+
+        X = latin_hypercube(n_samples, lower, upper, seed)
+        rows = []
+        failures = 0
+        try:
+            for x in X:
+                for path, value in zip(self.features, self._split_features(x)):
+                    rotor.set(path, value)
+                try:
+                    rotor.run()
+                except Exception:
+                    failures += 1
+                    rows.append(None)
+                    continue
+                rows.append([np.array(rotor.get(name), dtype=float) for name in self.outputs])
+        finally:
+            for path, value in zip(self.features, reference):
+                rotor.set(path, value)
+
+        ok = [i for i, row in enumerate(rows) if row is not None]
+        if not ok:
+            raise RuntimeError('no RotorSE sample ran successfully')
+        self.output_shapes = [value.shape for value in rows[ok[0]]]
+        Y = np.array([np.concatenate([value.ravel() for value in rows[i]]) for i in ok])
+
+        return X[ok], Y, failures
+
+    def fit(self, X, Y):
+        """train the response surface on features X and flattened outputs Y"""
+
+        X = np.asarray(X, dtype=float)
+        self.lower = X.min(axis=0)
+        self.upper = X.max(axis=0)
+        self.surface = create_surface(self.method, **self.options).train(X, Y)
+
+        return self
+
+    def train(self, rotor, n_samples=200, lower=None, upper=None, spread=0.1, seed=None):
+        """sample RotorSE and fit the response surface; returns the number of failed runs"""
+
+        X, Y, failures = self.sample(rotor, n_samples, lower, upper, spread, seed)
+        self.fit(X, Y)
+
+        return failures
+
+    # --- prediction ---
+
+    def _unflatten(self, y):
+
+        values = OrderedDict()
+        i = 0
+        for name, shape in zip(self.outputs, self.output_shapes):
+            size = int(np.prod(shape)) if shape else 1
+            values[name] = y[i:i+size].reshape(shape) if shape else float(y[i])
+            i += size
+
+        return values
+
+    def predict(self, values):
+        """OrderedDict of output -> predicted value for the given feature values"""
+
+        return self._unflatten(self.surface.predict(self._flat_features(values)))
+
+    def predict_std(self, values):
+        """OrderedDict of output -> estimated standard deviation of the prediction error"""
+
+        return self._unflatten(self.surface.predict_std(self._flat_features(values)))
+
+    def error(self):
+        """OrderedDict of output -> leave-one-out rms error over the training samples"""
+
+        return self._unflatten(self.surface.rmse)
+
+    def changed_inputs(self, rotor):
+        """rotor inputs other than the features whose values differ from training"""
+
+        if getattr(self, 'fixed_inputs', None) is None:  # fitted on samples from elsewhere, or saved before
+            return []
+
+        return [path for path in self._fixed_paths(rotor)
+                if self.fixed_inputs.get(path) != hash_inputs(rotor.get(path))]
+
+    def extrapolating(self, values):
+        """True if the feature values are outside the sampled box"""
+
+        x = self._flat_features(values)
+
+        return bool(np.any(x < self.lower) or np.any(x > self.upper))
+
+    # --- persistence ---
+
+    def save(self, filename):
+
+        with open(filename, 'wb') as f:
+            pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filename):
+
+        with open(filename, 'rb') as f:
+            return pickle.load(f)
+
+
+class SurrogateRotorSE(RotorSE):
+    """RotorSE whose outputs are predicted by a trained RotorSurrogate instead of
+    running the aero and structural models
+
+    After each execute, prediction_std holds the estimated error of every output,
+    extrapolated is set if the features were outside the training samples and
+    inputs_changed lists the other inputs that no longer have their training values
+    (the predictions ignore them; a warning is issued as well).
+    """
+
+    def __init__(self, surrogate):
+        super(SurrogateRotorSE, self).__init__()
+        self.surrogate = surrogate
+        self.prediction_std = None
+        self.extrapolated = False
+        self.inputs_changed = []
+
+    def execute(self):
+
+        values = [self.get(path) for path in self.surrogate.features]
+
+        for name, value in self.surrogate.predict(values).items():
+            _set_path(self, name, value)
+
+        self.prediction_std = self.surrogate.predict_std(values)
+        self.extrapolated = self.surrogate.extrapolating(values)
+
+        self.inputs_changed = self.surrogate.changed_inputs(self)
+        if self.inputs_changed:
+            warnings.warn('rotor surrogate used with inputs that differ from its training values: '
+                          + ', '.join(self.inputs_changed))
+
+
+if __name__ == '__main__':
+
+    from wisdem.turbinese.turbine import TurbineSE
+    from wisdem.reference_turbines.nrel5mw.nrel5mw import configure_nrel5mw_turbine
+
+    # train on the NREL 5 MW rotor, +-10% around the reference chord, twist, length and tsr
+    turbine = TurbineSE()
+    turbine.sea_depth = 0.0
+    configure_nrel5mw_turbine(turbine, 'I', turbine.sea_depth)
+    turbine.run()
+
+    surrogate = RotorSurrogate(method='kriging')
+    failures = surrogate.train(turbine.rotor, n_samples=200, seed=0)
+    surrogate.save('nrel5mw_rotor_surrogate.pkl')
+
+    print('%d failed samples' % failures)
+    for name, rmse in surrogate.error().items():
+        print('%-24s leave-one-out rms error %s' % (name, rmse))
+
+    # screening with the surrogate in place of RotorSE
+    from wisdem.lcoe.lcoe_se_assembly import example_se_assembly
+    lcoe_se = example_se_assembly(rotor_surrogate=RotorSurrogate.load('nrel5mw_rotor_surrogate.pkl'))
+    lcoe_se.run()
+    print('COE: %.4f USD/kWh (rotor extrapolated: %s)' % (lcoe_se.coe, lcoe_se.rotor.extrapolated))
@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+tip_clearance.py
+
+Blade tip to tower clearance geometry shared by the MaxTipDeflection components
+in turbine.py and turbine_jacket.py.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import numpy as np
+
+
+# rotation matrices for recently used (precone, tilt) pairs
+_rotation_cache = {}
+_ROTATION_CACHE_SIZE = 256
+
+
+def _rotation_matrices(precone, tilt):
+    """maps from blade-aligned (x, y, z) to yaw-aligned (x, z), i.e. the x and z rows of
+    DirectionVector.bladeToAzimuth(precone).azimuthToHub(180).hubToYaw(tilt),
+    along with their derivatives w.r.t. precone and tilt (per deg)
+
+    Parameters
+    ----------
+    precone, tilt : ndarray, shape (k,) (deg)
+
+    Returns
+    -------
+    M, dM_dprecone, dM_dtilt : ndarray, shape (k, 2, 3)
+
+    """
+
+    k = precone.size
+
+    c1 = np.cos(np.radians(-precone))[:, np.newaxis]
+    s1 = np.sin(np.radians(-precone))[:, np.newaxis]
+    ca = np.cos(np.radians(-180.0))
+    sa = np.sin(np.radians(-180.0))
+    c3 = np.cos(np.radians(-tilt))[:, np.newaxis]
+    s3 = np.sin(np.radians(-tilt))[:, np.newaxis]
+
+    def azimuth_to_yaw(x1, y1, z1):
+        z2 = -y1*sa + z1*ca
+        return -z2*s3 + x1*c3, z2*c3 + x1*s3
+
+    # columns are the images of the blade-aligned unit vectors
+    ex, ey, ez = np.eye(3)
+    x1 = ex*c1 - ez*s1
+    y1 = np.tile(ey, (k, 1))
+    z1 = ez*c1 + ex*s1
+
+    yx, yz = azimuth_to_yaw(x1, y1, z1)
+    M = np.stack([yx, yz], axis=1)
+
+    px, pz = azimuth_to_yaw(np.radians(z1), np.zeros((k, 3)), -np.radians(x1))
+    dM_dprecone = np.stack([px, pz], axis=1)
+
+    dM_dtilt = np.stack([np.radians(yz), -np.radians(yx)], axis=1)
+
+    return M, dM_dprecone, dM_dtilt
+
+
+def rotation_matrices(precone, tilt):
+    """cached rotation matrices for each (precone, tilt) case, shape (n, 2, 3) each
+
+    Only the unique angle pairs are evaluated.  Single designs (the usual case inside
+    an assembly) are kept in a small module-level cache so repeated executions at the
+    same precone and tilt skip the trigonometry entirely.
+
+    """
+
+    precone = np.asarray(precone, dtype=float).ravel()
+    tilt = np.asarray(tilt, dtype=float).ravel()
+
+    if precone.size == 1:
+        key = (float(precone[0]), float(tilt[0]))
+        mats = _rotation_cache.get(key)
+        if mats is None:
+            if len(_rotation_cache) >= _ROTATION_CACHE_SIZE:
+                _rotation_cache.clear()
+            mats = _rotation_matrices(precone, tilt)
+            _rotation_cache[key] = mats
+        return mats
+
+    pairs, inverse = np.unique(np.column_stack([precone, tilt]), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    M, dM_dprecone, dM_dtilt = _rotation_matrices(pairs[:, 0], pairs[:, 1])
+
+    return M[inverse], dM_dprecone[inverse], dM_dtilt[inverse]
+
+
+def max_tip_deflection_batch(Rtip, precurveTip, presweepTip, precone, tilt, hub_tt, tower_z, tower_d, towerHt):
+    """vectorized tip clearance for screening many rotor/tower combinations in one pass
+
+    Parameters
+    ----------
+    Rtip, precurveTip, presweepTip : array_like, shape (n,) (m)
+        blade tip location in blade-aligned c.s.
+    precone, tilt : array_like, shape (n,) (deg)
+    hub_tt : array_like, shape (n, 3) or (3,) (m)
+        location of hub relative to tower-top in yaw-aligned c.s.
+    tower_z, tower_d : array_like, shape (n, m) or (m,) (m)
+        tower stations and diameters, either shared by all cases or given per case
+    towerHt : array_like, shape (n,) (m)
+
+    Returns
+    -------
+    max_tip_deflection : ndarray, shape (n,)
+        clearance between undeflected blade and tower
+    ground_clearance : ndarray, shape (n,)
+        distance between blade tip and ground
+    J : ndarray, shape (n, 2, 9 + 2*m)
+        Jacobian of (max_tip_deflection, ground_clearance) for each case, with columns
+        in the same order as MaxTipDeflection.provideJ
+
+    """
+
+    Rtip, precurveTip, presweepTip, precone, tilt, towerHt = np.broadcast_arrays(
+        *[np.asarray(v, dtype=float) for v in (Rtip, precurveTip, presweepTip, precone, tilt, towerHt)])
+    Rtip = Rtip.ravel()
+    precurveTip = precurveTip.ravel()
+    presweepTip = presweepTip.ravel()
+    precone = precone.ravel()
+    tilt = tilt.ravel()
+    towerHt = towerHt.ravel()
+    n = Rtip.size
+
+    hub_tt = np.broadcast_to(np.asarray(hub_tt, dtype=float), (n, 3))
+    tower_z = np.atleast_2d(np.asarray(tower_z, dtype=float))
+    tower_d = np.atleast_2d(np.asarray(tower_d, dtype=float))
+    m = tower_z.shape[1]
+    tower_z = np.broadcast_to(tower_z, (n, m))
+    tower_d = np.broadcast_to(tower_d, (n, m))
+
+    # coordinates of blade tip in yaw c.s.
+    M, dM_dprecone, dM_dtilt = rotation_matrices(precone, tilt)
+    tip = np.column_stack([precurveTip, presweepTip, Rtip])
+    byx, byz = np.einsum('nij,nj->in', M, tip)
+
+    # derivatives of the tip location: (Rtip, precurveTip, presweepTip, precone, tilt)
+    dby = np.concatenate([M[:, :, [2, 0, 1]],
+                          np.einsum('nij,nj->ni', dM_dprecone, tip)[:, :, np.newaxis],
+                          np.einsum('nij,nj->ni', dM_dtilt, tip)[:, :, np.newaxis]], axis=2)
+
+    # find corresponding radius of tower (linear interpolation, as in interp_with_deriv)
+    ztower = (towerHt + hub_tt[:, 2] + byz)/towerHt  # nondimensional location
+    idx = np.arange(n)
+    j = np.clip(np.sum(tower_z <= ztower[:, np.newaxis], axis=1) - 1, 0, m-2)
+    zl = tower_z[idx, j]
+    zu = tower_z[idx, j+1]
+    dl = tower_d[idx, j]
+    du = tower_d[idx, j+1]
+    dz = zu - zl
+    dtower = dl + (du - dl)*(ztower - zl)/dz
+    dtower = np.where(ztower < tower_z[:, 0], tower_d[:, 0], dtower)
+    dtower = np.where(ztower > tower_z[:, -1], tower_d[:, -1], dtower)
+    rtower = dtower / 2.0
+
+    drtower_dztower = (du - dl)/dz / 2.0
+    drtower_dtowerz = np.zeros((n, m))
+    drtower_dtowerz[idx, j] = (du - dl)*(ztower - zu)/dz**2 / 2.0
+    drtower_dtowerz[idx, j+1] = -(du - dl)*(ztower - zl)/dz**2 / 2.0
+    drtower_dtowerd = np.zeros((n, m))
+    drtower_dtowerd[idx, j] = (zu - ztower)/dz / 2.0
+    drtower_dtowerd[idx, j+1] = (ztower - zl)/dz / 2.0
+
+    # outside the tower the radius is held at the end value
+    below = ztower < tower_z[:, 0]
+    above = ztower > tower_z[:, -1]
+    outside = below | above
+    drtower_dztower[outside] = 0.0
+    drtower_dtowerz[outside] = 0.0
+    drtower_dtowerd[outside] = 0.0
+    drtower_dtowerd[below, 0] = 0.5
+    drtower_dtowerd[above, -1] = 0.5
+
+    # max deflection before strike (upwind if precone >= 0)
+    sign = np.where(precone >= 0, -1.0, 1.0)
+    max_tip_deflection = -hub_tt[:, 0] + sign*byx - rtower
+
+    # ground clearance
+    ground_clearance = towerHt + hub_tt[:, 2] + byz
+
+    # Jacobian
+    J = np.zeros((n, 2, 9 + 2*m))
+    J[:, 0, :5] = sign[:, np.newaxis]*dby[:, 0] - (drtower_dztower/towerHt)[:, np.newaxis]*dby[:, 1]
+    J[:, 1, :5] = dby[:, 1]
+
+    J[:, 0, 5] = -1.0
+    J[:, 0, 7] = -drtower_dztower/towerHt
+    J[:, 1, 7] = 1.0
+
+    J[:, 0, 8:8+m] = -drtower_dtowerz
+    J[:, 0, 8+m:8+2*m] = -drtower_dtowerd
+
+    J[:, 0, -1] = drtower_dztower*(hub_tt[:, 2] + byz)/towerHt**2
+    J[:, 1, -1] = 1.0
+
+    return max_tip_deflection, ground_clearance, J
+
+
+def max_tip_deflection(Rtip, precurveTip, presweepTip, precone, tilt, hub_tt, tower_z, tower_d, towerHt):
+    """tip clearance of a single design
+
+    Returns
+    -------
+    max_tip_deflection : float
+    ground_clearance : float
+    J : ndarray, shape (2, 9 + 2*m)
+        Jacobian in MaxTipDeflection.provideJ order
+
+    """
+
+    mtd, gc, J = max_tip_deflection_batch(Rtip, precurveTip, presweepTip, precone, tilt,
+                                          hub_tt, tower_z, tower_d, towerHt)
+
+    return float(mtd[0]), float(gc[0]), J[0]
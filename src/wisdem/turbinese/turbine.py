@@ -9,25 +9,20 @@ Copyright (c) NREL. All rights reserved.
 
 from openmdao.main.api import Assembly, Component
 from openmdao.main.datatypes.api import Float, Array, Enum, Bool
-from openmdao.lib.drivers.api import FixedPointIterator
 import numpy as np
 
 from rotorse.rotor import RotorSE
 from towerse.tower import TowerSE
 from commonse.rna import RNAMass, RotorLoads
-from drivewpact.drive import DriveWPACT
-from drivewpact.hub import HubWPACT
-from commonse.csystem import DirectionVector
-from commonse.utilities import interp_with_deriv, hstack, vstack
-from drivese.drive import Drive4pt, Drive3pt
-from drivese.drivese_utils import blade_moment_transform, blade_force_transform
-from drivese.hub import HubSE, Hub_System_Adder_drive
+from wisdem.turbinese.tip_clearance import max_tip_deflection, max_tip_deflection_batch
+from wisdem.turbinese.fixed_point import add_flexible_blade_loop
+from wisdem.utilities.result_cache import CachedExecuteMixin
 
 
 class MaxTipDeflection(Component):
 
     Rtip = Float(iotype='in', units='m')
-    precurveTip = Float(iotype='in', units='m')  # TODO: add gradients for precurveTip and presweepTip
+    precurveTip = Float(iotype='in', units='m')
     presweepTip = Float(iotype='in', units='m')
     precone = Float(iotype='in', units='deg')
     tilt = Float(iotype='in', units='deg')
@@ -41,31 +36,10 @@ class MaxTipDeflection(Component):
 
     def execute(self):
 
-        # coordinates of blade tip in yaw c.s.
-        blade_yaw = DirectionVector(self.precurveTip, self.presweepTip, self.Rtip)\
-            .bladeToAzimuth(self.precone).azimuthToHub(180.0).hubToYaw(self.tilt)
-
-        # find corresponding radius of tower
-        ztower = (self.towerHt + self.hub_tt[2] + blade_yaw.z)/self.towerHt  # nondimensional location
-        # rtower = np.interp(ztower, self.tower_z, self.tower_d) / 2.0
-        dtower, ddtower_dztower, ddtower_dtowerz, ddtower_dtowerd = interp_with_deriv(ztower, self.tower_z, self.tower_d)
-        rtower = dtower / 2.0
-        self.drtower_dztower = ddtower_dztower / 2.0
-        self.drtower_dtowerz = ddtower_dtowerz / 2.0
-        self.drtower_dtowerd = ddtower_dtowerd / 2.0
-
-        # max deflection before strike
-        if self.precone >= 0:  # upwind
-            self.max_tip_deflection = -self.hub_tt[0] - blade_yaw.x - rtower
-        else:
-            self.max_tip_deflection = -self.hub_tt[0] + blade_yaw.x - rtower
-            # TODO: need to redo gradients for this case.
-
-        # ground clearance
-        self.ground_clearance = self.towerHt + self.hub_tt[2] + blade_yaw.z
-
-        # save for derivs
-        self.blade_yaw = blade_yaw
+        # max deflection before strike and ground clearance (see tip_clearance.py)
+        self.max_tip_deflection, self.ground_clearance, self.J = max_tip_deflection(
+            self.Rtip, self.precurveTip, self.presweepTip, self.precone, self.tilt,
+            self.hub_tt, self.tower_z, self.tower_d, self.towerHt)
 
 
     def list_deriv_vars(self):
@@ -78,82 +52,23 @@ class MaxTipDeflection(Component):
 
     def provideJ(self):
 
-        dbyx = self.blade_yaw.dx
-        # dbyy = self.blade_yaw.dy
-        dbyz = self.blade_yaw.dz
-
-        # Rtip
-        drtower_dRtip = self.drtower_dztower * dbyz['dz']/self.towerHt
-        if self.precone >= 0:
-            dtd_dRtip = -dbyx['dz'] - drtower_dRtip
-        else:
-            dtd_dRtip = dbyx['dz'] - drtower_dRtip
-        dgc_dRtip = dbyz['dz']
-
-        # precurveTip
-        drtower_dprecurveTip = self.drtower_dztower * dbyz['dx']/self.towerHt
-        if self.precone >= 0:
-            dtd_dprecurveTip = -dbyx['dx'] - drtower_dprecurveTip
-        else:
-            dtd_dprecurveTip = dbyx['dx'] - drtower_dprecurveTip
-        dgc_dprecurveTip = dbyz['dx']
-
-        # presweep
-        drtower_dpresweepTip = self.drtower_dztower * dbyz['dy']/self.towerHt
-        if self.precone >= 0:
-            dtd_dpresweepTip = -dbyx['dy'] - drtower_dpresweepTip
-        else:
-            dtd_dpresweepTip = dbyx['dy'] - drtower_dpresweepTip
-        dgc_dpresweepTip = dbyz['dy']
-
-
-        # precone
-        drtower_dprecone = self.drtower_dztower * dbyz['dprecone']/self.towerHt
-        if self.precone >= 0:
-            dtd_dprecone = -dbyx['dprecone'] - drtower_dprecone
-        else:
-            dtd_dprecone = dbyx['dprecone'] - drtower_dprecone
-        dgc_dprecone = dbyz['dprecone']
-
-        # tilt
-        drtower_dtilt = self.drtower_dztower * dbyz['dtilt']/self.towerHt
-        if self.precone >= 0:
-            dtd_dtilt = -dbyx['dtilt'] - drtower_dtilt
-        else:
-            dtd_dtilt = dbyx['dtilt'] - drtower_dtilt
-        dgc_dtilt = dbyz['dtilt']
-
-        # hubtt
-        drtower_dhubtt = self.drtower_dztower * np.array([0.0, 0.0, 1.0/self.towerHt])
-        dtd_dhubtt = np.array([-1.0, 0.0, 0.0]) - drtower_dhubtt
-        dgc_dhubtt = np.array([0.0, 0.0, 1.0])
+        return self.J
 
-        # tower_z
-        dtd_dtowerz = -self.drtower_dtowerz
-        dgc_dtowerz = np.zeros_like(self.tower_z)
 
-        # tower_d
-        dtd_dtowerd = -self.drtower_dtowerd
-        dgc_dtowerd = np.zeros_like(self.tower_d)
 
-        # towerHt
-        drtower_dtowerHt = self.drtower_dztower * -(self.hub_tt[2] + self.blade_yaw.z)/self.towerHt**2
-        dtd_dtowerHt = -drtower_dtowerHt
-        dgc_dtowerHt = 1.0
+class CachedRotorSE(CachedExecuteMixin, RotorSE):
+    """RotorSE that reuses outputs, and the state of its inner components, from a ResultCache
+    when its inputs are unchanged"""
 
-        dtd = hstack([dtd_dRtip, dtd_dprecurveTip, dtd_dpresweepTip, dtd_dprecone, dtd_dtilt,
-            dtd_dhubtt, dtd_dtowerz, dtd_dtowerd, dtd_dtowerHt])
-        dgc = np.concatenate([[dgc_dRtip], [dgc_dprecurveTip], [dgc_dpresweepTip], [dgc_dprecone],
-            [dgc_dtilt], dgc_dhubtt, dgc_dtowerz, dgc_dtowerd, [dgc_dtowerHt]])
+    def __init__(self, result_cache=None):
+        super(CachedRotorSE, self).__init__()
+        self.result_cache = result_cache
 
-        J = vstack([dtd, dgc])
 
-        return J
 
 
-
-
-def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, with_3pt_drive=False):
+def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, with_3pt_drive=False, fpi_acceleration=None,
+                      fpi_warm_start=None, rotor_cache=None, rotor_surrogate=None, concurrent_workers=None):
     """a stand-alone configure method to allow for flatter assemblies
 
     Parameters
@@ -168,8 +83,29 @@ def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, wit
         Note that the coupling is currently only in the flapwise deflection, and is primarily
         only important for highly flexible blades.  If False, the aero loads are passed
         to the structure but there is no further iteration.
+    fpi_acceleration : str
+        None uses the standard FixedPointIterator for the flexible blade.  'aitken' or 'anderson'
+        use AcceleratedFixedPointIterator, which typically converges in far fewer rotor
+        evaluations and reports them in fpi.iteration_count.
+    fpi_warm_start : WarmStartStore
+        if given, each flexible-blade solve starts from the converged deflections of the nearest
+        design already in the store (implies AcceleratedFixedPointIterator)
+    rotor_cache : ResultCache
+        if given, the rotor is a CachedRotorSE that skips re-execution for inputs it has already seen
+    rotor_surrogate : RotorSurrogate
+        if given, the rotor is a SurrogateRotorSE whose outputs are predicted from the trained
+        surrogate (see rotor_surrogate.py); not available with flexible_blade
+    concurrent_workers : int
+        experimental, off by default.  If given, the top-level workflow runs on a ConcurrentDriver,
+        level by level on that many threads (independent components such as tower, rotorloads1 and
+        rotorloads2 share a level).  None keeps the standard serial driver.
     """
 
+    if concurrent_workers is not None:
+        from wisdem.utilities.scheduler import ConcurrentDriver
+        assembly.add('driver', ConcurrentDriver())
+        assembly.driver.max_workers = concurrent_workers
+
     # --- general turbine configuration inputs---
     assembly.add('rho', Float(1.225, iotype='in', units='kg/m**3', desc='density of air', deriv_ignore=True))
     assembly.add('mu', Float(1.81206e-5, iotype='in', units='kg/m/s', desc='dynamic viscosity of air', deriv_ignore=True))
@@ -185,17 +121,32 @@ def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, wit
     assembly.add('machine_rating', Float(5000.0, units='kW', iotype='in', desc='machine rated power'))
     assembly.add('rna_weightM', Bool(True, iotype='in', desc='flag to consider or not the RNA weight effect on Moment'))
 
-    assembly.add('rotor', RotorSE())
+    if rotor_surrogate is not None:
+        if flexible_blade:
+            raise ValueError('the rotor surrogate does not model the flexible blade deflection')
+        from wisdem.turbinese.rotor_surrogate import SurrogateRotorSE
+        assembly.add('rotor', SurrogateRotorSE(rotor_surrogate))
+    elif rotor_cache is None:
+        assembly.add('rotor', RotorSE())
+    else:
+        assembly.add('rotor', CachedRotorSE(rotor_cache))
+    # drivetrain models are only imported for the selected configuration
     if with_new_nacelle:
+        from drivese.drivese_utils import blade_moment_transform, blade_force_transform
+        from drivese.hub import HubSE, Hub_System_Adder_drive
         assembly.add('hub',HubSE())
         assembly.add('hubSystem',Hub_System_Adder_drive())
         assembly.add('moments',blade_moment_transform())
         assembly.add('forces',blade_force_transform())
         if with_3pt_drive:
+            from drivese.drive import Drive3pt
             assembly.add('nacelle', Drive3pt())
         else:
+            from drivese.drive import Drive4pt
             assembly.add('nacelle', Drive4pt())
     else:
+        from drivewpact.drive import DriveWPACT
+        from drivewpact.hub import HubWPACT
         assembly.add('nacelle', DriveWPACT())
         assembly.add('hub', HubWPACT())
     assembly.add('rna', RNAMass())
@@ -205,16 +156,7 @@ def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, wit
     assembly.add('maxdeflection', MaxTipDeflection())
 
     if flexible_blade:
-        assembly.add('fpi', FixedPointIterator())
-
-        assembly.fpi.workflow.add(['rotor'])
-        assembly.fpi.add_parameter('rotor.delta_precurve_sub', low=-1.e99, high=1.e99)
-        assembly.fpi.add_parameter('rotor.delta_bladeLength', low=-1.e99, high=1.e99)
-        assembly.fpi.add_constraint('rotor.delta_precurve_sub = rotor.delta_precurve_sub_out')
-        assembly.fpi.add_constraint('rotor.delta_bladeLength = rotor.delta_bladeLength_out')
-        assembly.fpi.max_iteration = 20
-        assembly.fpi.tolerance = 1e-8
-
+        add_flexible_blade_loop(assembly, fpi_acceleration, fpi_warm_start)
         assembly.driver.workflow.add(['fpi'])
 
     else:
@@ -394,8 +336,17 @@ def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, wit
 
 class TurbineSE(Assembly):
 
+    def __init__(self, rotor_cache=None, rotor_surrogate=None, concurrent_workers=None):
+
+        self.rotor_cache = rotor_cache
+        self.rotor_surrogate = rotor_surrogate
+        self.concurrent_workers = concurrent_workers
+
+        super(TurbineSE, self).__init__()
+
     def configure(self):
-        configure_turbine(self)
+        configure_turbine(self, rotor_cache=self.rotor_cache, rotor_surrogate=self.rotor_surrogate,
+                          concurrent_workers=self.concurrent_workers)
 
 
 if __name__ == '__main__':
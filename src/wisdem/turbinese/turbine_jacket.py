@@ -23,16 +23,15 @@ from jacketse.jacket import JcktGeoInputs,SoilGeoInputs,WaterInputs,WindInputs,R
 from commonse.Tube import Tube
 from drivewpact.drive import DriveWPACT
 from drivewpact.hub import HubWPACT
-from commonse.csystem import DirectionVector
-from commonse.utilities import interp_with_deriv, hstack, vstack
 from drivese.drive import Drive4pt, Drive3pt
 from drivese.hub import HubSE
+from wisdem.turbinese.tip_clearance import max_tip_deflection
 
 
 class MaxTipDeflection(Component):
 
     Rtip = Float(iotype='in', units='m')
-    precurveTip = Float(iotype='in', units='m')  # TODO: add gradients for precurveTip and presweepTip
+    precurveTip = Float(iotype='in', units='m')
     presweepTip = Float(iotype='in', units='m')
     precone = Float(iotype='in', units='deg')
     tilt = Float(iotype='in', units='deg')
@@ -47,114 +46,27 @@ class MaxTipDeflection(Component):
 
     def execute(self):
 
-        # coordinates of blade tip in yaw c.s.
-        blade_yaw = DirectionVector(self.precurveTip, self.presweepTip, self.Rtip)\
-            .bladeToAzimuth(self.precone).azimuthToHub(180.0).hubToYaw(self.tilt)
-
-        # find corresponding radius of tower
-        ztower = (self.towerHt + self.hub_tt[2] + blade_yaw.z)/self.towerHt  # nondimensional location
-        # rtower = np.interp(ztower, self.tower_z, self.tower_d) / 2.0
-        dtower, ddtower_dztower, ddtower_dtowerz, ddtower_dtowerd = interp_with_deriv(ztower, self.tower_z, self.Twrouts.TwrObj.D)
-        rtower = dtower / 2.0
-        self.drtower_dztower = ddtower_dztower / 2.0
-        self.drtower_dtowerz = ddtower_dtowerz / 2.0
-        self.drtower_dtowerd = ddtower_dtowerd / 2.0
-
-        # max deflection before strike
-        if self.precone >= 0:  # upwind
-            self.max_tip_deflection = -self.hub_tt[0] - blade_yaw.x - rtower
-        else:
-            self.max_tip_deflection = -self.hub_tt[0] + blade_yaw.x - rtower
-            # TODO: need to redo gradients for this case.
-
-        # ground clearance
-        self.ground_clearance = self.towerHt + self.hub_tt[2] + blade_yaw.z
+        # max deflection before strike and ground clearance (see tip_clearance.py)
+        self.max_tip_deflection, self.ground_clearance, J = max_tip_deflection(
+            self.Rtip, self.precurveTip, self.presweepTip, self.precone, self.tilt,
+            self.hub_tt, self.tower_z, self.Twrouts.TwrObj.D, self.towerHt)
 
-        # save for derivs
-        self.blade_yaw = blade_yaw
+        # tower diameters come in through the Twrouts variable tree, which is not differentiated
+        m = len(self.tower_z)
+        self.J = np.delete(J, np.arange(8+m, 8+2*m), axis=1)
 
 
     def list_deriv_vars(self):
 
         inputs = ('Rtip', 'precurveTip', 'presweepTip', 'precone', 'tilt', 'hub_tt',
-            'tower_z', 'tower_d', 'towerHt')
+            'tower_z', 'towerHt')
         outputs = ('max_tip_deflection', 'ground_clearance')
 
         return inputs, outputs
 
     def provideJ(self):
 
-        dbyx = self.blade_yaw.dx
-        # dbyy = self.blade_yaw.dy
-        dbyz = self.blade_yaw.dz
-
-        # Rtip
-        drtower_dRtip = self.drtower_dztower * dbyz['dz']/self.towerHt
-        if self.precone >= 0:
-            dtd_dRtip = -dbyx['dz'] - drtower_dRtip
-        else:
-            dtd_dRtip = dbyx['dz'] - drtower_dRtip
-        dgc_dRtip = dbyz['dz']
-
-        # precurveTip
-        drtower_dprecurveTip = self.drtower_dztower * dbyz['dx']/self.towerHt
-        if self.precone >= 0:
-            dtd_dprecurveTip = -dbyx['dx'] - drtower_dprecurveTip
-        else:
-            dtd_dprecurveTip = dbyx['dx'] - drtower_dprecurveTip
-        dgc_dprecurveTip = dbyz['dx']
-
-        # presweep
-        drtower_dpresweepTip = self.drtower_dztower * dbyz['dy']/self.towerHt
-        if self.precone >= 0:
-            dtd_dpresweepTip = -dbyx['dy'] - drtower_dpresweepTip
-        else:
-            dtd_dpresweepTip = dbyx['dy'] - drtower_dpresweepTip
-        dgc_dpresweepTip = dbyz['dy']
-
-
-        # precone
-        drtower_dprecone = self.drtower_dztower * dbyz['dprecone']/self.towerHt
-        if self.precone >= 0:
-            dtd_dprecone = -dbyx['dprecone'] - drtower_dprecone
-        else:
-            dtd_dprecone = dbyx['dprecone'] - drtower_dprecone
-        dgc_dprecone = dbyz['dprecone']
-
-        # tilt
-        drtower_dtilt = self.drtower_dztower * dbyz['dtilt']/self.towerHt
-        if self.precone >= 0:
-            dtd_dtilt = -dbyx['dtilt'] - drtower_dtilt
-        else:
-            dtd_dtilt = dbyx['dtilt'] - drtower_dtilt
-        dgc_dtilt = dbyz['dtilt']
-
-        # hubtt
-        drtower_dhubtt = self.drtower_dztower * np.array([0.0, 0.0, 1.0/self.towerHt])
-        dtd_dhubtt = np.array([-1.0, 0.0, 0.0]) - drtower_dhubtt
-        dgc_dhubtt = np.array([0.0, 0.0, 1.0])
-
-        # tower_z
-        dtd_dtowerz = -self.drtower_dtowerz
-        dgc_dtowerz = np.zeros_like(self.tower_z)
-
-        # tower_d
-        dtd_dtowerd = -self.drtower_dtowerd
-        dgc_dtowerd = np.zeros_like(self.tower_d)
-
-        # towerHt
-        drtower_dtowerHt = self.drtower_dztower * -(self.hub_tt[2] + self.blade_yaw.z)/self.towerHt**2
-        dtd_dtowerHt = -drtower_dtowerHt
-        dgc_dtowerHt = 1.0
-
-        dtd = hstack([dtd_dRtip, dtd_dprecurveTip, dtd_dpresweepTip, dtd_dprecone, dtd_dtilt,
-            dtd_dhubtt, dtd_dtowerz, dtd_dtowerd, dtd_dtowerHt])
-        dgc = np.concatenate([[dgc_dRtip], [dgc_dprecurveTip], [dgc_dpresweepTip], [dgc_dprecone],
-            [dgc_dtilt], dgc_dhubtt, dgc_dtowerz, dgc_dtowerd, [dgc_dtowerHt]])
-
-        J = vstack([dtd, dgc])
-
-        return J
+        return self.J
 
 
 
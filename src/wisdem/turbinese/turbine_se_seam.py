@@ -11,40 +11,71 @@ from openmdao.main.api import Assembly, Component
 from openmdao.main.datatypes.api import Float, Array, Enum, Bool, Int
 from openmdao.lib.drivers.api import FixedPointIterator
 import numpy as np
+from collections import OrderedDict
 
 #from rotorse.rotor import RotorSE
 #from towerse.tower import TowerSE
 #from commonse.rna import RNAMass, RotorLoads
-from drivewpact.drive import DriveWPACT
-from drivewpact.hub import HubWPACT
 from commonse.csystem import DirectionVector
 from commonse.utilities import interp_with_deriv, hstack, vstack
-from drivese.drive import Drive4pt, Drive3pt
-from drivese.drivese_utils import blade_moment_transform, blade_force_transform
-from drivese.hub import HubSE, Hub_System_Adder_drive
+from wisdem.utilities.variables import IGNORED_VARS
 
-from SEAMLoads.SEAMLoads import SEAMLoads
-from SEAMTower.SEAMTower import SEAMTower
-from SEAMAero.SEAM_AEP import SEAM_PowerCurve
-from SEAMRotor.SEAMRotor import SEAMBladeStructure
-# from SEAMGeometry.SEAMGeometry import SEAMGeometry
+# the SEAM and drivetrain models are imported in configure_turbine, the drivetrain
+# only for the selected configuration
 
-def connect_io(top, cls):
 
-    cls_name = cls.name
-    for name in cls.list_inputs():
+def connect_io(top, components):
+    """connect each component variable to the assembly variable of the same name
 
-        try:
-            top.connect(name, cls_name + '.%s' % name)
-        except:
-            # print 'failed connecting', cls_name, name
-            pass
+    Inputs are fed from assembly inputs and outputs drive assembly outputs, unless the
+    destination is already connected (the first component wins for an assembly output).
+    Framework variables (IGNORED_VARS) are never connected.  The names of the assembly
+    and of every component are indexed once, so only connections that exist are attempted.
 
-    for name in cls.list_outputs():
-        try:
-            top.connect(cls_name + '.%s' % name, name)
-        except:
-            pass
+    Parameters
+    ----------
+    top : Assembly
+    components : Component or list of Component
+
+    Returns
+    -------
+    unmatched : OrderedDict
+        component name -> inputs left unconnected (they keep their own values)
+    failed : OrderedDict
+        (source, destination) -> error message of the matching connections that
+        OpenMDAO rejected (e.g. incompatible units)
+    """
+
+    if not isinstance(components, (list, tuple)):
+        components = [components]
+
+    top_inputs = set(top.list_inputs())
+    top_outputs = set(top.list_outputs())
+    connected = set(dst.split('[')[0] for src, dst in top.list_connections())
+
+    unmatched = OrderedDict()
+    failed = OrderedDict()
+
+    for comp in components:
+        inputs = [name for name in comp.list_inputs() if name not in IGNORED_VARS]
+        outputs = [name for name in comp.list_outputs() if name not in IGNORED_VARS]
+
+        connections = [(name, comp.name + '.' + name) for name in inputs if name in top_inputs]
+        connections += [(comp.name + '.' + name, name) for name in outputs if name in top_outputs]
+
+        for src, dst in connections:
+            if dst in connected:
+                continue
+            try:
+                top.connect(src, dst)
+            except Exception as e:
+                failed[(src, dst)] = str(e)
+            else:
+                connected.add(dst)
+
+        unmatched[comp.name] = [name for name in inputs if comp.name + '.' + name not in connected]
+
+    return unmatched, failed
 
 
 def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, with_3pt_drive=False):
@@ -88,7 +119,7 @@ def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, wit
     assembly.add('tower_wall_thickness', Array(iotype='out', units='m', desc='Tower wall thickness'))
     assembly.add('tower_mass', Float(iotype='out', units='kg', desc='Tower mass'))
 
-    assembly.add('tsr', Float(iotype='in', units='m', desc='Design tip speed ratio', group='Aero'))
+    assembly.add('tsr', Float(iotype='in', desc='Design tip speed ratio', group='Aero'))
     assembly.add('F', Float(iotype='in', desc='Rotor power loss factor', group='Aero'))
 
     assembly.add('wohler_exponent_blade_flap', Float(iotype='in', desc='Wohler Exponent blade flap', group='Rotor'))
@@ -113,7 +144,7 @@ def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, wit
 
     assembly.add('blade_sections', Int(iotype='in', desc='number of sections along blade', group='Rotor'))
     assembly.add('wohler_exponent_blade_flap', Float(iotype='in', desc='Blade flap fatigue Wohler exponent', group='Rotor'))
-    assembly.add('MaxChordrR', Float(iotype='in', units='m', desc='Spanwise position of maximum chord', group='Rotor'))
+    assembly.add('MaxChordrR', Float(iotype='in', desc='Spanwise position of maximum chord', group='Rotor'))
     assembly.add('tif_blade_root_flap_ext', Float(1., iotype='in', desc='Technology improvement factor flap extreme', group='Rotor'))
     assembly.add('tif_blade_root_edge_ext', Float(1., iotype='in', desc='Technology improvement factor edge extreme', group='Rotor'))
     assembly.add('tif_blade_root_flap_fat', Float(1., iotype='in', desc='Technology improvement factor flap LEQ', group='Rotor'))
@@ -147,6 +178,11 @@ def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, wit
     # END SEAM Variables ----------------------
 
     # Add SEAM components and connections
+    from SEAMLoads.SEAMLoads import SEAMLoads
+    from SEAMTower.SEAMTower import SEAMTower
+    from SEAMAero.SEAM_AEP import SEAM_PowerCurve
+    from SEAMRotor.SEAMRotor import SEAMBladeStructure
+    # from SEAMGeometry.SEAMGeometry import SEAMGeometry
     assembly.add('loads', SEAMLoads())
     assembly.add('tower_design', SEAMTower(21))
     assembly.add('blade_design', SEAMBladeStructure())
@@ -161,22 +197,31 @@ def configure_turbine(assembly, with_new_nacelle=True, flexible_blade=False, wit
     assembly.connect('loads.blade_root_flap_leq', 'blade_design.blade_root_flap_leq')
     assembly.connect('loads.blade_root_edge_leq', 'blade_design.blade_root_edge_leq')
 
-    connect_io(assembly, assembly.aep_calc)
-    connect_io(assembly, assembly.loads)
-    connect_io(assembly, assembly.tower_design)
-    connect_io(assembly, assembly.blade_design)
+    unmatched, failed = connect_io(assembly, [assembly.aep_calc, assembly.loads, assembly.tower_design,
+                                              assembly.blade_design])
+    for (src, dst), error in failed.items():
+        assembly._logger.warning('connection %s -> %s rejected: %s' % (src, dst, error))
+    for name, inputs in unmatched.items():
+        if inputs:
+            assembly._logger.warning('%s inputs not connected, they keep their own values: %s'
+                                     % (name, ', '.join(inputs)))
 
     # End SEAM add components and connections -------------
 
 
     if with_new_nacelle:
+        from drivese.hub import HubSE, Hub_System_Adder_drive
         assembly.add('hub',HubSE())
         assembly.add('hubSystem',Hub_System_Adder_drive())
         if with_3pt_drive:
+            from drivese.drive import Drive3pt
             assembly.add('nacelle', Drive3pt())
         else:
+            from drivese.drive import Drive4pt
             assembly.add('nacelle', Drive4pt())
     else:
+        from drivewpact.drive import DriveWPACT
+        from drivewpact.hub import HubWPACT
         assembly.add('nacelle', DriveWPACT())
         assembly.add('hub', HubWPACT())
 
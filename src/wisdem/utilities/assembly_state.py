@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+assembly_state.py
+
+Reuse of configured OpenMDAO assemblies: snapshot the unconnected inputs of an
+assembly (and of everything inside it) right after configuration, put them back
+before the next case, or clone the whole configured assembly through pickle.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import copy
+from collections import OrderedDict
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import numpy as np
+
+from wisdem.utilities.variables import input_paths
+
+
+def snapshot_inputs(assembly):
+    """OrderedDict of path -> deep copy of the value of every unconnected input"""
+
+    return OrderedDict((path, copy.deepcopy(assembly.get(path))) for path in input_paths(assembly))
+
+
+def _equal(a, b):
+
+    if hasattr(a, 'list_vars') and hasattr(b, 'list_vars'):  # variable trees, member by member
+        names = sorted(a.list_vars())
+        return names == sorted(b.list_vars()) and all(_equal(getattr(a, n), getattr(b, n)) for n in names)
+
+    try:
+        if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+            return np.shape(a) == np.shape(b) and np.array_equal(a, b)
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def restore_inputs(assembly, snapshot):
+    """set the inputs back to a snapshot
+
+    Only inputs whose value differs from the snapshot are set, so components that
+    were not touched stay valid and are not rerun.
+
+    Returns
+    -------
+    changed : list of str
+        paths that were reset
+
+    """
+
+    changed = []
+    for path, value in snapshot.items():
+        if not _equal(assembly.get(path), value):
+            assembly.set(path, copy.deepcopy(value))
+            changed.append(path)
+
+    return changed
+
+
+def clone_assembly(assembly):
+    """independent copy of a configured assembly through a pickle round trip"""
+
+    return pickle.loads(pickle.dumps(assembly, pickle.HIGHEST_PROTOCOL))
+
+
+class AssemblyCache(object):
+    """configured assemblies keyed on their configuration arguments
+
+    The first get for a key calls factory(*key) and snapshots the inputs of the
+    result; later gets restore that snapshot and return the same assembly, so each
+    case starts from the configured state without paying for configure again.
+
+    Parameters
+    ----------
+    factory : callable
+        builds and initializes an assembly from the key arguments
+    maxsize : int
+        number of configurations kept (least recently used dropped), None for no limit
+
+    """
+
+    def __init__(self, factory, maxsize=None):
+        self.factory = factory
+        self.maxsize = maxsize
+        self.builds = 0
+        self._entries = OrderedDict()
+
+    def get(self, *key):
+
+        entry = self._entries.pop(key, None)
+
+        if entry is None:
+            assembly = self.factory(*key)
+            entry = (assembly, snapshot_inputs(assembly))
+            self.builds += 1
+        else:
+            restore_inputs(*entry)
+
+        self._entries[key] = entry
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return entry[0]
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+checkpoint.py
+
+Checkpoint and resume of ScipyOptimizer runs.  Every function and gradient evaluation
+is written to a checkpoint file as it completes; a restarted run replays them from the
+file, so the optimizer walks through the completed iterations again (rebuilding its
+internal state, e.g. the SLSQP Hessian approximation) without running the model, and
+continues from where the interrupted run stopped.  The file is removed when the run
+finishes.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import tempfile
+from collections import OrderedDict
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import numpy as np
+
+from openmdao.util.record_util import update_local_meta
+
+from wisdem.utilities.parallel_fd import FDScipyOptimizer
+from wisdem.utilities.result_cache import hash_inputs
+
+
+def _key(x):
+    return np.asarray(x, dtype=float).tobytes()
+
+
+def _write(filename, data):
+    # write to a temporary name and rename into place, so a crash never leaves a partial file
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+    if os.name == 'nt' and os.path.exists(filename):
+        os.remove(filename)
+    os.rename(tmp, filename)
+
+
+class CheckpointScipyOptimizer(FDScipyOptimizer):
+    """FDScipyOptimizer that checkpoints its evaluations and resumes from them
+
+    Parameters
+    ----------
+    checkpoint_file : str
+        checkpoint written after each function and gradient evaluation; if it exists
+        when the driver runs, its evaluations are replayed.  None disables checkpointing.
+    keep_checkpoint : bool
+        keep the file when the run finishes; by default it is removed, so only an
+        interrupted run leaves one behind
+
+    Notes
+    -----
+    The replay relies on the optimizer being deterministic: given the same function
+    and gradient values it proposes the same design vectors, which are looked up
+    exactly.  A point that is not in the checkpoint (e.g. after a scipy upgrade) is
+    simply evaluated.  Replayed iterations are not sent to the recorders again.
+
+    A checkpoint written for other design variables, objectives or constraints, another
+    initial design or other model inputs (every root param and unknown that is not a
+    design variable, as they are when the driver starts) raises ValueError; delete it
+    to start over.
+    """
+
+    def __init__(self, checkpoint_file=None, keep_checkpoint=False):
+        super(CheckpointScipyOptimizer, self).__init__()
+        self.checkpoint_file = checkpoint_file
+        self.keep_checkpoint = keep_checkpoint
+        self.evaluations = OrderedDict()  # key -> (x, objective, constraints)
+        self.gradients = OrderedDict()  # key -> (x, gradient)
+        self.last_x = None
+        self.replayed = 0
+        self._model_key = None
+        self._run_signature = None
+
+    # --- checkpoint file ---
+
+    def _model_inputs(self):
+
+        desvars = set(self._desvars.keys())
+        values = OrderedDict()
+        for kind, vec in [('params', self.root.params), ('unknowns', self.root.unknowns)]:
+            for name in vec.keys():
+                if name not in desvars:
+                    values[kind + ':' + name] = vec[name]
+
+        return values
+
+    def _signature(self):
+        # called when the driver starts, before it runs the model
+
+        desvars = [(name, meta['size']) for name, meta in self.get_desvar_metadata().items()]
+
+        return OrderedDict([('optimizer', self.options['optimizer']),
+                            ('desvars', desvars),
+                            ('objectives', list(self._objs.keys())),
+                            ('constraints', list(self._cons.keys())),
+                            ('initial_x', self._current_x().tolist()),
+                            ('model_inputs', hash_inputs(self._model_inputs()))])
+
+    def save_checkpoint(self):
+
+        if self.checkpoint_file is None:
+            return
+
+        _write(self.checkpoint_file, {'signature': self._run_signature,
+                                      'evaluations': list(self.evaluations.values()),
+                                      'gradients': list(self.gradients.values()),
+                                      'last_x': self.last_x})
+
+    def load_checkpoint(self):
+
+        with open(self.checkpoint_file, 'rb') as f:
+            data = pickle.load(f)
+
+        if data['signature'] != self._run_signature:
+            raise ValueError('checkpoint %s was written for a different optimization problem'
+                             % self.checkpoint_file)
+
+        self.evaluations = OrderedDict((_key(entry[0]), entry) for entry in data['evaluations'])
+        self.gradients = OrderedDict((_key(entry[0]), entry) for entry in data['gradients'])
+        self.last_x = data['last_x']
+
+    # --- driver ---
+
+    def _current_x(self):
+        return np.concatenate([np.ravel(value) for value in self.get_desvars().values()])
+
+    def _move_model(self, x):
+        # run the model at x, without counting an iteration or recording it
+
+        i = 0
+        for name, meta in self.get_desvar_metadata().items():
+            size = meta['size']
+            self.set_desvar(name, x[i:i+size])
+            i += size
+
+        with self.root._dircontext:
+            self.root.solve_nonlinear(metadata=self.metadata)
+
+        self._model_key = _key(x)
+
+    def run(self, problem):
+
+        self.replayed = 0
+        self._run_signature = self._signature()
+        if self.checkpoint_file is not None and os.path.exists(self.checkpoint_file):
+            self.load_checkpoint()
+        else:
+            self.evaluations.clear()
+            self.gradients.clear()
+
+        # the initial run in ScipyOptimizer.run solves the model at the current design
+        self._model_key = _key(self._current_x())
+
+        super(CheckpointScipyOptimizer, self).run(problem)
+
+        # leave the model at the optimum, which may have come from the checkpoint
+        result = getattr(self, 'result', None)
+        if result is not None and _key(result.x) != self._model_key:
+            self._move_model(result.x)
+
+        if self.checkpoint_file is not None and not self.keep_checkpoint and os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+
+    def _objfunc(self, x_new):
+
+        key = _key(x_new)
+        self.last_x = np.array(x_new, dtype=float)
+
+        if key in self.evaluations:
+            x, f, cons = self.evaluations[key]
+            self.con_cache = OrderedDict((name, np.array(value)) for name, value in cons.items())
+            self.iter_count += 1
+            update_local_meta(self.metadata, (self.iter_count,))
+            self.replayed += 1
+            return np.array(f)
+
+        f = super(CheckpointScipyOptimizer, self)._objfunc(x_new)
+        if getattr(self, '_exc_info', None) is not None:
+            return f  # the model raised, ScipyOptimizer re-raises it when the optimizer returns
+        self._model_key = key
+
+        # the objective and constraints may be views of the unknowns vector
+        cons = OrderedDict((name, np.array(value)) for name, value in self.con_cache.items())
+        self.evaluations[key] = (self.last_x, np.array(f), cons)
+        self.save_checkpoint()
+
+        return f
+
+    def _gradfunc(self, x_new):
+
+        key = _key(x_new)
+
+        if key in self.gradients:
+            self.grad_cache = np.array(self.gradients[key][1])
+            return self.grad_cache[0, :]
+
+        if key != self._model_key:  # the function value at x_new came from the checkpoint
+            self._move_model(x_new)
+
+        grad = super(CheckpointScipyOptimizer, self)._gradfunc(x_new)
+        if getattr(self, '_exc_info', None) is not None:
+            return grad
+
+        self.gradients[key] = (np.array(x_new, dtype=float), np.array(self.grad_cache))
+        self.save_checkpoint()
+
+        return grad
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+complex_step.py
+
+Complex-step derivatives for OpenMDAO groups, chosen component by component.  A
+component is switched to complex step only if a trial derivative with complex inputs
+agrees with central finite differences in every output; the others keep central
+finite differences.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import warnings
+
+import numpy as np
+try:
+    from numpy.exceptions import ComplexWarning
+except ImportError:  # numpy < 1.25
+    from numpy import ComplexWarning
+
+from openmdao.api import Component, IndepVarComp
+
+
+CS_STEP = 1e-30
+FD_STEP = 1e-6
+
+
+def _is_real(value):
+
+    if isinstance(value, np.ndarray):
+        return value.dtype.kind == 'f'
+
+    return isinstance(value, float)
+
+
+def _complex_copy(vec, direction=None, step=0.0):
+    """dict of the entries of vec with the real floats made complex, and perturbed by
+    i*step*direction[name] for the entries in direction"""
+
+    copy = {}
+    for name in vec.keys():
+        value = vec[name]
+        if _is_real(value):
+            value = np.array(value, dtype=complex)
+            if direction is not None and name in direction:
+                value = value + 1j*step*direction[name]
+            if value.ndim == 0:
+                value = complex(value)
+        elif isinstance(value, np.ndarray):
+            value = value.copy()
+        copy[name] = value
+
+    return copy
+
+
+def _real_copy(vec, direction=None, step=0.0):
+    """dict of the entries of vec, with the real floats shifted by step*direction[name]"""
+
+    copy = {}
+    for name in vec.keys():
+        value = vec[name]
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+        if direction is not None and name in direction:
+            value = value + step*direction[name]
+        copy[name] = value
+
+    return copy
+
+
+def _outputs(comp, unknowns):
+    # real outputs of a trial run as flat arrays
+
+    return dict((name, np.ravel(unknowns[name])) for name in comp.unknowns.keys()
+                if _is_real(comp.unknowns[name]))
+
+
+def has_linearize(comp):
+    """True if the component provides its own analytic linearize"""
+
+    for klass in type(comp).__mro__:
+        if klass is Component:
+            return False
+        if 'linearize' in klass.__dict__:
+            return True
+
+    return False
+
+
+def supports_complex_step(comp, rtol=1e-4):
+    """trial complex-step derivative of comp.solve_nonlinear, checked against finite differences
+
+    The component must already be set up, with its inputs at a representative point.
+    All real inputs are moved together along one random direction (scaled by their
+    magnitude), and the complex-step derivative of every output along it must match
+    central finite differences.  An output that drops the imaginary part (abs, max, a
+    cast to float) or any error, ComplexWarning or non-finite value disqualifies the
+    component.  The component is run with its real vectors again afterwards, so it
+    keeps no complex state.
+    """
+
+    rng = np.random.RandomState(0)
+    direction = {}
+    for name in comp.params.keys():
+        value = comp.params[name]
+        if _is_real(value):
+            direction[name] = rng.uniform(0.5, 1.0, np.shape(value))*np.maximum(np.abs(value), 1.0)
+
+    if not direction:
+        return False
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', ComplexWarning)
+            try:
+                unknowns = _complex_copy(comp.unknowns)
+                comp.solve_nonlinear(_complex_copy(comp.params, direction, CS_STEP), unknowns,
+                                     _complex_copy(comp.resids))
+                cs = _outputs(comp, unknowns)
+
+                fd = []
+                for sign in [1.0, -1.0]:
+                    unknowns = _real_copy(comp.unknowns)
+                    comp.solve_nonlinear(_real_copy(comp.params, direction, sign*FD_STEP), unknowns,
+                                         _real_copy(comp.resids))
+                    fd.append(_outputs(comp, unknowns))
+            except Exception:
+                return False
+
+    finally:
+        comp.solve_nonlinear(comp.params, comp.unknowns, comp.resids)
+
+    for name, value in cs.items():
+        if not np.all(np.isfinite(value)):
+            return False
+        d_cs = np.imag(value)/CS_STEP
+        d_fd = (np.real(fd[0][name]) - np.real(fd[1][name]))/(2.0*FD_STEP)
+        if value.size == 0:
+            continue
+        # round-off of the finite difference grows with the size of the output
+        atol = rtol*max(np.max(np.abs(d_fd)), 1.0) + 1e-8*np.max(np.abs(np.real(value)))
+        if not np.allclose(d_cs, d_fd, rtol=rtol, atol=atol):
+            return False
+
+    return True
+
+
+def _set_deriv_options(system, options):
+    # the derivative type is locked once the problem is set up, but below the root it
+    # is only read when derivatives are computed, so it can still be changed
+
+    locked = system.deriv_options.locked
+    system.deriv_options.locked = False
+    try:
+        for name, value in options:
+            system.deriv_options[name] = value
+    finally:
+        system.deriv_options.locked = locked
+
+
+def use_complex_step(group, form='central', step_size=1e-5, step_calc='relative'):
+    """complex-step derivatives for every capable component in group
+
+    Subgroups that were finite differenced as a whole are switched to the derivatives
+    of their components.  Components with an analytic linearize keep it, those that
+    pass supports_complex_step use complex step, and the rest fall back to finite
+    differences with the given form, step_size and step_calc.  Call after setup and
+    after the inputs have been initialized.  The root's derivative vectors are only
+    allocated if its type is 'user' at setup, so a finite differenced root raises.
+
+    Returns
+    -------
+    types : dict
+        pathname -> derivative type chosen for each component
+
+    """
+
+    if group.pathname == '' and group.deriv_options['type'] != 'user':
+        raise RuntimeError("the root group is set up with deriv_options['type'] = '%s', "
+                           "set it to 'user' before setup to use complex step" % group.deriv_options['type'])
+
+    for system in [group] + list(group.subgroups(recurse=True)):
+        if system.deriv_options['type'] != 'user':
+            _set_deriv_options(system, [('type', 'user')])
+
+    types = {}
+    for comp in group.components(recurse=True):
+        if isinstance(comp, IndepVarComp) or has_linearize(comp):
+            continue
+
+        if supports_complex_step(comp):
+            _set_deriv_options(comp, [('type', 'cs'), ('step_size', CS_STEP), ('step_calc', 'absolute')])
+        else:
+            _set_deriv_options(comp, [('type', 'fd'), ('form', form), ('step_size', step_size),
+                                      ('step_calc', step_calc)])
+
+        types[comp.pathname] = comp.deriv_options['type']
+
+    return types
@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+parallel_fd.py
+
+Finite-difference Jacobians whose perturbed model evaluations run on a process pool,
+and a ScipyOptimizer that uses them for its gradients.  Columns that touch disjoint
+sets of outputs can be perturbed together (sparsity detection plus column coloring).
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import multiprocessing
+from collections import OrderedDict
+
+import numpy as np
+
+from openmdao.api import ScipyOptimizer
+
+
+# problem built once per worker process by the factory passed to FiniteDifferenceJacobian
+_worker_problem = None
+
+
+def _init_worker(factory):
+
+    global _worker_problem
+    _worker_problem = factory()
+
+
+def _evaluate(prob, x, perturbations, of):
+    """outputs `of` of `prob` with x applied and x[name][index] shifted by delta
+    for every (name, index, delta) in perturbations"""
+
+    values = OrderedDict((key, np.array(value, dtype=float)) for key, value in x.items())
+    for name, index, delta in perturbations:
+        values[name].flat[index] += delta
+
+    for key, value in values.items():
+        prob[key] = value if value.ndim > 0 else float(value)
+
+    prob.run_once()
+
+    return np.concatenate([np.array(prob[key], dtype=float).ravel() for key in of])
+
+
+def _evaluate_task(task):
+    return _evaluate(_worker_problem, *task)
+
+
+def fd_step(value, step_size, step_calc):
+    """step used for one entry, as in OpenMDAO: relative steps are the value times step_size,
+    but never smaller than step_size"""
+
+    if step_calc == 'relative':
+        step = value*step_size
+        if step < step_size:
+            step = step_size
+        return step
+
+    return step_size
+
+
+def color_columns(pattern):
+    """group the columns of a sparsity pattern so that no two columns in a group share a row
+
+    Greedy coloring, visiting the densest columns first.
+
+    Parameters
+    ----------
+    pattern : ndarray of bool, shape (nrow, ncol)
+
+    Returns
+    -------
+    colors : list of ndarray
+        column indices perturbed together, one array per color
+
+    """
+
+    pattern = np.asarray(pattern, dtype=bool)
+    ncol = pattern.shape[1]
+    order = np.argsort(-pattern.sum(axis=0), kind='mergesort')
+
+    colors = []
+    rows_used = []
+    for col in order:
+        for k in range(len(colors)):
+            if not np.any(rows_used[k] & pattern[:, col]):
+                colors[k].append(col)
+                rows_used[k] |= pattern[:, col]
+                break
+        else:
+            colors.append([col])
+            rows_used.append(pattern[:, col].copy())
+
+    return [np.array(sorted(c), dtype=int) for c in colors] if ncol > 0 else []
+
+
+class FiniteDifferenceJacobian(object):
+    """forward or central finite differences with the perturbed runs spread over processes
+
+    Each worker builds its own copy of the problem once, through `factory`, which must
+    be a module-level function returning a set-up Problem whose inputs are initialized.
+    Every perturbed run sets all design variables to the requested point, so the
+    result does not depend on which worker (or how many) ran it, and processes=0
+    evaluates the same tasks serially in this process with bit-identical results.
+
+    Parameters
+    ----------
+    factory : callable
+        returns a fresh, set-up Problem
+    step_size : float
+    form : str
+        'central' or 'forward'
+    step_calc : str
+        'relative' or 'absolute'
+    processes : int
+        number of worker processes, None for one per cpu, 0 for serial
+    coloring : bool
+        detect the sparsity pattern on the first call for each (wrt, of) and from then on
+        perturb structurally orthogonal columns together
+    sparsity_samples : int
+        randomly scattered design points, in addition to x, used to detect the pattern
+    redetect_interval : int
+        the pattern is detected again at the current point after this many uses and
+        merged with the old one (None to keep the first pattern)
+
+    Notes
+    -----
+    An entry is taken as structurally zero only if it is exactly zero in the full
+    Jacobian at x and at each scattered point, so unrelated outputs (which come out
+    bit-identical) drop out while noisy entries stay in the pattern.  An entry that
+    vanishes at all of those points but not along the optimization path is picked up
+    by the next detection; patterns only ever grow.
+
+    """
+
+    def __init__(self, factory, step_size=1e-5, form='central', step_calc='relative', processes=None,
+                 coloring=False, sparsity_samples=1, redetect_interval=10):
+        self.factory = factory
+        self.step_size = step_size
+        self.form = form
+        self.step_calc = step_calc
+        self.processes = processes
+        self.coloring = coloring
+        self.sparsity_samples = sparsity_samples
+        self.redetect_interval = redetect_interval
+        self.evaluations = 0
+        self.patterns = {}
+        self.colors = {}
+        self._uses = {}
+        self._pool = None
+        self._problem = None
+
+    def _map(self, tasks):
+
+        self.evaluations += len(tasks)
+
+        if self.processes == 0:
+            if self._problem is None:
+                self._problem = self.factory()
+            return [_evaluate(self._problem, *task) for task in tasks]
+
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.processes, initializer=_init_worker, initargs=(self.factory,))
+
+        return self._pool.map(_evaluate_task, tasks)
+
+    def _columns(self, x, wrt):
+        # (name, index, step) of every column
+
+        columns = []
+        for name in wrt:
+            for index in range(x[name].size):
+                columns.append((name, index, fd_step(x[name].flat[index], self.step_size, self.step_calc)))
+
+        return columns
+
+    def _differences(self, x, groups, of):
+        # difference quotient numerators for each group of simultaneously perturbed columns
+
+        tasks = []
+        for group in groups:
+            tasks.append((x, [(name, index, h) for name, index, h in group], of))
+            if self.form == 'central':
+                tasks.append((x, [(name, index, -h) for name, index, h in group], of))
+
+        if self.form != 'central':
+            tasks.append((x, [], of))
+
+        results = self._map(tasks)
+
+        if self.form == 'central':
+            return [results[2*k] - results[2*k+1] for k in range(len(groups))]
+
+        return [results[k] - results[-1] for k in range(len(groups))]
+
+    def _dense(self, x, wrt, of):
+
+        columns = self._columns(x, wrt)
+        diffs = self._differences(x, [[c] for c in columns], of)
+        denom = 2.0 if self.form == 'central' else 1.0
+
+        return np.column_stack([d/(denom*c[2]) for d, c in zip(diffs, columns)])
+
+    def sparsity(self, x, wrt, of):
+        """boolean pattern of d(of)/d(wrt) from dense Jacobians at x and at scattered points"""
+
+        x = OrderedDict((key, np.array(value, dtype=float)) for key, value in x.items())
+        pattern = self._dense(x, wrt, of) != 0.0
+
+        # the scatter is partly absolute, so entries of x at zero move too
+        rng = np.random.RandomState(0)
+        for i in range(self.sparsity_samples):
+            xs = OrderedDict()
+            for key, value in x.items():
+                scatter = 0.01*rng.uniform(-1.0, 1.0, value.shape)*np.maximum(np.abs(value), 1.0)
+                xs[key] = value + scatter if key in wrt else value
+            pattern |= self._dense(xs, wrt, of) != 0.0
+
+        return pattern
+
+    def pattern(self, x, wrt, of):
+        """sparsity pattern for (wrt, of), detected at x the first time it is needed and
+        again every redetect_interval uses"""
+
+        key = (tuple(wrt), tuple(of))
+
+        if key not in self.patterns:
+            self.patterns[key] = self.sparsity(x, wrt, of)
+            self._uses[key] = 0
+
+        elif self.redetect_interval is not None and self._uses.get(key, 0) >= self.redetect_interval:
+            pattern = self.patterns[key] | self.sparsity(x, wrt, of)
+            if np.any(pattern != self.patterns[key]):
+                self.patterns[key] = pattern
+                self.colors.pop(key, None)
+            self._uses[key] = 0
+
+        self._uses[key] = self._uses.get(key, 0) + 1
+
+        return self.patterns[key]
+
+    def jacobian(self, x, wrt, of, colored=None):
+        """d(of)/d(wrt) at design point x
+
+        Parameters
+        ----------
+        x : dict
+            name -> value of every design variable
+        wrt : list of str
+            variables to differentiate with respect to (keys of x)
+        of : list of str
+            outputs to differentiate
+        colored : bool
+            use the column coloring, defaults to the coloring option
+
+        Returns
+        -------
+        J : ndarray, shape (total size of of, total size of wrt)
+
+        """
+
+        x = OrderedDict((key, np.array(value, dtype=float)) for key, value in x.items())
+
+        if colored is None:
+            colored = self.coloring
+        if not colored:
+            return self._dense(x, wrt, of)
+
+        key = (tuple(wrt), tuple(of))
+        pattern = self.pattern(x, wrt, of)
+        if key not in self.colors:
+            self.colors[key] = color_columns(pattern)
+
+        columns = self._columns(x, wrt)
+        diffs = self._differences(x, [[columns[col] for col in color] for color in self.colors[key]], of)
+        denom = 2.0 if self.form == 'central' else 1.0
+
+        J = np.zeros(pattern.shape)
+        for color, d in zip(self.colors[key], diffs):
+            for col in color:
+                rows = pattern[:, col]
+                J[rows, col] = d[rows]/(denom*columns[col][2])
+
+        return J
+
+    def close(self):
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+class FDScipyOptimizer(ScipyOptimizer):
+    """ScipyOptimizer that takes its gradients from a FiniteDifferenceJacobian
+
+    Assign the engine to `fd_engine`; without one the usual OpenMDAO derivatives are used.
+    The driver's own problem is not touched while the gradient is computed.
+
+    With a coloring engine, an output with a row that depends on more than half of the
+    design variables (typically the objective) cannot be compressed, and finite
+    differences of it need every column perturbed on its own.  The remaining outputs
+    are colored and only the dense ones are differenced column by column on the pool.
+    If the model's own derivatives of the dense outputs are cheap (analytic, or complex
+    step, see use_complex_step) set `dense_from_model` to take them from the model instead.
+    """
+
+    def __init__(self):
+        super(FDScipyOptimizer, self).__init__()
+        self.fd_engine = None
+        self.dense_from_model = False
+
+    def calc_gradient(self, indep_list, unknown_list, mode='auto', return_format='array',
+                      sparsity=None, inactives=None):
+
+        if self.fd_engine is None:
+            return super(FDScipyOptimizer, self).calc_gradient(indep_list, unknown_list, mode=mode,
+                                                               return_format=return_format,
+                                                               sparsity=sparsity, inactives=inactives)
+
+        desvars = list(self._desvars.keys())
+        x = OrderedDict((name, self.root.unknowns[name]) for name in desvars)
+        wrt = list(indep_list)
+        of = list(unknown_list)
+
+        col_sizes = [np.size(x[name]) for name in indep_list]
+        row_sizes = [np.size(self.root.unknowns[name]) for name in unknown_list]
+        col_offsets = np.concatenate([[0], np.cumsum(col_sizes)])
+        row_offsets = np.concatenate([[0], np.cumsum(row_sizes)])
+
+        dense = []
+        if getattr(self.fd_engine, 'coloring', False):
+            pattern = self.fd_engine.pattern(x, wrt, of)
+            counts = pattern.sum(axis=1)
+            dense = [name for i, name in enumerate(of)
+                     if np.any(counts[row_offsets[i]:row_offsets[i+1]] > 0.5*pattern.shape[1])]
+
+        sparse = [name for name in of if name not in dense]
+        sparse_rows = np.concatenate([np.arange(row_offsets[i], row_offsets[i+1], dtype=int)
+                                      for i, name in enumerate(of) if name in sparse] + [np.zeros(0, dtype=int)])
+        dense_rows = np.setdiff1d(np.arange(row_offsets[-1]), sparse_rows)
+
+        J = np.zeros((row_offsets[-1], col_offsets[-1]))
+        if sparse:
+            if dense:
+                self.fd_engine.patterns.setdefault((tuple(wrt), tuple(sparse)), pattern[sparse_rows])
+            J[sparse_rows] = self.fd_engine.jacobian(x, wrt, sparse)
+        if dense and not self.dense_from_model:
+            J[dense_rows] = self.fd_engine.jacobian(x, wrt, dense, colored=False)
+
+        # apply the driver scaling, as Driver.calc_gradient does
+        dv_scale = getattr(self, 'dv_conversions', {})
+        fn_scale = getattr(self, 'fn_conversions', {})
+
+        for i, name in enumerate(indep_list):
+            if name in dv_scale:
+                J[:, col_offsets[i]:col_offsets[i+1]] *= dv_scale[name]
+        for i, name in enumerate(unknown_list):
+            if name in fn_scale:
+                J[row_offsets[i]:row_offsets[i+1], :] *= fn_scale[name]
+
+        if dense and self.dense_from_model:
+            # already scaled by the base class
+            J[dense_rows] = super(FDScipyOptimizer, self).calc_gradient(wrt, dense, mode=mode, return_format='array')
+
+        if return_format == 'dict':
+            Jdict = OrderedDict()
+            for i, out in enumerate(unknown_list):
+                Jdict[out] = OrderedDict()
+                for j, dv in enumerate(indep_list):
+                    Jdict[out][dv] = J[row_offsets[i]:row_offsets[i+1], col_offsets[j]:col_offsets[j+1]]
+            return Jdict
+
+        return J
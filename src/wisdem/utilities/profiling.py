@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+profiling.py
+
+Opt-in timing of the components of an assembly or group: wall time and call count
+of every execute (OpenMDAO 0.x) or solve_nonlinear (OpenMDAO 1.x), with the calls made
+while finite differencing counted apart, and the time spent in analytic derivatives.
+
+    with ComponentProfiler(lcoe_se) as profiler:
+        lcoe_se.run()
+    print(profiler.report())
+    profiler.write_json('profile.json')
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import json
+import time
+from collections import OrderedDict
+
+
+FIELDS = ('calls', 'time', 'fd_calls', 'fd_time', 'deriv_calls', 'deriv_time')
+
+
+def _leaf_components(container, prefix=''):
+    # (path, component) of the leaf components below an OpenMDAO 0.x assembly
+
+    leaves = []
+    for name in sorted(container.list_containers()):
+        child = getattr(container, name)
+        if not hasattr(child, 'run'):
+            continue  # variable trees
+        if hasattr(child, 'list_connections'):
+            leaves.extend(_leaf_components(child, prefix + name + '.'))
+        elif not hasattr(child, 'workflow'):  # drivers run other components
+            leaves.append((prefix + name, child))
+
+    return leaves
+
+
+def _drivers(container):
+    # every driver below (and including) an OpenMDAO 0.x assembly
+
+    drivers = []
+    for name in sorted(container.list_containers()):
+        child = getattr(container, name)
+        if hasattr(child, 'workflow'):
+            drivers.append(child)
+        elif hasattr(child, 'list_connections'):
+            drivers.extend(_drivers(child))
+
+    return drivers
+
+
+class ComponentProfiler(object):
+    """per-component timing, installed by start (or entering a with block) and removed by stop
+
+    Parameters
+    ----------
+    root : Assembly or Group
+        OpenMDAO 0.x assembly or OpenMDAO 1.x group (e.g. prob.root); the components
+        are looked up when the profiler starts, so start it after configuration/setup
+
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.stats = OrderedDict()
+        self.wall = 0.0
+        self._patched = []
+        self._fd_depth = 0
+        self._start = None
+
+    # --- installation ---
+
+    def _patch(self, obj, name, wrapper):
+
+        original = getattr(obj, name)
+        self._patched.append((obj, name, name in obj.__dict__, original))
+        setattr(obj, name, wrapper(original))
+
+    def _timed(self, path, calls, seconds, count_fd=True):
+
+        def wrapper(method):
+            def timed(*args, **kwargs):
+                fd = count_fd and self._fd_depth > 0
+                t0 = time.time()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    entry = self.stats[path]
+                    entry['fd_' + calls if fd else calls] += 1
+                    entry['fd_' + seconds if fd else seconds] += time.time() - t0
+            return timed
+
+        return wrapper
+
+    def _fd_context(self, method):
+
+        def fd(*args, **kwargs):
+            self._fd_depth += 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._fd_depth -= 1
+
+        return fd
+
+    def _deriv(self, path):
+
+        def wrapper(method):
+            def timed(*args, **kwargs):
+                t0 = time.time()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self.stats[path]['deriv_calls'] += 1
+                    self.stats[path]['deriv_time'] += time.time() - t0
+            return timed
+
+        return wrapper
+
+    def start(self):
+
+        if hasattr(self.root, 'components'):  # OpenMDAO 1.x group
+            for comp in self.root.components(recurse=True):
+                self.stats.setdefault(comp.pathname, dict.fromkeys(FIELDS, 0))
+                self._patch(comp, 'solve_nonlinear', self._timed(comp.pathname, 'calls', 'time'))
+                self._patch(comp, 'linearize', self._deriv(comp.pathname))
+            for system in [self.root] + list(self.root.subgroups(recurse=True)) + list(self.root.components(recurse=True)):
+                for name in ('fd_jacobian', 'complex_step_jacobian'):
+                    if hasattr(system, name):
+                        self._patch(system, name, self._fd_context)
+        else:  # OpenMDAO 0.x assembly
+            for path, comp in _leaf_components(self.root):
+                self.stats.setdefault(path, dict.fromkeys(FIELDS, 0))
+                self._patch(comp, 'execute', self._timed(path, 'calls', 'time'))
+                if hasattr(comp, 'provideJ'):
+                    self._patch(comp, 'provideJ', self._deriv(path))
+            for driver in _drivers(self.root):
+                if hasattr(driver.workflow, 'calc_gradient'):
+                    self._patch(driver.workflow, 'calc_gradient', self._fd_context)
+
+        self._start = time.time()
+
+        return self
+
+    def stop(self):
+
+        if self._start is not None:
+            self.wall += time.time() - self._start
+            self._start = None
+
+        for obj, name, own, original in reversed(self._patched):
+            if own:
+                setattr(obj, name, original)
+            else:
+                delattr(obj, name)
+        self._patched = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset(self):
+
+        for entry in self.stats.values():
+            entry.update(dict.fromkeys(FIELDS, 0))
+        self.wall = 0.0
+
+    # --- output ---
+
+    def _total(self, entry):
+        return entry['time'] + entry['fd_time'] + entry['deriv_time']
+
+    def summary(self):
+        """JSON-serializable dict: wall time and the per-component counters, slowest first"""
+
+        ordered = sorted(self.stats.items(), key=lambda item: -self._total(item[1]))
+
+        return OrderedDict([('wall_time', self.wall),
+                            ('components', OrderedDict((path, dict(entry, total_time=self._total(entry)))
+                                                       for path, entry in ordered))])
+
+    def write_json(self, filename):
+
+        with open(filename, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def report(self, limit=None):
+        """table of the components sorted by total time"""
+
+        summary = self.summary()
+        wall = summary['wall_time']
+
+        lines = ['%-40s %8s %10s %8s %10s %8s %10s %6s' % ('component', 'calls', 'time (s)', 'fd calls',
+                                                            'fd (s)', 'derivs', 'deriv (s)', '%')]
+        for i, (path, entry) in enumerate(summary['components'].items()):
+            if limit is not None and i >= limit:
+                break
+            share = 100.0*entry['total_time']/wall if wall > 0 else 0.0
+            lines.append('%-40s %8d %10.4f %8d %10.4f %8d %10.4f %6.1f' % (
+                path, entry['calls'], entry['time'], entry['fd_calls'], entry['fd_time'],
+                entry['deriv_calls'], entry['deriv_time'], share))
+        lines.append('wall time %.4f s' % wall)
+
+        return '\n'.join(lines)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+recorders.py
+
+Columnar binary storage for optimization histories.  Each variable is appended as raw
+bytes to its own file, so a run costs one memcpy per variable per iteration and the
+history of a single variable can be memory-mapped without touching the others.
+
+Layout of a record directory::
+
+    schema.json     name -> file, dtype and shape (fixed by the first record)
+    index.bin       float64 timestamp of each record
+    coords.txt      iteration coordinate of each record, one per line
+    NNNN_name.bin   the records of one variable, back to back
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import re
+import json
+import time
+
+import numpy as np
+
+from openmdao.recorders.base_recorder import BaseRecorder
+from openmdao.util.record_util import format_iteration_coordinate
+
+
+SCHEMA_NAME = 'schema.json'
+INDEX_NAME = 'index.bin'
+COORDS_NAME = 'coords.txt'
+
+
+def _numeric(value):
+    # numbers and numeric arrays only; strings, enums and objects are not recorded
+
+    value = np.asarray(value)
+    if value.dtype.kind not in 'biufc':
+        return None
+
+    return value
+
+
+class ColumnarWriter(object):
+    """append-only writer of fixed-schema records
+
+    Parameters
+    ----------
+    directory : str
+        created if needed; an existing record in it is overwritten
+
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.schema = None
+        self.count = 0
+        self._files = {}
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        for name in os.listdir(directory):
+            if name.endswith('.bin') or name in (SCHEMA_NAME, COORDS_NAME):
+                os.remove(os.path.join(directory, name))
+
+        self._index = open(os.path.join(directory, INDEX_NAME), 'wb')
+        self._coords = open(os.path.join(directory, COORDS_NAME), 'w')
+
+    def _create_schema(self, values):
+
+        self.schema = {}
+        for i, name in enumerate(sorted(values.keys())):
+            value = values[name]
+            filename = '%04d_%s.bin' % (i, re.sub(r'[^\w.]', '_', name))
+            self.schema[name] = {'file': filename, 'dtype': value.dtype.str, 'shape': list(value.shape)}
+            self._files[name] = open(os.path.join(self.directory, filename), 'wb')
+
+        with open(os.path.join(self.directory, SCHEMA_NAME), 'w') as f:
+            json.dump(self.schema, f, indent=1, sort_keys=True)
+
+    def append(self, values, coord='', timestamp=None):
+        """add one record
+
+        Parameters
+        ----------
+        values : dict
+            name -> number or array; non-numeric entries are skipped.  The names,
+            dtypes and shapes of the first record fix the schema.
+        coord : str
+            iteration coordinate
+        timestamp : float
+            defaults to the current time
+
+        """
+
+        values = dict((name, _numeric(value)) for name, value in values.items())
+        values = dict((name, value) for name, value in values.items() if value is not None)
+
+        if self.schema is None:
+            self._create_schema(values)
+
+        for name, entry in self.schema.items():
+            if name not in values:
+                raise ValueError('%s is missing from record %d' % (name, self.count))
+            value = values[name]
+            if list(value.shape) != entry['shape']:
+                raise ValueError('%s changed shape from %s to %s' % (name, tuple(entry['shape']), value.shape))
+            self._files[name].write(np.ascontiguousarray(value, dtype=entry['dtype']).tobytes())
+
+        # the index is written last so a record only counts once all of its columns are out
+        for f in self._files.values():
+            f.flush()
+        self._coords.write(coord + '\n')
+        self._coords.flush()
+        self._index.write(np.array([time.time() if timestamp is None else timestamp], dtype='<f8').tobytes())
+        self._index.flush()
+
+        self.count += 1
+
+    def close(self):
+
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        self._index.close()
+        self._coords.close()
+
+
+class ColumnarReader(object):
+    """read access to a record directory written by ColumnarWriter
+
+    Only the schema, index and coordinates are read on construction; history
+    memory-maps the file of the requested variable.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+        with open(os.path.join(directory, SCHEMA_NAME)) as f:
+            self.schema = json.load(f)
+
+        self.timestamps = np.fromfile(os.path.join(directory, INDEX_NAME), dtype='<f8')
+
+        with open(os.path.join(directory, COORDS_NAME)) as f:
+            self.coords = [line.rstrip('\n') for line in f][:len(self.timestamps)]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def variables(self):
+        return sorted(self.schema.keys())
+
+    def history(self, name):
+        """array of shape (number of records,) + shape of the variable"""
+
+        entry = self.schema[name]
+        shape = tuple(entry['shape'])
+        n = len(self)
+
+        if n == 0:
+            return np.zeros((0,) + shape, dtype=entry['dtype'])
+
+        return np.memmap(os.path.join(self.directory, entry['file']), dtype=entry['dtype'],
+                         mode='r', shape=(n,) + shape)
+
+    def record(self, i):
+        """dict of every variable at record i"""
+
+        return dict((name, np.array(self.history(name)[i])) for name in self.schema)
+
+
+class ColumnarRecorder(BaseRecorder):
+    """OpenMDAO recorder writing to a ColumnarWriter
+
+    Variables are named 'params:<name>', 'unknowns:<name>' and 'resids:<name>' following
+    the record_params, record_unknowns and record_resids options.  Non-numeric
+    (pass_by_obj) variables and derivatives are not recorded.
+
+    Parameters
+    ----------
+    directory : str
+        record directory, see ColumnarReader
+
+    """
+
+    def __init__(self, directory):
+        super(ColumnarRecorder, self).__init__()
+        self.options['record_derivs'] = False
+        self.writer = ColumnarWriter(directory)
+
+    def record_metadata(self, group):
+        pass
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+
+        coord = metadata['coord']
+        params, unknowns, resids = self._filter_vectors(params, unknowns, resids, coord)
+
+        values = {}
+        for section, vec in (('params', params), ('unknowns', unknowns), ('resids', resids)):
+            if vec is None:
+                continue
+            for name, value in vec.items():
+                values[section + ':' + name] = value
+
+        self.writer.append(values, format_iteration_coordinate(coord), metadata.get('timestamp'))
+
+    def record_derivatives(self, derivs, metadata):
+        pass
+
+    def close(self):
+        self.writer.close()
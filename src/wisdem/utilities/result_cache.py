@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+result_cache.py
+
+Content-addressed memoization of component outputs, keyed on a hash of every input
+(including airfoil, composite-section and other plain Python objects).
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import os
+import copy
+import hashlib
+import numbers
+import tempfile
+import warnings
+import types
+from collections import OrderedDict
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import numpy as np
+
+from wisdem.utilities.variables import IGNORED_VARS, input_paths
+
+
+def _b(s):
+    return s if isinstance(s, bytes) else s.encode('utf-8')
+
+
+def _update_hash(h, obj, seen):
+
+    if obj is None:
+        h.update(b'N')
+
+    elif isinstance(obj, (bool, np.bool_)):
+        h.update(b'B1' if obj else b'B0')
+
+    elif isinstance(obj, numbers.Real):  # 5, 5.0 and np.float64(5.0) hash alike
+        h.update(_b('n' + repr(float(obj))))
+
+    elif isinstance(obj, numbers.Number):
+        h.update(_b('n' + repr(complex(obj))))
+
+    elif isinstance(obj, (bytes, str)) or type(obj).__name__ == 'unicode':
+        h.update(_b('s%d:' % len(obj)))
+        h.update(_b(obj))
+
+    elif isinstance(obj, np.ndarray):
+        h.update(_b('a%s%s' % (obj.dtype.str, obj.shape)))
+        if obj.dtype == object:
+            for item in obj.ravel():
+                _update_hash(h, item, seen)
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+
+    elif isinstance(obj, (list, tuple)):
+        h.update(_b('l%d' % len(obj)))
+        for item in obj:
+            _update_hash(h, item, seen)
+
+    elif isinstance(obj, dict):
+        h.update(_b('d%d' % len(obj)))
+        for key in sorted(obj.keys(), key=repr):
+            _update_hash(h, key, seen)
+            _update_hash(h, obj[key], seen)
+
+    elif isinstance(obj, (set, frozenset)):  # iteration order follows the string hash seed
+        h.update(_b('e%d' % len(obj)))
+        for digest in sorted(_digest(item, set(seen)) for item in obj):
+            h.update(digest)
+
+    elif isinstance(obj, (types.FunctionType, types.MethodType, types.BuiltinFunctionType)):
+        raise TypeError('cannot hash %s, functions have no stable value' % getattr(obj, '__name__', repr(obj)))
+
+    elif id(obj) in seen:
+        h.update(b'R')
+
+    else:
+        seen.add(id(obj))
+        h.update(_b('o' + type(obj).__name__))
+
+        if hasattr(obj, 'list_vars'):  # variable trees and containers
+            for name in sorted(obj.list_vars()):
+                if name not in IGNORED_VARS:
+                    _update_hash(h, name, seen)
+                    _update_hash(h, getattr(obj, name), seen)
+
+        elif hasattr(obj, '__dict__'):  # airfoils, composite sections, profiles, ...
+            _update_hash(h, dict((k, v) for k, v in obj.__dict__.items() if not k.startswith('__')), seen)
+
+        else:
+            text = repr(obj)
+            if ' at 0x' in text:  # the default repr holds a memory address that changes every run
+                raise TypeError('cannot hash %s, its repr is not stable: %s' % (type(obj).__name__, text))
+            h.update(_b(text))
+
+
+def _digest(obj, seen):
+
+    h = hashlib.sha1()
+    _update_hash(h, obj, seen)
+
+    return h.digest()
+
+
+def hash_inputs(values):
+    """sha1 hex digest of an arbitrary (nested) set of input values
+
+    The digest is the same in every process.  Raises TypeError for values that can
+    only be told apart by their address (e.g. functions or objects with __slots__
+    and the default repr).
+    """
+
+    h = hashlib.sha1()
+    _update_hash(h, values, set())
+
+    return h.hexdigest()
+
+
+class ResultCache(object):
+    """in-memory LRU of component results with an optional on-disk store
+
+    Parameters
+    ----------
+    maxsize : int
+        number of results kept in memory
+    directory : str
+        optional directory of pickled results.  Files are written to a temporary
+        name and renamed into place, so several processes can share one directory.
+
+    """
+
+    def __init__(self, maxsize=32, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if directory is not None and not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):  # another process may have created it
+                    raise
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.pkl')
+
+    def get(self, key):
+
+        if key in self.memory:
+            self.memory[key] = self.memory.pop(key)
+            self.hits += 1
+            return self.memory[key]
+
+        if self.directory is not None:
+            path = self._path(key)
+            if os.path.exists(path):
+                try:
+                    with open(path, 'rb') as f:
+                        result = pickle.load(f)
+                except (IOError, EOFError, pickle.UnpicklingError):
+                    result = None
+                if result is not None:
+                    self._remember(key, result)
+                    self.hits += 1
+                    return result
+
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+
+        self._remember(key, result)
+
+        if self.directory is not None:
+            path = self._path(key)
+            subdir = os.path.dirname(path)
+            if not os.path.isdir(subdir):
+                try:
+                    os.makedirs(subdir)
+                except OSError:
+                    if not os.path.isdir(subdir):
+                        raise
+            fd, tmp = tempfile.mkstemp(dir=subdir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, pickle.HIGHEST_PROTOCOL)
+            if os.name == 'nt' and os.path.exists(path):
+                os.remove(tmp)
+            else:
+                os.rename(tmp, path)
+
+    def _remember(self, key, result):
+
+        self.memory.pop(key, None)
+        self.memory[key] = result
+        while len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+
+
+def _is_assembly(obj):
+    return hasattr(obj, 'driver') and hasattr(obj, 'list_connections')
+
+
+def _components(assembly, prefix=''):
+    # (path, component) of every component inside an assembly, sub-assemblies included
+
+    items = []
+    for name in sorted(assembly.list_containers()):
+        child = getattr(assembly, name)
+        if hasattr(child, 'run') and hasattr(child, 'list_inputs') and not hasattr(child, 'workflow'):
+            items.append((prefix + name, child))
+            if _is_assembly(child):
+                items.extend(_components(child, prefix + name + '.'))
+
+    return items
+
+
+def _leaf_values(obj, names, prefix):
+    # (path, deep copy of value), with variable trees expanded member by member
+
+    values = []
+    for name in names:
+        if name in IGNORED_VARS:
+            continue
+        value = getattr(obj, name)
+        if hasattr(value, 'list_vars'):
+            values.extend(_leaf_values(value, value.list_vars(), prefix + name + '.'))
+        else:
+            values.append((prefix + name, copy.deepcopy(value)))
+
+    return values
+
+
+class CachedExecuteMixin(object):
+    """reuse a component's outputs when all of its inputs hash to a previous run
+
+    Mix in ahead of the component class, e.g. class CachedRotorSE(CachedExecuteMixin, RotorSE),
+    and assign a ResultCache to `result_cache`.
+
+    On an assembly (RotorSE is one) a cache hit skips its whole workflow, so besides the
+    boundary outputs the cache stores the inputs and outputs of every component inside
+    it and puts them back, and values read through rotor.<component>.<variable> match
+    the run that was cached.  The key then covers the unconnected inputs of the inner
+    components as well as the boundary inputs.
+    """
+
+    result_cache = None
+
+    def _input_values(self):
+        return [(path, self.get(path)) for path in input_paths(self) if path.split('.')[-1] not in IGNORED_VARS]
+
+    def _output_values(self):
+
+        values = [(name, False, value) for name, value in _leaf_values(self, self.list_outputs(), '')]
+
+        if _is_assembly(self):
+            for path, comp in _components(self):
+                values.extend((name, True, value) for name, value in
+                              _leaf_values(comp, comp.list_inputs(), path + '.'))
+                values.extend((name, False, value) for name, value in
+                              _leaf_values(comp, comp.list_outputs(), path + '.'))
+
+        return values
+
+    def _set_output(self, name, value):
+
+        obj = self
+        path = name.split('.')
+        for attr in path[:-1]:
+            obj = getattr(obj, attr)
+        setattr(obj, path[-1], value)
+
+    def execute(self):
+
+        if self.result_cache is None:
+            return super(CachedExecuteMixin, self).execute()
+
+        try:
+            key = hash_inputs([type(self).__name__, self._input_values()])
+        except TypeError as error:
+            warnings.warn('%s runs uncached: %s' % (type(self).__name__, error))
+            return super(CachedExecuteMixin, self).execute()
+
+        outputs = self.result_cache.get(key)
+
+        if outputs is None:
+            super(CachedExecuteMixin, self).execute()
+            self.result_cache.put(key, self._output_values())
+        else:
+            for name, is_input, value in outputs:
+                if is_input:  # inner inputs are mostly connected, so the copy is forced
+                    self.set(name, copy.deepcopy(value), force=True)
+                else:
+                    self._set_output(name, copy.deepcopy(value))
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+scheduler.py
+
+Runs the components of an assembly's top-level workflow level by level, following
+the dependency graph implied by the assembly's connections, optionally on a thread
+pool (ConcurrentDriver, or the concurrent_workers option of configure_turbine).
+
+This is experimental: configure_turbine keeps the standard serial driver unless
+concurrent_workers is given.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
+
+from openmdao.main.api import Driver
+from openmdao.main.datatypes.api import Int
+from openmdao.main.expreval import ExprEvaluator
+
+
+_name_pattern = re.compile(r'(?<![\w.])([A-Za-z_]\w*)\.')
+
+
+def workflow_names(driver):
+    """names of the components in a driver's workflow"""
+
+    return list(driver.workflow.get_names())
+
+
+def dependency_graph(assembly, names=None):
+    """upstream dependencies of each workflow component
+
+    Drivers in the workflow (e.g. the flexible-blade 'fpi') are treated as a single
+    node that owns every component in their own workflow.
+
+    Parameters
+    ----------
+    assembly : Assembly
+    names : list of str
+        nodes to schedule, defaults to the names in assembly.driver.workflow
+
+    Returns
+    -------
+    deps : OrderedDict
+        node name -> set of node names it depends on
+    inputs : dict
+        node name -> list of (src, dst) connections feeding that node
+
+    """
+
+    if names is None:
+        names = workflow_names(assembly.driver)
+
+    # map every component to the top-level node that runs it
+    owner = {}
+    for name in names:
+        owner[name] = name
+        stack = [getattr(assembly, name)]
+        while stack:
+            obj = stack.pop()
+            if hasattr(obj, 'workflow'):
+                for sub in workflow_names(obj):
+                    owner[sub] = name
+                    stack.append(getattr(assembly, sub))
+
+    deps = OrderedDict((name, set()) for name in names)
+    inputs = dict((name, []) for name in names)
+
+    for src, dst in assembly.list_connections():
+        node = owner.get(dst.split('.')[0])
+        if node is None:
+            continue
+        inputs[node].append((src, dst))
+        for comp in _name_pattern.findall(src):
+            upstream = owner.get(comp)
+            if upstream is not None and upstream != node:
+                deps[node].add(upstream)
+
+    return deps, inputs
+
+
+def topological_levels(deps):
+    """group nodes into levels whose members only depend on earlier levels"""
+
+    remaining = OrderedDict((name, set(d)) for name, d in deps.items())
+    levels = []
+
+    while remaining:
+        level = [name for name, d in remaining.items() if not d]
+        if not level:
+            raise RuntimeError('cyclic dependency between %s' % ', '.join(remaining.keys()))
+        for name in level:
+            del remaining[name]
+        for d in remaining.values():
+            d.difference_update(level)
+        levels.append(level)
+
+    return levels
+
+
+class ConcurrentScheduler(object):
+    """execute an assembly's top-level workflow level by level
+
+    Each component's connected inputs are copied from upstream before it runs, so
+    components in the same level run without touching each other's data.  The
+    boundary outputs of the assembly are set once all levels have run.
+
+    Threads only overlap the parts of a component that release the GIL (numpy
+    linear algebra, compiled extensions that release it, file I/O); pure-Python
+    components gain nothing from them.  Levels therefore run serially unless
+    max_workers is larger than one, which still gives the per-level timing report.
+
+    Parameters
+    ----------
+    assembly : Assembly
+        a configured assembly (e.g. TurbineSE)
+    max_workers : int
+        size of the thread pool, 1 to run every level on the calling thread
+    names : list of str
+        nodes to schedule, defaults to the names in assembly.driver.workflow
+
+    """
+
+    def __init__(self, assembly, max_workers=1, names=None):
+        self.assembly = assembly
+        self.deps, self.inputs = dependency_graph(assembly, names)
+        self.levels = topological_levels(self.deps)
+        self.max_workers = min(max_workers, max(len(level) for level in self.levels))
+        self.timings = OrderedDict()
+        self._exprs = {}
+
+    def _expr(self, text):
+
+        expr = self._exprs.get(text)
+        if expr is None:
+            expr = self._exprs[text] = ExprEvaluator(text, self.assembly)
+        return expr
+
+    def _transfer(self, connections):
+        # connected inputs reject a plain set, so the copy is forced as in the
+        # assembly's own data transfer
+
+        for src, dst in connections:
+            self._expr(dst).set(self._expr(src).evaluate(), force=True)
+
+    def _run_node(self, name):
+
+        t0 = time.time()
+        self._transfer(self.inputs[name])
+        getattr(self.assembly, name).run()
+        return name, time.time() - t0
+
+    def run(self):
+        """run every level and return the wall time of each component (s)"""
+
+        self.timings = OrderedDict()
+        pool = ThreadPool(self.max_workers) if self.max_workers > 1 else None
+
+        try:
+            for level in self.levels:
+                if pool is None or len(level) == 1:
+                    results = [self._run_node(name) for name in level]
+                else:
+                    results = pool.map(self._run_node, level)
+                for name, elapsed in results:
+                    self.timings[name] = elapsed
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        # outputs promoted to the assembly boundary
+        boundary = [(src, dst) for src, dst in self.assembly.list_connections() if '.' not in dst]
+        self._transfer(boundary)
+
+        return self.timings
+
+    def report(self):
+        """per-component wall time, grouped by level"""
+
+        lines = []
+        for i, level in enumerate(self.levels):
+            lines.append('level %d' % i)
+            for name in level:
+                lines.append('    %-20s %10.4f s' % (name, self.timings.get(name, 0.0)))
+        lines.append('total component time %10.4f s' % sum(self.timings.values()))
+
+        return '\n'.join(lines)
+
+
+class ConcurrentDriver(Driver):
+    """top-level driver that runs its workflow through a ConcurrentScheduler
+
+    The schedule is built from the workflow and the assembly connections on the
+    first execution.
+    """
+
+    max_workers = Int(1, iotype='in', desc='threads running the components of one level')
+
+    def __init__(self):
+        super(ConcurrentDriver, self).__init__()
+        self.scheduler = None
+        self._workers = None
+
+    def execute(self):
+
+        if self.scheduler is None or self._workers != self.max_workers:
+            self.scheduler = ConcurrentScheduler(self.parent, self.max_workers, workflow_names(self))
+            self._workers = self.max_workers
+
+        self.scheduler.run()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+surrogates.py
+
+Response surfaces for vector-valued functions of a few design variables: least-squares
+polynomials, radial basis function interpolants and ordinary Kriging.  Every surface
+reports leave-one-out residuals of its training data (computed in closed form, without
+refitting) as an error estimate; Kriging also gives a standard deviation per prediction.
+
+    surface = KrigingSurface()
+    surface.train(X, Y)   # X (nsample, nvar), Y (nsample, nout)
+    y = surface.predict(x)
+    print(surface.rmse)   # leave-one-out rms error of each output
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import itertools
+
+import numpy as np
+
+
+def latin_hypercube(n, lower, upper, seed=None):
+    """n samples between lower and upper bounds, one per stratum in every variable"""
+
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    rng = np.random.RandomState(seed)
+
+    u = (np.arange(n)[:, np.newaxis] + rng.uniform(size=(n, lower.size))) / n
+    for j in range(lower.size):
+        u[:, j] = u[rng.permutation(n), j]
+
+    return lower + u*(upper - lower)
+
+
+def _distances2(a, b):
+    # squared distances between the rows of a and b
+
+    d2 = np.sum(a**2, axis=1)[:, np.newaxis] + np.sum(b**2, axis=1)[np.newaxis, :] - 2.0*np.dot(a, b.T)
+
+    return np.maximum(d2, 0.0)
+
+
+class _Surface(object):
+    """common scaling (inputs to the unit box of the training data, outputs to zero
+    mean and unit variance) and error estimates"""
+
+    def train(self, X, Y):
+
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:  # samples of a single variable
+            X = X[:, np.newaxis]
+        Y = np.asarray(Y, dtype=float).reshape(X.shape[0], -1)
+
+        self.x_min = X.min(axis=0)
+        self.x_range = X.max(axis=0) - self.x_min
+        self.x_range[self.x_range == 0.0] = 1.0
+        self.y_mean = Y.mean(axis=0)
+        self.y_std = Y.std(axis=0)
+        self.y_std[self.y_std == 0.0] = 1.0
+
+        x = (X - self.x_min)/self.x_range
+        y = (Y - self.y_mean)/self.y_std
+
+        self._fit(x, y)
+
+        self.loo_residuals = self._loo(y)*self.y_std
+        self.rmse = np.sqrt(np.nanmean(self.loo_residuals**2, axis=0))
+
+        return self
+
+    def _scaled(self, X):
+
+        X = np.asarray(X, dtype=float)
+        single = X.ndim == 1
+
+        return (np.atleast_2d(X) - self.x_min)/self.x_range, single
+
+    def predict(self, X):
+        """outputs at X, shape (nout,) for one point or (npoint, nout)"""
+
+        x, single = self._scaled(X)
+        y = self._predict(x)*self.y_std + self.y_mean
+
+        return y[0] if single else y
+
+    def predict_std(self, X):
+        """estimated standard deviation of the prediction error at X (leave-one-out rms
+        error unless the surface has a pointwise estimate)"""
+
+        x, single = self._scaled(X)
+        std = self._std(x)*self.y_std
+
+        return std[0] if single else std
+
+    def _std(self, x):
+        return np.tile(self.rmse/self.y_std, (x.shape[0], 1))
+
+
+class PolynomialSurface(_Surface):
+    """least-squares polynomial of total degree `order` (1 linear, 2 quadratic, ...)"""
+
+    def __init__(self, order=2):
+        self.order = order
+
+    def _basis(self, x):
+
+        columns = [np.ones(x.shape[0])]
+        for degree in range(1, self.order + 1):
+            for combination in itertools.combinations_with_replacement(range(x.shape[1]), degree):
+                columns.append(np.prod(x[:, combination], axis=1))
+
+        return np.column_stack(columns)
+
+    def _fit(self, x, y):
+
+        A = self._basis(x)
+        # numpy's current default cutoff, given explicitly for numpy < 1.14
+        rcond = np.finfo(float).eps*max(A.shape)
+        self.coefficients = np.linalg.lstsq(A, y, rcond=rcond)[0]
+        self._AtA_inv = np.linalg.pinv(np.dot(A.T, A))
+
+        n, p = A.shape
+        self._residuals = y - np.dot(A, self.coefficients)
+        self._sigma2 = np.sum(self._residuals**2, axis=0)/max(n - p, 1)
+        self._leverage = np.einsum('ij,jk,ik->i', A, self._AtA_inv, A)
+
+    def _loo(self, y):
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            loo = self._residuals/(1.0 - self._leverage[:, np.newaxis])
+        loo[self._leverage > 1.0 - 1e-10] = np.nan  # interpolated points carry no information
+
+        return loo
+
+    def _predict(self, x):
+        return np.dot(self._basis(x), self.coefficients)
+
+    def _std(self, x):
+
+        A = self._basis(x)
+        leverage = np.einsum('ij,jk,ik->i', A, self._AtA_inv, A)
+
+        return np.sqrt(np.outer(1.0 + leverage, self._sigma2))
+
+
+class _KernelSurface(_Surface):
+    # interpolant sum_i c_i phi(|x - x_i|) + polynomial tail, solved as one augmented system
+
+    tail_order = 1
+
+    def train(self, X, Y):
+        # an interpolant takes one value per point: repeated samples are merged, with
+        # their outputs averaged, so that the system stays nonsingular
+
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[:, np.newaxis]
+        Y = np.asarray(Y, dtype=float).reshape(X.shape[0], -1)
+
+        unique, first, index = np.unique(X, axis=0, return_index=True, return_inverse=True)
+        if unique.shape[0] < X.shape[0]:
+            order = np.argsort(first)  # keep the samples in their original order
+            rank = np.empty_like(order)
+            rank[order] = np.arange(order.size)
+            index = rank[np.ravel(index)]
+            counts = np.bincount(index)
+            merged = np.zeros((counts.size, Y.shape[1]))
+            np.add.at(merged, index, Y)
+            X, Y = X[np.sort(first)], merged/counts[:, np.newaxis]
+
+        return super(_KernelSurface, self).train(X, Y)
+
+    def _tail(self, x):
+
+        if self.tail_order == 0:
+            return np.ones((x.shape[0], 1))
+
+        return np.column_stack([np.ones(x.shape[0]), x])
+
+    def _solve(self, x, y):
+
+        n = x.shape[0]
+        P = self._tail(x)
+        A = np.zeros((n + P.shape[1], n + P.shape[1]))
+        A[:n, :n] = self._kernel(_distances2(x, x))
+        A[:n, n:] = P
+        A[n:, :n] = P.T
+
+        self._x = x
+        if n < P.shape[1]:
+            self._A_inv = np.linalg.pinv(A)
+        else:
+            try:
+                self._A_inv = np.linalg.inv(A)
+            except np.linalg.LinAlgError:  # e.g. samples that coincide after scaling
+                self._A_inv = np.linalg.pinv(A)
+        rhs = np.vstack([y, np.zeros((P.shape[1], y.shape[1]))])
+        self._weights = np.dot(self._A_inv, rhs)
+
+    def _fit(self, x, y):
+        self._solve(x, y)
+
+    def _loo(self, y):
+        # Rippa (1999): the leave-one-out residual at x_i is c_i / (A^-1)_ii
+
+        n = self._x.shape[0]
+
+        return self._weights[:n]/np.diag(self._A_inv)[:n, np.newaxis]
+
+    def _predict(self, x):
+
+        n = self._x.shape[0]
+        Phi = self._kernel(_distances2(x, self._x))
+
+        return np.dot(Phi, self._weights[:n]) + np.dot(self._tail(x), self._weights[n:])
+
+
+class RBFSurface(_KernelSurface):
+    """radial basis function interpolant with a linear tail
+
+    kernel : 'cubic', 'thin_plate', 'multiquadric' or 'gaussian'
+    epsilon : shape parameter of the multiquadric and gaussian kernels (scaled inputs)
+    """
+
+    def __init__(self, kernel='cubic', epsilon=1.0):
+        self.kernel = kernel
+        self.epsilon = epsilon
+
+    def _kernel(self, d2):
+
+        if self.kernel == 'cubic':
+            return d2**1.5
+        if self.kernel == 'thin_plate':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return np.where(d2 > 0.0, 0.5*d2*np.log(d2), 0.0)
+        if self.kernel == 'multiquadric':
+            return -np.sqrt(1.0 + self.epsilon**2*d2)
+        if self.kernel == 'gaussian':
+            return np.exp(-self.epsilon**2*d2)
+
+        raise ValueError('unknown RBF kernel: ' + str(self.kernel))
+
+
+class KrigingSurface(_KernelSurface):
+    """ordinary Kriging (constant mean, Gaussian correlation)
+
+    The correlation parameter is chosen by maximum likelihood over `thetas` (scaled
+    inputs), shared by all outputs; `nugget` regularizes nearly coincident samples.
+    """
+
+    tail_order = 0
+
+    def __init__(self, thetas=None, nugget=1e-10):
+        self.thetas = np.logspace(-2, 3, 26) if thetas is None else thetas
+        self.nugget = nugget
+
+    def _kernel(self, d2):
+        return np.exp(-self.theta*d2) + self.nugget*(d2 == 0.0)
+
+    def _likelihood(self, x, y, theta):
+        # concentrated log likelihood summed over the outputs
+
+        self.theta = theta
+        R = self._kernel(_distances2(x, x))
+        try:
+            L = np.linalg.cholesky(R)
+        except np.linalg.LinAlgError:
+            return -np.inf
+
+        n = x.shape[0]
+        ones = np.ones(n)
+        Rinv_1 = np.linalg.solve(L.T, np.linalg.solve(L, ones))
+        mu = np.dot(Rinv_1, y)/np.dot(ones, Rinv_1)
+        r = y - mu
+        Rinv_r = np.linalg.solve(L.T, np.linalg.solve(L, r))
+        sigma2 = np.maximum(np.sum(r*Rinv_r, axis=0)/n, 1e-300)
+        logdet = 2.0*np.sum(np.log(np.diag(L)))
+
+        return np.sum(-0.5*n*np.log(sigma2) - 0.5*logdet)
+
+    def _fit(self, x, y):
+
+        likelihoods = [self._likelihood(x, y, theta) for theta in self.thetas]
+        self.theta = self.thetas[int(np.argmax(likelihoods))]
+
+        self._solve(x, y)
+
+        n = x.shape[0]
+        self._sigma2 = np.sum(y*self._weights[:n], axis=0)/n  # (y - mu)^T R^-1 (y - mu) / n
+
+    def _std(self, x):
+        # mean squared error of the best linear unbiased predictor
+
+        r = np.column_stack([self._kernel(_distances2(x, self._x)), np.ones(x.shape[0])])
+        mse = 1.0 + self.nugget - np.einsum('ij,jk,ik->i', r, self._A_inv, r)
+
+        return np.sqrt(np.outer(np.maximum(mse, 0.0), self._sigma2))
+
+
+SURFACES = {'polynomial': PolynomialSurface, 'rbf': RBFSurface, 'kriging': KrigingSurface}
+
+
+def create_surface(method, **options):
+    """response surface by name: 'polynomial', 'rbf' or 'kriging'"""
+
+    try:
+        return SURFACES[method](**options)
+    except KeyError:
+        raise ValueError('unknown surrogate method %r, use one of %s' % (method, sorted(SURFACES)))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+vardump.py
+
+JSON-lines dumps of group inputs and outputs, one variable per line, and a diff of
+two dumps for regression comparisons.  Each line holds the section, name, dtype,
+shape and values of a variable, so nothing has to be re-parsed from str(array).
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+import json
+import fnmatch
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _selected(name, includes, excludes):
+
+    if includes is not None and not any(fnmatch.fnmatchcase(name, pattern) for pattern in includes):
+        return False
+
+    return not any(fnmatch.fnmatchcase(name, pattern) for pattern in excludes or ())
+
+
+def _round(values, precision):
+    # round a flat list of floats to `precision` significant digits
+
+    return [float('%.*g' % (precision, v)) for v in values]
+
+
+def _entry(section, name, value, precision):
+
+    array = np.asarray(value)
+    entry = OrderedDict([('section', section), ('name', name)])
+
+    if array.dtype.kind in 'biuf':
+        entry['dtype'] = array.dtype.str
+        entry['shape'] = list(array.shape)
+        flat = array.ravel().tolist()
+        if precision is not None and array.dtype.kind == 'f':
+            flat = _round(flat, precision)
+        entry['value'] = flat
+    else:
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            value = str(value)
+        entry['value'] = value
+
+    return entry
+
+
+def dump_variables(filename, vectors, precision=None, includes=None, excludes=None):
+    """write the variables of one or more vectors as JSON lines
+
+    Parameters
+    ----------
+    filename : str or file
+        output file, or an open file to append to
+    vectors : list of (str, mapping)
+        section name and vector, e.g. [('params', group.params), ('unknowns', group.unknowns)]
+    precision : int
+        significant digits kept for floats (all by default)
+    includes, excludes : list of str
+        glob patterns on the variable names, as for the OpenMDAO recorders
+
+    Returns
+    -------
+    count : int
+        number of variables written
+
+    """
+
+    f = filename if hasattr(filename, 'write') else open(filename, 'w')
+
+    count = 0
+    try:
+        for section, vec in vectors:
+            for name in vec:
+                if not _selected(name, includes, excludes):
+                    continue
+                f.write(json.dumps(_entry(section, name, vec[name], precision)) + '\n')
+                count += 1
+    finally:
+        if f is not filename:
+            f.close()
+
+    return count
+
+
+def iter_dump(filename, includes=None, excludes=None):
+    """(section, name, value) of each variable of a dump; numeric values come back as arrays"""
+
+    with open(filename) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if not _selected(entry['name'], includes, excludes):
+                continue
+            value = entry['value']
+            if 'dtype' in entry:
+                value = np.array(value, dtype=entry['dtype']).reshape(entry['shape'])
+            yield entry['section'], entry['name'], value
+
+
+def load_dump(filename, includes=None, excludes=None):
+    """OrderedDict of (section, name) -> value"""
+
+    return OrderedDict(((section, name), value) for section, name, value
+                       in iter_dump(filename, includes, excludes))
+
+
+def diff_dumps(filename1, filename2, rtol=1e-10, atol=0.0, includes=None, excludes=None):
+    """variables that differ between two dumps
+
+    Only the second dump is held in memory; the first is streamed.
+
+    Returns
+    -------
+    differences : list of ((section, name), description)
+        description is the largest absolute difference for numeric values of the same
+        shape, or a short note for shape changes, non-numeric changes and variables
+        present in only one of the dumps
+
+    """
+
+    other = load_dump(filename2, includes, excludes)
+    differences = []
+
+    for section, name, value in iter_dump(filename1, includes, excludes):
+        key = (section, name)
+        if key not in other:
+            differences.append((key, 'only in %s' % filename1))
+            continue
+
+        value2 = other.pop(key)
+        if isinstance(value, np.ndarray) and isinstance(value2, np.ndarray):
+            if value.shape != value2.shape:
+                differences.append((key, 'shape %s != %s' % (value.shape, value2.shape)))
+            elif not np.allclose(value, value2, rtol=rtol, atol=atol, equal_nan=True):
+                diff = np.abs(np.asarray(value, dtype=float) - np.asarray(value2, dtype=float))
+                differences.append((key, 'max abs difference %g' % np.nanmax(diff)))
+        elif not (isinstance(value, np.ndarray) or isinstance(value2, np.ndarray)) and value == value2:
+            continue
+        else:
+            differences.append((key, '%r != %r' % (value, value2)))
+
+    for key in other:
+        differences.append((key, 'only in %s' % filename2))
+
+    return differences
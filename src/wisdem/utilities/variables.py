@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+variables.py
+
+Variable bookkeeping shared by the assembly utilities: the framework variables that
+do not affect the results and the paths of the unconnected inputs of an assembly.
+
+Copyright (c) NREL. All rights reserved.
+"""
+
+
+# framework variables that do not affect the results
+IGNORED_VARS = ('directory', 'force_execute', 'force_fd', 'missing_deriv_policy',
+                'exec_count', 'derivative_exec_count', 'itername')
+
+
+def _connected(assembly):
+    # destinations of the connections inside an assembly, without array indices
+
+    return set(dst.split('[')[0] for src, dst in assembly.list_connections())
+
+
+def _is_connected(path, connected):
+
+    if path in connected:
+        return True
+
+    prefix = path + '.'  # variable tree with connected members
+    return any(dst.startswith(prefix) for dst in connected)
+
+
+def input_paths(container):
+    """paths of the unconnected inputs of an assembly, its components, drivers and sub-assemblies"""
+
+    connected = _connected(container) if hasattr(container, 'list_connections') else set()
+
+    paths = [name for name in sorted(container.list_inputs()) if not _is_connected(name, connected)]
+
+    for name in sorted(container.list_containers()):
+        child = getattr(container, name)
+        if hasattr(child, 'run') and hasattr(child, 'list_inputs'):  # not variable trees
+            paths.extend(name + '.' + path for path in input_paths(child)
+                         if not _is_connected(name + '.' + path, connected))
+
+    return paths